@@ -2,15 +2,76 @@
 API dependency providers
 """
 from functools import lru_cache
+from app.core.config import settings
 from app.services.pose_detector import PoseDetector
 from app.services.posture_analyzer import PostureAnalyzer
+from app.services.analysis_pipeline import AnalysisPipeline
+from app.services.skeleton_renderer import SkeletonRenderer, RenderCache
+from app.services.user_cache import UserCache, track_user_changes
+from app.services.password_hasher import PasswordHasher
+from app.services.exercise_catalog import ExerciseCatalog
+from app.services.exercise_recommender import ExerciseRecommender
 
 @lru_cache()
 def get_pose_detector() -> PoseDetector:
     """Get or create singleton PoseDetector instance"""
     return PoseDetector()
 
+@lru_cache()
+def get_stream_pose_detector() -> PoseDetector:
+    """
+    Get or create the PoseDetector used by live streams
+
+    Streams apply their own per-stream temporal filter, so MediaPipe's
+    smoothing (which assumes a single coherent stream) is disabled.
+    """
+    return PoseDetector(
+        model_complexity=settings.STREAM_MODEL_COMPLEXITY,
+        smooth_landmarks=False
+    )
+
 @lru_cache()
 def get_posture_analyzer() -> PostureAnalyzer:
     """Get or create singleton PostureAnalyzer instance"""
     return PostureAnalyzer()
+
+@lru_cache()
+def get_analysis_pipeline() -> AnalysisPipeline:
+    """Get or create singleton AnalysisPipeline instance"""
+    return AnalysisPipeline()
+
+@lru_cache()
+def get_skeleton_renderer() -> SkeletonRenderer:
+    """Get or create singleton SkeletonRenderer instance"""
+    return SkeletonRenderer()
+
+@lru_cache()
+def get_render_cache() -> RenderCache:
+    """Get or create the process-wide cache of rendered session overlays"""
+    return RenderCache(settings.RENDER_CACHE_BYTES)
+
+@lru_cache()
+def get_user_cache() -> UserCache:
+    """Get or create the process-wide cache of authenticated users"""
+    cache = UserCache(
+        ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+        max_entries=settings.USER_CACHE_MAX_ENTRIES,
+        redis_url=settings.REDIS_URL if settings.USER_CACHE_REDIS else None
+    )
+    track_user_changes(cache)
+    return cache
+
+@lru_cache()
+def get_password_hasher() -> PasswordHasher:
+    """Get or create the process-wide password hashing pool"""
+    return PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+@lru_cache()
+def get_exercise_catalog() -> ExerciseCatalog:
+    """Get or create the process-wide in-memory exercise catalog"""
+    return ExerciseCatalog(settings.EXERCISE_CATALOG_REFRESH_SECONDS)
+
+@lru_cache()
+def get_exercise_recommender() -> ExerciseRecommender:
+    """Get or create the recommender, kept in sync with the exercise catalog"""
+    return ExerciseRecommender(get_exercise_catalog(), settings.RECOMMENDED_EXERCISES)
@@ -7,19 +7,31 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.security import create_access_token
+from app.api.deps import get_password_hasher
+from app.api.v1.endpoints.users import get_current_user
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy
 from sqlalchemy import select
 
 router = APIRouter()
 
 
+def _hasher_busy(e: PasswordHasherBusy) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    hasher: PasswordHasher = Depends(get_password_hasher)
 ):
     """Register a new user"""
     # Check if user already exists
@@ -36,12 +48,17 @@ async def register(
             detail="User with this email or username already exists"
         )
     
+    try:
+        hashed_password = await hasher.hash(user_data.password)
+    except PasswordHasherBusy as e:
+        raise _hasher_busy(e)
+
     # Create new user
     new_user = User(
         email=user_data.email,
         username=user_data.username,
         full_name=user_data.full_name,
-        hashed_password=get_password_hash(user_data.password)
+        hashed_password=hashed_password
     )
     
     db.add(new_user)
@@ -54,7 +71,8 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    hasher: PasswordHasher = Depends(get_password_hasher)
 ):
     """Login and get access token"""
     # Find user by username
@@ -62,8 +80,15 @@ async def login(
         select(User).where(User.username == form_data.username)
     )
     user = result.scalar_one_or_none()
-    
-    if not user or not verify_password(form_data.password, user.hashed_password):
+
+    verified = False
+    if user:
+        try:
+            verified, new_hash = await hasher.verify(form_data.password, user.hashed_password)
+        except PasswordHasherBusy as e:
+            raise _hasher_busy(e)
+
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -75,6 +100,11 @@ async def login(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
+
+    # Stored hash used outdated cost parameters
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        await db.commit()
     
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -84,3 +114,17 @@ async def login(
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
+
+
+@router.get("/hashing/stats")
+async def get_hashing_stats(
+    current_user: User = Depends(get_current_user),
+    hasher: PasswordHasher = Depends(get_password_hasher)
+):
+    """Password hashing pool queueing metrics (admin only)"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view hashing stats"
+        )
+    return hasher.stats()
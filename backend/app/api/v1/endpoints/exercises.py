@@ -1,69 +1,91 @@
 """
 Exercise endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from typing import List, Optional
 
 from app.db.session import get_db
 from app.models.exercise import Exercise
 from app.schemas.exercise import ExerciseResponse, ExerciseCreate
+from app.api.deps import get_exercise_catalog
 from app.api.v1.endpoints.users import get_current_user
 from app.models.user import User
+from app.services.exercise_catalog import ExerciseCatalog, exercise_record
+from app.services.response_encoding import MEDIA_JSON, encode_json
 
 router = APIRouter()
 
 
+async def _fresh_catalog(
+    db: AsyncSession = Depends(get_db),
+    catalog: ExerciseCatalog = Depends(get_exercise_catalog)
+) -> ExerciseCatalog:
+    """The in-memory catalog, reloaded first if older than its refresh interval"""
+    await catalog.ensure_fresh(db)
+    return catalog
+
+
+def _cached_response(
+    catalog: ExerciseCatalog,
+    payload,
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str]
+) -> Response:
+    """Pre-validated catalog payload, or 304 when the client's copy is current"""
+    headers = catalog.validators()
+    if catalog.not_modified(if_none_match, if_modified_since):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=encode_json(payload), media_type=MEDIA_JSON, headers=headers)
+
+
 @router.get("/", response_model=List[ExerciseResponse])
 async def get_exercises(
-    db: AsyncSession = Depends(get_db),
     category: str = None,
     difficulty: str = None,
-    limit: int = 20
+    tags: List[str] = Query([]),
+    target_areas: List[str] = Query([]),
+    limit: int = 20,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    catalog: ExerciseCatalog = Depends(_fresh_catalog)
 ):
-    """Get list of exercises with optional filters"""
-    query = select(Exercise).where(Exercise.is_active == True)
-    
-    if category:
-        query = query.where(Exercise.category == category)
-    
-    if difficulty:
-        query = query.where(Exercise.difficulty == difficulty)
-    
-    query = query.limit(limit)
-    
-    result = await db.execute(query)
-    exercises = result.scalars().all()
-    
-    return exercises
+    """
+    Get list of exercises with optional filters
+
+    Served from the in-memory catalog. Repeated `tags` / `target_areas`
+    parameters must all match. Responses carry ETag and Last-Modified for
+    conditional requests.
+    """
+    exercises = catalog.filter(category, difficulty, tags, target_areas, limit)
+    return _cached_response(catalog, exercises, if_none_match, if_modified_since)
 
 
 @router.get("/{exercise_id}", response_model=ExerciseResponse)
 async def get_exercise(
     exercise_id: int,
-    db: AsyncSession = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    catalog: ExerciseCatalog = Depends(_fresh_catalog)
 ):
     """Get a specific exercise by ID"""
-    result = await db.execute(
-        select(Exercise).where(Exercise.id == exercise_id)
-    )
-    exercise = result.scalar_one_or_none()
-    
+    exercise = catalog.get(exercise_id)
+
     if not exercise:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Exercise not found"
         )
-    
-    return exercise
+
+    return _cached_response(catalog, exercise, if_none_match, if_modified_since)
 
 
 @router.post("/", response_model=ExerciseResponse, status_code=status.HTTP_201_CREATED)
 async def create_exercise(
     exercise_data: ExerciseCreate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    catalog: ExerciseCatalog = Depends(get_exercise_catalog)
 ):
     """Create a new exercise (admin only)"""
     if not current_user.is_superuser:
@@ -71,11 +93,13 @@ async def create_exercise(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to create exercises"
         )
-    
+
     new_exercise = Exercise(**exercise_data.dict())
-    
+
     db.add(new_exercise)
     await db.commit()
     await db.refresh(new_exercise)
-    
+
+    catalog.upsert(exercise_record(new_exercise))
+
     return new_exercise
@@ -1,25 +1,53 @@
 """
 Pose detection endpoints
 """
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Header, Query, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import FileResponse
+from sqlalchemy import desc, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import undefer_group
 from sqlalchemy.ext.asyncio import AsyncSession
 import cv2
+import os
 import numpy as np
-from typing import List
+from typing import Dict, List, Optional
 
+from app.core.config import settings
 from app.db.session import get_db
+from app.db.pagination import NEXT_CURSOR_HEADER, keyset_page, next_cursor
 from app.models.user import User
 from app.models.pose_session import PoseSession
-from app.schemas.pose import PoseSessionCreate, PoseSessionResponse
+from app.models.posture_analysis import PostureAnalysis
+from app.schemas.pose import (
+    PoseSessionCreate, PoseSessionResponse, PoseSessionDetail, PoseFramesCreate, LandmarkArrayRequest
+)
 from app.services.pose_detector import PoseDetector
-from app.services.exercise_analyzer import ExerciseAnalyzer
-from app.services.ergonomics_analyzer import ErgonomicsAnalyzer
-from app.services.activity_classifier import ActivityClassifier
-from app.api.v1.endpoints.users import get_current_user
-from app.api.deps import get_pose_detector
-from app.tasks.pose_tasks import detect_pose_task
-from celery.result import AsyncResult
+from app.services.image_decoder import decode_image, decode_raw
+from app.services.analysis_pipeline import AnalysisPipeline
+from app.services.pose_stream import PoseStream
+from app.services.landmarks import landmarks_from_flat, landmarks_to_dicts, mean_visibility
+from app.services.response_encoding import encode_response, PACKED_DTYPES
+from app.services.skeleton_renderer import SkeletonRenderer, RenderCache
+from app.services.video_export import video_info, plan_chunks
+from app.services.frame_timeline import TimelineConflict, frame_timestamps, ingest_frames
+from app.services.session_archive import (
+    rehydrate_session, session_frames, session_has_frames
+)
+from app.api.v1.endpoints.users import get_current_user, get_current_user_ws
+from app.api.deps import (
+    get_pose_detector, get_stream_pose_detector, get_analysis_pipeline,
+    get_skeleton_renderer, get_render_cache
+)
+from app.tasks.pose_tasks import (
+    detect_pose_task, render_skeleton_task, render_video_chunk_task, concat_video_chunks_task
+)
+from celery import chord
+from celery.result import AsyncResult, GroupResult
 import base64
+import hashlib
+import hmac
+import json
+import uuid
 
 router = APIRouter()
 
@@ -48,18 +76,77 @@ async def get_task_status(job_id: str):
     }
 
 
+def _detect_or_404(pose_detector: PoseDetector, image: np.ndarray, rgb: bool = False) -> Dict:
+    """Run pose detection, raising 404 when no pose is found"""
+    result = pose_detector.detect(image, rgb=rgb)
+
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No pose detected in image"
+        )
+    return result
+
+
+def _detection_response(
+    result: Dict,
+    analysis_type: Optional[str],
+    pipeline: AnalysisPipeline
+) -> Dict:
+    """Build the detection response and run the requested analysis stages"""
+    response = {
+        "landmarks_3d": result['landmarks_3d'],
+        "landmarks_world": result['landmarks_world'],
+        "confidence": result['confidence']
+    }
+    response.update(pipeline.run(result['landmarks_3d'], analysis_type))
+    return response
+
+
+def _landmark_analysis_response(
+    values: List[float],
+    analysis_type: Optional[str],
+    pipeline: AnalysisPipeline
+) -> Dict:
+    """Validate client-computed landmarks and run only the analysis stages"""
+    points = landmarks_from_flat(values)
+    response = {"confidence": mean_visibility(points)}
+    response.update(pipeline.run(points, analysis_type))
+    return response
+
+
+def _check_dtype(dtype: str):
+    if dtype not in PACKED_DTYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"dtype must be one of: {', '.join(PACKED_DTYPES)}"
+        )
+
+
 @router.post("/detect", response_model=dict)
 async def detect_pose_from_image(
     analysis_type: str = None,
+    fields: Optional[str] = None,
+    dtype: str = 'float32',
     file: UploadFile = File(...),
+    accept: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    pose_detector: PoseDetector = Depends(get_pose_detector)
+    pose_detector: PoseDetector = Depends(get_pose_detector),
+    pipeline: AnalysisPipeline = Depends(get_analysis_pipeline)
 ):
-    """Detect pose from uploaded image"""
-    # Read image
+    """
+    Detect pose from uploaded image
+
+    The response format is negotiated from the Accept header: application/json
+    (default), application/x-msgpack, or application/x-pose-packed (landmarks
+    as raw float32/float16 blocks, see `dtype`). `fields` is a comma-separated
+    list of top-level fields to return, e.g. "landmarks_3d,exercise_analysis".
+    """
+    _check_dtype(dtype)
+
+    # Read image, decoding at reduced resolution when it is much larger than needed
     contents = await file.read()
-    nparr = np.frombuffer(contents, np.uint8)
-    image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    image = decode_image(contents, settings.DECODE_MIN_SIDE)
     
     if image is None:
         raise HTTPException(
@@ -68,45 +155,232 @@ async def detect_pose_from_image(
         )
     
     # Detect pose
-    result = pose_detector.detect(image)
+    result = _detect_or_404(pose_detector, image)
     
-    if result is None:
+    response = _detection_response(result, analysis_type, pipeline)
+    return encode_response(response, accept=accept, fields=fields, dtype=dtype)
+
+
+@router.post("/detect-raw", response_model=dict)
+async def detect_pose_from_raw_frame(
+    width: int,
+    height: int,
+    pixel_format: str = 'rgb24',
+    analysis_type: str = None,
+    fields: Optional[str] = None,
+    dtype: str = 'float32',
+    file: UploadFile = File(...),
+    accept: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    pose_detector: PoseDetector = Depends(get_pose_detector),
+    pipeline: AnalysisPipeline = Depends(get_analysis_pipeline)
+):
+    """
+    Detect pose from an already-decoded frame
+
+    The upload holds raw pixels (`pixel_format`: rgb24, bgr24, rgba, nv12,
+    i420 or yuyv) of the declared width/height, so no image decode is needed
+    and rgb24 frames skip color conversion entirely. Response options are the
+    same as /detect.
+    """
+    _check_dtype(dtype)
+
+    contents = await file.read()
+    try:
+        image = decode_raw(contents, width, height, pixel_format)
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No pose detected in image"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-    
-    response = {
-        "landmarks_3d": result['landmarks_3d'],
-        "landmarks_world": result['landmarks_world'],
-        "confidence": result['confidence']
-    }
 
-    # Run exercise analysis if requested
-    if analysis_type and result['landmarks_3d']:
-        analyzer = ExerciseAnalyzer()
-        analysis_result = {}
-        
-        if analysis_type.lower() == 'squat':
-            analysis_result = analyzer.analyze_squat(result['landmarks_3d'])
-        elif analysis_type.lower() == 'pushup':
-            analysis_result = analyzer.analyze_pushup(result['landmarks_3d'])
-        elif analysis_type.lower() == 'plank':
-            analysis_result = analyzer.analyze_plank(result['landmarks_3d'])
-        elif analysis_type.lower() == 'ergonomics':
-            ergo_analyzer = ErgonomicsAnalyzer()
-            analysis_result = ergo_analyzer.analyze(result['landmarks_3d'])
-            
-            
-        if analysis_result:
-            response['exercise_analysis'] = analysis_result
-
-    # Always detect activity state
-    if result['landmarks_3d']:
-        activity_classifier = ActivityClassifier()
-        response['detected_activity'] = activity_classifier.classify(result['landmarks_3d'])
-            
-    return response
+    result = _detect_or_404(pose_detector, image, rgb=True)
+
+    response = _detection_response(result, analysis_type, pipeline)
+    return encode_response(response, accept=accept, fields=fields, dtype=dtype)
+
+
+@router.post("/analyze-landmarks", response_model=dict)
+async def analyze_landmarks(
+    request: LandmarkArrayRequest,
+    fields: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    pipeline: AnalysisPipeline = Depends(get_analysis_pipeline)
+):
+    """Analyze landmarks computed on the client, skipping server-side inference"""
+    try:
+        response = _landmark_analysis_response(request.landmarks, request.analysis_type, pipeline)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    return encode_response(response, accept=accept, fields=fields)
+
+
+def _stream_frame_message(
+    stream: PoseStream,
+    pose_detector: PoseDetector,
+    pipeline: AnalysisPipeline,
+    data: bytes,
+    params: Dict
+) -> Dict:
+    """Process one stream frame; its allocations are measured in the stream stats"""
+    with stream.buffers.frame():
+        return _process_frame(stream, pose_detector, pipeline, data, params)
+
+
+def _process_frame(
+    stream: PoseStream,
+    pose_detector: PoseDetector,
+    pipeline: AnalysisPipeline,
+    data: bytes,
+    params: Dict
+) -> Dict:
+    """Decode one stream frame, run detection and analysis, and build the reply"""
+    pixel_format = params.get("pixel_format")
+    analysis_type = params.get("analysis_type")
+    try:
+        if pixel_format:
+            image = decode_raw(
+                data,
+                int(params.get("width", 0)),
+                int(params.get("height", 0)),
+                pixel_format,
+                buffers=stream.buffers
+            )
+        else:
+            image = decode_image(data, settings.DECODE_MIN_SIDE)
+    except (TypeError, ValueError):
+        image = None
+
+    if image is None:
+        return {"type": "error", "detail": "Invalid image"}
+
+    timestamp = params.get("timestamp")
+    result = stream.detect(
+        image,
+        pose_detector,
+        analysis_type=analysis_type,
+        timestamp=timestamp / 1000.0 if isinstance(timestamp, (int, float)) else None,
+        rgb=bool(pixel_format)
+    )
+    if result is None:
+        return {"type": "no_pose"}
+
+    response = _detection_response(result, analysis_type, pipeline)
+    for flag in ('reused', 'tracked'):
+        if result.get(flag):
+            response[flag] = True
+    return {"type": "pose", **stream.encode_landmarks(response)}
+
+
+@router.websocket("/stream")
+async def pose_stream(
+    websocket: WebSocket,
+    current_user: User = Depends(get_current_user_ws),
+    pose_detector: PoseDetector = Depends(get_stream_pose_detector),
+    pipeline: AnalysisPipeline = Depends(get_analysis_pipeline)
+):
+    """
+    Live pose stream over WebSocket (authenticate with ?token=<jwt>)
+
+    Client messages (JSON):
+        {"type": "frame", "image": "<base64 jpeg>", "analysis_type": "squat", "timestamp": <ms>}
+            Run server-side inference, temporal filtering, then the analysis stages.
+            Raw frames add "pixel_format", "width" and "height" (see /detect-raw).
+        {"type": "landmarks", "landmarks": [x, y, z, visibility, ...], "analysis_type": "squat"}
+            Client-side inference; only the analysis stages are run
+        {"type": "config", "codec": "delta", "precision": 0.001, "keyframe_interval": 30}
+            Send landmarks as keyframes plus quantized int16 deltas ("codec": null disables)
+        {"type": "keyframe"}
+            Resync: the next pose carries full (keyframe) landmarks
+        {"type": "config", "motion_gate": true, "motion_threshold": 3.0, "max_skip": 10, "extrapolate": false}
+            Skip inference on static frames; reused poses are flagged "reused": true
+        {"type": "config", "tracking": true, "inference_interval": 5}
+            Full inference on keyframes only; optical flow in between (flagged "tracked": true)
+        {"type": "config", "filter": "one_euro", "min_cutoff": 1.0, "beta": 5.0}
+            One Euro landmark filter (on by default, preset per analysis type; null disables)
+        {"type": "config", "binary_frames": {"pixel_format": "rgb24", "width": 640, "height": 480}}
+            Parameters for binary messages, which carry frame bytes without base64/JSON
+        {"type": "stats"}
+            Frame, buffer and per-frame allocation counters for this stream
+    """
+    await websocket.accept()
+    stream = PoseStream()
+
+    try:
+        while True:
+            received = await websocket.receive()
+            if received["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(received.get("code", 1000))
+
+            if received.get("bytes") is not None:
+                await websocket.send_json(_stream_frame_message(
+                    stream, pose_detector, pipeline, received["bytes"], stream.binary_frame_params
+                ))
+                continue
+
+            try:
+                message = json.loads(received.get("text") or "")
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                await websocket.send_json({"type": "error", "detail": "Invalid message"})
+                continue
+
+            message_type = message.get("type")
+            analysis_type = message.get("analysis_type")
+
+            if message_type == "config":
+                try:
+                    stream.configure(message)
+                except (TypeError, ValueError) as e:
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+                    continue
+                await websocket.send_json({
+                    "type": "config",
+                    "codec": "delta" if stream.encoders else None,
+                    "motion_gate": stream.motion_gate is not None,
+                    "tracking": stream.tracker is not None,
+                    "filter": "one_euro" if stream.filters else None
+                })
+
+            elif message_type == "keyframe":
+                stream.request_keyframe()
+
+            elif message_type == "stats":
+                await websocket.send_json({"type": "stats", **stream.stats()})
+
+            elif message_type == "landmarks":
+                try:
+                    response = _landmark_analysis_response(
+                        message.get("landmarks") or [], analysis_type, pipeline
+                    )
+                except ValueError as e:
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+                    continue
+                await websocket.send_json({"type": "analysis", **response})
+
+            elif message_type == "frame":
+                image_b64 = message.get("image") or ""
+                encoded_data = image_b64.split(',')[1] if ',' in image_b64 else image_b64
+                try:
+                    data = base64.b64decode(encoded_data)
+                except ValueError:
+                    await websocket.send_json({"type": "error", "detail": "Invalid image"})
+                    continue
+                await websocket.send_json(
+                    _stream_frame_message(stream, pose_detector, pipeline, data, message)
+                )
+
+            else:
+                await websocket.send_json(
+                    {"type": "error", "detail": f"Unknown message type: {message_type}"}
+                )
+    except WebSocketDisconnect:
+        pass
 
 
 @router.post("/session", response_model=PoseSessionResponse, status_code=status.HTTP_201_CREATED)
@@ -116,11 +390,19 @@ async def create_pose_session(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new pose session"""
+    landmarks_3d = session_data.landmarks_3d
+    if session_data.landmarks_3d_packed is not None:
+        landmarks_3d = session_data.landmarks_3d_packed.to_numpy()
+
+    landmarks_2d = session_data.landmarks_2d
+    if session_data.landmarks_2d_packed is not None:
+        landmarks_2d = session_data.landmarks_2d_packed.to_numpy()
+
     new_session = PoseSession(
         user_id=current_user.id,
         session_type=session_data.session_type,
-        landmarks_3d=session_data.landmarks_3d,
-        landmarks_2d=session_data.landmarks_2d,
+        landmarks_3d=landmarks_3d,
+        landmarks_2d=landmarks_2d,
         confidence_score=session_data.confidence_score,
         duration_seconds=session_data.duration_seconds
     )
@@ -134,19 +416,382 @@ async def create_pose_session(
 
 @router.get("/sessions", response_model=List[PoseSessionResponse])
 async def get_user_sessions(
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-    limit: int = 10
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None
 ):
-    """Get user's pose sessions"""
-    from sqlalchemy import select, desc
+    """
+    Get user's pose sessions, newest first
+
+    Pages are keyed on (created_at, id); pass the X-Next-Cursor header of a
+    response as `cursor` to get the next page. The header is absent on the
+    last page.
+    """
+    try:
+        query = keyset_page(
+            select(PoseSession).where(PoseSession.user_id == current_user.id),
+            PoseSession.created_at,
+            PoseSession.id,
+            cursor,
+            limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    result = await db.execute(query)
+    sessions, next_page = next_cursor(result.scalars().all(), limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
     
+    return sessions
+
+
+@router.get("/session/{session_id}", response_model=PoseSessionDetail)
+async def get_pose_session(
+    session_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a pose session with its landmarks (the session list omits them)"""
+    return await _get_owned_session(session_id, current_user, db, with_landmarks=True)
+
+
+async def _get_owned_session(
+    session_id: int,
+    current_user: User,
+    db: AsyncSession,
+    with_landmarks: bool = False
+) -> PoseSession:
+    """
+    Load a pose session of the current user, raising 404 otherwise
+
+    Landmarks are loaded only on request, from the archive for archived sessions.
+    """
+    query = select(PoseSession).where(
+        PoseSession.id == session_id,
+        PoseSession.user_id == current_user.id
+    )
+    if with_landmarks:
+        query = query.options(undefer_group("landmarks"))
+    result = await db.execute(query)
+    session = result.scalar_one_or_none()
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Pose session not found"
+        )
+    if with_landmarks:
+        await rehydrate_session(session)
+    return session
+
+
+def _session_landmarks(session: PoseSession) -> List[Dict]:
+    """Stored 3D landmarks of a session in the JSON landmark dict format"""
+    points = session.landmarks_3d
+    return landmarks_to_dicts(points) if points is not None else []
+
+
+def _session_background(session: PoseSession) -> Optional[np.ndarray]:
+    """Session thumbnail to draw over, if one was stored"""
+    if session.thumbnail_path and os.path.isfile(session.thumbnail_path):
+        return cv2.imread(session.thumbnail_path, cv2.IMREAD_COLOR)
+    return None
+
+
+@router.post("/render")
+async def render_pose_overlay(
+    width: Optional[int] = Query(None, ge=16, le=settings.RENDER_MAX_WIDTH),
+    quality: int = Query(settings.RENDER_JPEG_QUALITY, ge=10, le=100),
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    pose_detector: PoseDetector = Depends(get_pose_detector),
+    renderer: SkeletonRenderer = Depends(get_skeleton_renderer)
+):
+    """Detect pose in an uploaded image and return it as a JPEG with the skeleton drawn"""
+    contents = await file.read()
+    # Decode at reduced scale, keeping enough pixels for detection and the output width
+    image = decode_image(contents, max(width, settings.DECODE_MIN_SIDE) if width else 0)
+
+    if image is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid image file"
+        )
+
+    result = _detect_or_404(pose_detector, image)
+    jpeg = renderer.render_jpeg(result['landmarks_3d'], image, width=width, quality=quality)
+    return Response(content=jpeg, media_type="image/jpeg")
+
+
+@router.get("/session/{session_id}/render")
+async def render_session_overlay(
+    session_id: int,
+    width: Optional[int] = Query(None, ge=16, le=settings.RENDER_MAX_WIDTH),
+    quality: int = Query(settings.RENDER_JPEG_QUALITY, ge=10, le=100),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    renderer: SkeletonRenderer = Depends(get_skeleton_renderer),
+    cache: RenderCache = Depends(get_render_cache)
+):
+    """
+    Render the stored skeleton of a session as a JPEG
+
+    Drawn over the session thumbnail when one exists, otherwise on a blank
+    canvas. Renders are cached per (session, width, quality).
+    """
+    session = await _get_owned_session(session_id, current_user, db)
+
+    key = (session.id, width, quality)
+    jpeg = cache.get(key)
+    if jpeg is None:
+        # Landmarks are only loaded on a cache miss
+        session = await _get_owned_session(session_id, current_user, db, with_landmarks=True)
+        points = session.landmarks_3d
+        jpeg = renderer.render_jpeg(
+            points if points is not None else [],
+            _session_background(session),
+            width=width,
+            quality=quality
+        )
+        cache.put(key, jpeg)
+
+    return Response(
+        content=jpeg,
+        media_type="image/jpeg",
+        headers={"Cache-Control": "private, max-age=3600"}
+    )
+
+
+@router.post("/session/{session_id}/render-async", status_code=status.HTTP_202_ACCEPTED)
+async def render_session_overlay_async(
+    session_id: int,
+    width: Optional[int] = Query(None, ge=16, le=settings.RENDER_MAX_WIDTH),
+    quality: int = Query(settings.RENDER_JPEG_QUALITY, ge=10, le=100),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Trigger background rendering of a session overlay (result is a base64 JPEG)"""
+    session = await _get_owned_session(session_id, current_user, db, with_landmarks=True)
+
+    image_b64 = None
+    background = _session_background(session)
+    if background is not None:
+        image_b64 = base64.b64encode(cv2.imencode('.png', background)[1].tobytes()).decode('utf-8')
+
+    task = render_skeleton_task.delay(_session_landmarks(session), image_b64, width, quality)
+    return {"job_id": task.id, "status": "Processing"}
+
+
+def _export_dir() -> str:
+    path = os.path.join(settings.UPLOAD_DIR, "exports")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _export_token(group_id: str, user_id: int) -> str:
+    """Export id handed to clients: the chord group id signed for its owner"""
+    signature = hmac.new(
+        settings.SECRET_KEY.encode(), f"user{user_id}:{group_id}".encode(), hashlib.sha256
+    ).hexdigest()[:32]
+    return f"{group_id}.{signature}"
+
+
+def _owned_export_group(export_id: str, user_id: int) -> Optional[str]:
+    """Group id of an export id signed for this user, else None"""
+    group_id = export_id.rpartition(".")[0]
+    if group_id and hmac.compare_digest(_export_token(group_id, user_id), export_id):
+        return group_id
+    return None
+
+
+async def _session_issue_names(session: PoseSession, db: AsyncSession) -> List[str]:
+    """Issue names from the latest posture analysis of a session"""
     result = await db.execute(
-        select(PoseSession)
-        .where(PoseSession.user_id == current_user.id)
-        .order_by(desc(PoseSession.created_at))
-        .limit(limit)
+        select(PostureAnalysis.issues_detected)
+        .where(PostureAnalysis.pose_session_id == session.id)
+        .order_by(desc(PostureAnalysis.created_at))
+        .limit(1)
     )
-    sessions = result.scalars().all()
-    
-    return sessions
+    issues = result.scalar_one_or_none() or []
+    return [issue.get('name', '') for issue in issues if isinstance(issue, dict)]
+
+
+@router.post("/session/{session_id}/export-video", status_code=status.HTTP_202_ACCEPTED)
+async def export_session_video(
+    session_id: int,
+    width: Optional[int] = Query(None, ge=16, le=settings.RENDER_MAX_WIDTH),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Export the session video with skeleton and issue overlays burned in
+
+    The video is split into chunks rendered in parallel by workers and joined
+    at the end. Poll /export-status/{export_id} for progress and
+    /task-status/{job_id} for the final file name.
+    """
+    session = await _get_owned_session(session_id, current_user, db, with_landmarks=True)
+    if not session.video_path or not os.path.isfile(session.video_path):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Session has no source video"
+        )
+
+    try:
+        info = video_info(session.video_path)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if info["frame_count"] <= 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Session video has no frames")
+
+    issues = await _session_issue_names(session, db)
+    # Chunk tasks read their own timeline range; only the snapshot fallback goes inline
+    snapshot = None
+    if not await session_has_frames(db, session):
+        snapshot = [{"t": 0.0, "landmarks": _session_landmarks(session)}]
+
+    export_dir = _export_dir()
+    name = f"user{current_user.id}_session{session.id}_{uuid.uuid4().hex}"
+    chunks = plan_chunks(info["frame_count"], settings.EXPORT_CHUNK_FRAMES)
+    header = []
+    for index, (start, end) in enumerate(chunks):
+        header.append(render_video_chunk_task.s(
+            session.video_path,
+            session.id,
+            start,
+            end,
+            os.path.join(export_dir, f"{name}.part{index:04d}.mp4"),
+            width,
+            issues,
+            snapshot
+        ))
+    result = chord(header)(concat_video_chunks_task.s(os.path.join(export_dir, f"{name}.mp4")))
+    result.parent.save()
+
+    return {
+        "job_id": result.id,
+        "export_id": _export_token(result.parent.id, current_user.id),
+        "file_name": f"{name}.mp4",
+        "chunks": len(chunks),
+        "status": "Processing"
+    }
+
+
+@router.get("/export-status/{export_id}")
+async def get_export_status(
+    export_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Progress of a video export across its chunks (only its owner may read it)"""
+    group_id = _owned_export_group(export_id, current_user.id)
+    group = GroupResult.restore(group_id) if group_id else None
+    if group is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export not found")
+
+    done = total = 0
+    for chunk in group.results:
+        info = chunk.info if isinstance(chunk.info, dict) else {}
+        done += info.get("frames", info.get("done", 0))
+        total += info.get("total", 0)
+
+    return {
+        "export_id": export_id,
+        "chunks": len(group.results),
+        "chunks_completed": group.completed_count(),
+        "frames_done": done,
+        "progress": done / total if total else 0.0,
+        "failed": group.failed()
+    }
+
+
+@router.get("/exports/{file_name}")
+async def download_export(
+    file_name: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Download a finished video export of the current user"""
+    path = os.path.join(_export_dir(), os.path.basename(file_name))
+    if not file_name.startswith(f"user{current_user.id}_") or not file_name.endswith(".mp4") or not os.path.isfile(path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export not found")
+    return FileResponse(path, media_type="video/mp4", filename=file_name)
+
+
+@router.post("/session/{session_id}/frames", status_code=status.HTTP_201_CREATED)
+async def add_session_frames(
+    session_id: int,
+    frames: PoseFramesCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Store a batch of timeline frames for a session
+
+    Frames are bulk-inserted as chunked arrays; send long recordings in a few
+    large batches (each with its own start_frame) rather than frame by frame.
+    Batches must not overlap stored frames, and their times must keep the
+    timeline in order (409 otherwise). Only keyframes needed to interpolate within the error bound are kept; the
+    response reports the compression ratio and maximum reconstruction error.
+    """
+    session = await _get_owned_session(session_id, current_user, db)
+    if session.archive_path:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Session is archived"
+        )
+
+    landmarks = frames.landmarks.to_numpy()
+    if frames.timestamps is not None:
+        timestamps = np.asarray(frames.timestamps, dtype=np.float64)
+    else:
+        timestamps = frame_timestamps(len(landmarks), frames.fps, frames.start_frame)
+
+    tolerance = settings.TIMELINE_KEYFRAME_TOLERANCE if frames.tolerance is None else frames.tolerance
+    try:
+        stats = await ingest_frames(
+            db, session.id, landmarks, timestamps, frames.start_frame,
+            tolerance=tolerance, max_gap=settings.TIMELINE_MAX_KEYFRAME_GAP
+        )
+        await db.commit()
+    except TimelineConflict as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Frames overlap frames already stored"
+        )
+
+    return {"session_id": session.id, **stats}
+
+
+@router.get("/session/{session_id}/frames", response_model=dict)
+async def get_session_frames(
+    session_id: int,
+    start: int = Query(0, ge=0),
+    end: Optional[int] = Query(None, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Read timeline frames [start, end) of a session
+
+    Landmarks are returned packed: shape [frames, 33, 4] and base64
+    little-endian float32 data (the PackedLandmarks format).
+    """
+    session = await _get_owned_session(session_id, current_user, db)
+    frames = await session_frames(db, session, start, end)
+
+    return encode_response({
+        "frame_indices": frames.frame_indices.tolist(),
+        "timestamps": frames.timestamps.tolist(),
+        "landmarks": {
+            "shape": list(frames.landmarks.shape),
+            "data": base64.b64encode(frames.landmarks.astype('<f4').tobytes()).decode('ascii')
+        }
+    })
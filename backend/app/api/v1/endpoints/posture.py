@@ -1,19 +1,31 @@
 """
 Posture analysis endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import undefer_group
+from datetime import datetime, timedelta
+from typing import List, Optional
 
+from app.core.config import settings
 from app.db.session import get_db
+from app.db.pagination import NEXT_CURSOR_HEADER, keyset_page, next_cursor
 from app.models.user import User
 from app.models.pose_session import PoseSession
 from app.models.posture_analysis import PostureAnalysis
-from app.schemas.posture import PostureAnalysisCreate, PostureAnalysisResponse
+from app.schemas.posture import (
+    PostureAnalysisCreate, PostureAnalysisResponse, PostureAnalysisSummary, PostureSummary,
+    PostureAnalytics
+)
 from app.services.posture_analyzer import PostureAnalyzer
+from app.services.exercise_recommender import ExerciseRecommender
+from app.services.landmarks import landmarks_to_dicts
+from app.services.posture_analytics import BUCKETS, naive_utc, posture_analytics
+from app.services.session_archive import rehydrate_session
+from app.services.progress_aggregates import get_progress, record_analysis, summarize_progress
 from app.api.v1.endpoints.users import get_current_user
-from app.api.deps import get_posture_analyzer
+from app.api.deps import get_exercise_recommender, get_posture_analyzer
 from app.tasks.pose_tasks import analyze_posture_task
 from celery.result import AsyncResult
 
@@ -28,7 +40,9 @@ async def analyze_posture_async(
 ):
     """Trigger asynchronous posture analysis"""
     result = await db.execute(
-        select(PoseSession).where(
+        select(PoseSession)
+        .options(undefer_group("landmarks"))
+        .where(
             PoseSession.id == session_id,
             PoseSession.user_id == current_user.id
         )
@@ -41,7 +55,9 @@ async def analyze_posture_async(
             detail="Pose session not found"
         )
     
-    task = analyze_posture_task.delay(session.landmarks_3d)
+    # Stored landmarks load as arrays; Celery needs the JSON dict format
+    points = (await rehydrate_session(session)).landmarks_3d
+    task = analyze_posture_task.delay(landmarks_to_dicts(points) if points is not None else [])
     return {"job_id": task.id, "status": "Processing"}
 
 
@@ -50,12 +66,15 @@ async def analyze_posture(
     session_id: int,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-    posture_analyzer: PostureAnalyzer = Depends(get_posture_analyzer)
+    posture_analyzer: PostureAnalyzer = Depends(get_posture_analyzer),
+    recommender: ExerciseRecommender = Depends(get_exercise_recommender)
 ):
     """Analyze posture from a pose session"""
     # Get pose session
     result = await db.execute(
-        select(PoseSession).where(
+        select(PoseSession)
+        .options(undefer_group("landmarks"))
+        .where(
             PoseSession.id == session_id,
             PoseSession.user_id == current_user.id
         )
@@ -69,7 +88,8 @@ async def analyze_posture(
         )
     
     # Analyze posture
-    analysis_result = posture_analyzer.analyze(session.landmarks_3d)
+    analysis_result = posture_analyzer.analyze((await rehydrate_session(session)).landmarks_3d)
+    await recommender.catalog.ensure_fresh(db)
     
     # Create posture analysis record
     new_analysis = PostureAnalysis(
@@ -81,31 +101,127 @@ async def analyze_posture(
         deviations=analysis_result['alignment'],
         severity=analysis_result['severity'],
         recommendations=analysis_result['recommendations'],
-        recommended_exercises=[]  # TODO: Map issues to exercises
+        recommended_exercises=recommender.recommend(analysis_result['issues_detected'])
     )
     
     db.add(new_analysis)
+    await db.flush()
+    await record_analysis(db, new_analysis, settings.PROGRESS_DAILY_DAYS, settings.PROGRESS_RECENT_ANALYSES)
     await db.commit()
-    await db.refresh(new_analysis)
+    # No refresh: the instance already holds every value (expire_on_commit is
+    # off), and a refresh would expire the deferred detail columns
     
     return new_analysis
 
 
-@router.get("/history", response_model=List[PostureAnalysisResponse])
+@router.get("/history", response_model=List[PostureAnalysisSummary])
 async def get_posture_history(
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-    limit: int = 10
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None
 ):
-    """Get user's posture analysis history"""
-    from sqlalchemy import desc
+    """
+    Get user's posture analysis history, newest first
+
+    Only summary columns are read; the issue count and first issue name are
+    computed in the database instead of loading the detail JSON. Pages are
+    keyed on (created_at, id): pass the X-Next-Cursor header of a response
+    as `cursor` to get the next page.
+    """
+    query = select(
+        PostureAnalysis.id,
+        PostureAnalysis.pose_session_id,
+        PostureAnalysis.posture_score,
+        PostureAnalysis.severity,
+        case(
+            (func.json_typeof(PostureAnalysis.issues_detected) == "array",
+             func.json_array_length(PostureAnalysis.issues_detected)),
+            else_=0
+        ).label("issue_count"),
+        PostureAnalysis.issues_detected[0]["name"].as_string().label("primary_issue"),
+        PostureAnalysis.created_at
+    ).where(PostureAnalysis.user_id == current_user.id)
+    try:
+        query = keyset_page(query, PostureAnalysis.created_at, PostureAnalysis.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    result = await db.execute(query)
+    history, next_page = next_cursor(result.mappings().all(), limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
     
+    return history
+
+
+@router.get("/summary", response_model=PostureSummary)
+async def get_posture_summary(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the user's progress summary: score statistics, issue frequencies,
+    angle trends, daily buckets and the most recent analyses
+
+    Read from the per-user aggregate row kept up to date on every analysis.
+    """
+    progress = await get_progress(
+        db, current_user.id, settings.PROGRESS_DAILY_DAYS, settings.PROGRESS_RECENT_ANALYSES
+    )
+    return summarize_progress(progress)
+
+
+@router.get("/analytics", response_model=PostureAnalytics)
+async def get_posture_analytics(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket: str = Query("day", pattern=f"^({'|'.join(BUCKETS)})$"),
+    max_points: int = Query(500, ge=3, le=2000),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get posture trends bucketed by hour, day or week
+
+    Score percentiles, issue counts and mean joint angles are aggregated in
+    the database and returned as columnar arrays. Ranges with more than
+    `max_points` buckets are downsampled (LTTB on the mean score), so the
+    response size is bounded. Defaults to the last 90 days.
+    """
+    end = naive_utc(end) if end else datetime.utcnow()
+    start = naive_utc(start) if start else end - timedelta(days=90)
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+
+    return await posture_analytics(db, current_user.id, start, end, bucket, max_points)
+
+
+@router.get("/analysis/{analysis_id}", response_model=PostureAnalysisResponse)
+async def get_posture_analysis(
+    analysis_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a full posture analysis, including angles, deviations and issues"""
     result = await db.execute(
         select(PostureAnalysis)
-        .where(PostureAnalysis.user_id == current_user.id)
-        .order_by(desc(PostureAnalysis.created_at))
-        .limit(limit)
+        .options(undefer_group("detail"))
+        .where(
+            PostureAnalysis.id == analysis_id,
+            PostureAnalysis.user_id == current_user.id
+        )
     )
-    analyses = result.scalars().all()
-    
-    return analyses
+    analysis = result.scalar_one_or_none()
+
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Posture analysis not found"
+        )
+
+    return analysis
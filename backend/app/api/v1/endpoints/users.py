@@ -1,47 +1,132 @@
 """
 User endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, WebSocketException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from typing import Optional
 
-from app.db.session import get_db
+from app.core.config import settings
+
+from app.db.session import get_db, AsyncSessionLocal
 from app.models.user import User
 from app.schemas.user import UserResponse
 from app.core.security import decode_access_token, oauth2_scheme
+from app.api.deps import get_user_cache
+from app.services.history_export import MEDIA_TYPES, export_history, validate_export
+from app.services.user_cache import UserCache
 
 router = APIRouter()
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
+async def _resolve_user(token: str, db: AsyncSession, cache: UserCache) -> User:
+    """
+    Resolve the user referenced by a JWT access token
+
+    The token is verified on every call; the user row comes from the cache
+    when possible, so most requests make no database round trip.
+    """
     payload = decode_access_token(token)
     username = payload.get("sub")
-    
+
     if username is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials"
         )
-    
-    result = await db.execute(select(User).where(User.username == username))
-    user = result.scalar_one_or_none()
-    
+
+    user = await cache.get(username)
     if user is None:
+        result = await db.execute(select(User).where(User.username == username))
+        user = result.scalar_one_or_none()
+
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        await cache.put(user)
+
+    if not user.is_active:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
         )
-    
+
     return user
 
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+    cache: UserCache = Depends(get_user_cache)
+) -> User:
+    """
+    Get current authenticated user
+
+    A cached user is a detached snapshot: use its columns (id, flags), not
+    its relationships or password hash.
+    """
+    return await _resolve_user(token, db, cache)
+
+
+async def get_current_user_ws(
+    token: str = Query(...),
+    cache: UserCache = Depends(get_user_cache)
+) -> User:
+    """
+    Get current authenticated user for WebSocket connections (token passed as query param)
+
+    Uses a short-lived session so the connection does not hold a database
+    connection for the lifetime of the stream.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            return await _resolve_user(token, db, cache)
+        except HTTPException as e:
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
     current_user: User = Depends(get_current_user)
 ):
     """Get current user information"""
     return current_user
+
+
+@router.get("/me/export")
+async def export_current_user_history(
+    fmt: str = Query("ndjson", alias="format"),
+    include: str = "sessions,analyses",
+    accept_encoding: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream the user's full history as NDJSON, CSV or Parquet
+
+    `include` is a comma-separated list of sessions, analyses and frames
+    (frame timelines); CSV and Parquet take exactly one. Rows are read
+    through server-side cursors and streamed in chunks, gzip-compressed
+    when the client accepts it (Parquet is compressed internally).
+    """
+    datasets = [name.strip() for name in include.split(",") if name.strip()]
+    try:
+        validate_export(fmt, datasets)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    gzip = fmt != "parquet" and "gzip" in (accept_encoding or "").lower()
+    headers = {
+        "Content-Disposition": f'attachment; filename="history_{"_".join(datasets)}.{fmt}"',
+        "Vary": "Accept-Encoding",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        export_history(current_user.id, fmt, datasets, gzip, settings.HISTORY_EXPORT_BATCH_ROWS),
+        media_type=MEDIA_TYPES[fmt],
+        headers=headers
+    )
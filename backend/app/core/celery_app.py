@@ -2,6 +2,7 @@
 Celery configuration and instance
 """
 from celery import Celery
+from celery.schedules import crontab
 from app.core.config import settings
 
 celery_app = Celery(
@@ -18,6 +19,13 @@ celery_app.conf.update(
     enable_utc=True,
     task_track_started=True,
     task_time_limit=300,  # 5 minutes
+    beat_schedule={
+        # Move sessions past the retention window to cold storage (run `celery beat`)
+        "archive-old-sessions": {
+            "task": "archive_sessions_task",
+            "schedule": crontab(hour=3, minute=30),
+        },
+    },
 )
 
 # Auto-discover tasks in the app
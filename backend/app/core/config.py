@@ -21,6 +21,16 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # bcrypt cost; existing hashes are upgraded on their next login
+    BCRYPT_ROUNDS: int = 12
+    # Password hashing runs on this many threads; further requests queue up to the cap, then get 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    # Authenticated users are cached this long (0 disables); bounds staleness across workers
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    # Share the user cache between workers through REDIS_URL
+    USER_CACHE_REDIS: bool = False
     
     # Redis & Celery
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -34,6 +44,37 @@ class Settings(BaseSettings):
     # Model Configuration
     POSE_MODEL: str = "mediapipe"
     CONFIDENCE_THRESHOLD: float = 0.5
+    # Images are decoded at reduced scale while the short side stays >= this
+    DECODE_MIN_SIDE: int = 480
+    # Live streams filter landmarks server-side, so a cheaper model suffices
+    STREAM_MODEL_COMPLEXITY: int = 1
+    # Stored landmark precision: "float16" or "float32"
+    LANDMARK_STORAGE_DTYPE: str = "float16"
+    # Stored timelines keep only frames needed to interpolate within this
+    # coordinate error (normalized units); 0 stores every frame
+    TIMELINE_KEYFRAME_TOLERANCE: float = 0.005
+    TIMELINE_MAX_KEYFRAME_GAP: int = 30
+
+    # Skeleton rendering
+    RENDER_JPEG_QUALITY: int = 80
+    RENDER_MAX_WIDTH: int = 1920
+    RENDER_CACHE_BYTES: int = 33554432  # 32MB of encoded renders
+    # Annotated video exports are rendered in chunks of this many frames, in parallel
+    EXPORT_CHUNK_FRAMES: int = 300
+
+    # Progress aggregates keep daily buckets for this many days
+    PROGRESS_DAILY_DAYS: int = 90
+    PROGRESS_RECENT_ANALYSES: int = 5
+    # Sessions older than this are moved to compressed archive files by a daily job
+    SESSION_RETENTION_DAYS: int = 365
+    ARCHIVE_DIR: str = "archive"
+    ARCHIVE_BATCH_SESSIONS: int = 200
+    # Workers reload the in-memory exercise catalog at least this often
+    EXERCISE_CATALOG_REFRESH_SECONDS: int = 300
+    # Exercises recommended per posture analysis
+    RECOMMENDED_EXERCISES: int = 5
+    # History exports fetch this many rows per server-side cursor round trip
+    HISTORY_EXPORT_BATCH_ROWS: int = 500
     
     class Config:
         env_file = ".env"
@@ -2,7 +2,7 @@
 Security utilities for authentication and authorization
 """
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -10,7 +10,14 @@ from fastapi.security import OAuth2PasswordBearer
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with other rounds (either way) are flagged for rehashing on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_desired_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_desired_rounds=settings.BCRYPT_ROUNDS
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/auth/login")
 
 
@@ -19,6 +26,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its hash uses outdated parameters
+
+    Returns:
+        (verified, new_hash); new_hash is None unless the stored hash should be replaced
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
@@ -0,0 +1,42 @@
+"""
+Schema upkeep that create_all does not cover
+"""
+from sqlalchemy import inspect, text
+
+from app.db.base_class import Base
+
+
+def add_missing_columns(connection):
+    """
+    Add nullable columns declared on models but missing from existing tables
+
+    create_all never alters existing tables. Only nullable columns without a
+    server default are added here; anything else needs a migration script.
+    Run via conn.run_sync, before create_missing_indexes.
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable or column.server_default is not None:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+            ))
+
+
+def create_missing_indexes(connection):
+    """
+    Create indexes declared on models but missing from existing tables
+
+    create_all only creates indexes together with new tables, so indexes
+    added to an existing model are created here (run via conn.run_sync).
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
@@ -0,0 +1,66 @@
+"""
+Keyset (cursor) pagination on (created_at, id)
+"""
+import base64
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import desc, tuple_
+
+# Response header carrying the next-page token
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque token for the position after (created_at, id)"""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a token from encode_cursor
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_page(query, created_at_column, id_column, cursor: Optional[str], limit: int):
+    """
+    Order a query newest-first and restrict it to the page after `cursor`
+
+    Fetches limit + 1 rows so next_cursor can tell whether another page exists.
+    The row comparison matches a (..., created_at DESC, id DESC) index, so each
+    page is an index range scan regardless of how deep it is.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(created_at_column, id_column) < tuple_(created_at, row_id))
+    return query.order_by(desc(created_at_column), desc(id_column)).limit(limit + 1)
+
+
+def next_cursor(rows: Sequence, limit: int) -> Tuple[Sequence, Optional[str]]:
+    """
+    Split the limit + 1 rows of keyset_page into the page and the next token
+
+    Rows are ORM objects, rows or row mappings with `created_at` and `id`.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    if isinstance(last, Mapping):
+        return page, encode_cursor(last["created_at"], last["id"])
+    return page, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,39 @@
+"""
+Custom column types
+"""
+import numpy as np
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from app.core.config import settings
+from app.services.landmarks import pack_landmark_blob, unpack_landmark_blob
+
+
+class LandmarkArray(TypeDecorator):
+    """
+    Landmarks stored as a compact binary blob (see pack_landmark_blob)
+
+    Binds landmark dicts or arrays; loads straight to a float32 numpy array
+    without going through JSON.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, dtype: str = None):
+        super().__init__()
+        self.dtype = dtype
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return pack_landmark_blob(value, self.dtype or settings.LANDMARK_STORAGE_DTYPE)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return unpack_landmark_blob(bytes(value))
+
+    def compare_values(self, x, y):
+        if isinstance(x, np.ndarray) or isinstance(y, np.ndarray):
+            return x is y
+        return x == y
@@ -0,0 +1,38 @@
+"""
+Pose frame timeline database model
+"""
+from sqlalchemy import Column, Integer, Float, ForeignKey, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from app.db.base_class import Base
+from app.db.types import LandmarkArray
+
+
+class PoseFrameChunk(Base):
+    """
+    A run of consecutive frames of a session timeline
+
+    Frames are stored as chunked arrays (up to FRAMES_PER_CHUNK per row)
+    rather than one row per frame, so a 30-minute recording is a few hundred
+    rows and reads decode straight to (N, 33, 4) arrays.
+    """
+    __tablename__ = "pose_frame_chunks"
+    __table_args__ = (
+        UniqueConstraint("pose_session_id", "start_frame", name="uq_pose_frame_chunks_session_start"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    pose_session_id = Column(Integer, ForeignKey("pose_sessions.id", ondelete="CASCADE"), nullable=False)
+    start_frame = Column(Integer, nullable=False)  # Index of the first frame in the chunk
+    frame_count = Column(Integer, nullable=False)  # Frames spanned, including interpolated ones
+    start_time = Column(Float, nullable=False)  # Seconds, first frame
+    end_time = Column(Float, nullable=False)  # Seconds, last frame
+    landmarks = Column(LandmarkArray, nullable=False)  # (stored frames, 33, 4)
+    timestamps = Column(LargeBinary, nullable=False)  # Little-endian float64 seconds per stored frame
+    # Keyframe-compressed chunks: little-endian uint16 offsets of the stored
+    # frames within the chunk; NULL when every frame is stored
+    keyframe_offsets = Column(LargeBinary, nullable=True)
+    max_error = Column(Float, nullable=False, default=0.0)  # Largest coordinate error of the chunk as stored
+
+    # Relationships
+    pose_session = relationship("PoseSession", back_populates="frame_chunks")
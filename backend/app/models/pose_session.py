@@ -1,11 +1,15 @@
 """
 Pose session database model
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Float, Index
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
+import numpy as np
+from typing import Optional
 
 from app.db.base_class import Base
+from app.db.types import LandmarkArray
+from app.services.landmarks import LandmarkInput, landmarks_to_array
 
 
 class PoseSession(Base):
@@ -15,14 +19,74 @@ class PoseSession(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     session_type = Column(String)  # "live", "upload", "analysis"
-    landmarks_3d = Column(JSON)  # 3D pose landmarks
-    landmarks_2d = Column(JSON)  # 2D pose landmarks
+    # Landmark payloads are deferred: list queries load only summary columns.
+    # Load them with .options(undefer_group("landmarks")).
+    # Legacy JSON landmark storage; new rows use the packed columns. None is
+    # stored as SQL NULL (a plain JSON column would store the JSON literal 'null')
+    landmarks_3d_json = deferred(Column("landmarks_3d", JSON(none_as_null=True)), group="landmarks", raiseload=True)
+    landmarks_2d_json = deferred(Column("landmarks_2d", JSON(none_as_null=True)), group="landmarks", raiseload=True)
+    landmarks_3d_packed = deferred(Column(LandmarkArray, nullable=True), group="landmarks", raiseload=True)  # 3D pose landmarks
+    landmarks_2d_packed = deferred(Column(LandmarkArray, nullable=True), group="landmarks", raiseload=True)  # 2D pose landmarks
     confidence_score = Column(Float)
     duration_seconds = Column(Float)
     video_path = Column(String, nullable=True)
     thumbnail_path = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Set once the landmark payloads and timeline have moved to cold storage
+    # (see services/session_archive); the row stays as a stub
+    archive_path = Column(String, nullable=True)
+    archived_at = Column(DateTime, nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="pose_sessions")
     posture_analyses = relationship("PostureAnalysis", back_populates="pose_session", cascade="all, delete-orphan")
+    frame_chunks = relationship(
+        "PoseFrameChunk",
+        back_populates="pose_session",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="noload"
+    )
+
+    @property
+    def landmarks_3d(self) -> Optional[np.ndarray]:
+        """3D landmarks as an (N, 4) array, from packed or legacy JSON storage"""
+        return _stored_landmarks(self.landmarks_3d_packed, self.landmarks_3d_json)
+
+    @landmarks_3d.setter
+    def landmarks_3d(self, value: Optional[LandmarkInput]):
+        self.landmarks_3d_packed = _packable(value)
+        self.landmarks_3d_json = None
+
+    @property
+    def landmarks_2d(self) -> Optional[np.ndarray]:
+        """2D landmarks as an (N, 4) array, from packed or legacy JSON storage"""
+        return _stored_landmarks(self.landmarks_2d_packed, self.landmarks_2d_json)
+
+    @landmarks_2d.setter
+    def landmarks_2d(self, value: Optional[LandmarkInput]):
+        self.landmarks_2d_packed = _packable(value)
+        self.landmarks_2d_json = None
+
+
+def _stored_landmarks(packed: Optional[np.ndarray], legacy: Optional[list]) -> Optional[np.ndarray]:
+    if packed is not None:
+        return packed
+    if legacy:
+        return landmarks_to_array(legacy).astype(np.float32)
+    return None
+
+
+def _packable(value: Optional[LandmarkInput]) -> Optional[np.ndarray]:
+    if value is None or len(value) == 0:
+        return None
+    return landmarks_to_array(value)
+
+
+# Newest-first session lists per user; id breaks created_at ties for keyset pages
+Index(
+    "ix_pose_sessions_user_created",
+    PoseSession.user_id,
+    PoseSession.created_at.desc(),
+    PoseSession.id.desc()
+)
@@ -1,9 +1,11 @@
 """
 Posture analysis database model
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Float, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Float, Text, Index
+from sqlalchemy.orm import deferred, relationship, validates
 from datetime import datetime
+import math
+import numbers
 
 from app.db.base_class import Base
 
@@ -16,19 +18,70 @@ class PostureAnalysis(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     pose_session_id = Column(Integer, ForeignKey("pose_sessions.id"), nullable=False)
     
-    # Analysis results
+    # Analysis results. Detail payloads are deferred so history lists only
+    # read summary columns; load them with .options(undefer_group("detail")).
     posture_score = Column(Float)  # Overall posture score (0-100)
-    issues_detected = Column(JSON)  # List of detected issues
-    angles = Column(JSON)  # Joint angles
-    deviations = Column(JSON)  # Deviations from ideal posture
+    issues_detected = deferred(Column(JSON), group="detail", raiseload=True)  # List of detected issues
+    angles = deferred(Column(JSON), group="detail", raiseload=True)  # Joint angles
+    deviations = deferred(Column(JSON), group="detail", raiseload=True)  # Deviations from ideal posture
+
+    # Hot metrics copied out of `angles` into typed, indexed columns for
+    # cohort queries (filled whenever `angles` is set, see METRIC_COLUMNS)
+    cobb_angle_proxy = Column(Float, index=True)
+    neck_forward = Column(Float, index=True)
+    rom_shoulder_flexion_left = Column(Float, index=True)
+    rom_shoulder_flexion_right = Column(Float, index=True)
+    rom_knee_flexion_left = Column(Float, index=True)
+    rom_knee_flexion_right = Column(Float, index=True)
+    rom_hip_flexion_left = Column(Float, index=True)
+    rom_hip_flexion_right = Column(Float, index=True)
     
     # Recommendations
-    severity = Column(String)  # "low", "medium", "high"
-    recommendations = Column(Text)
-    recommended_exercises = Column(JSON)  # List of exercise IDs
+    severity = Column(String, index=True)  # "low", "medium", "high"
+    recommendations = deferred(Column(Text), group="detail", raiseload=True)
+    recommended_exercises = deferred(Column(JSON), group="detail", raiseload=True)  # List of exercise IDs
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="posture_analyses")
     pose_session = relationship("PoseSession", back_populates="posture_analyses")
+
+    @validates("angles")
+    def _sync_metric_columns(self, key, angles):
+        for name, value in metric_values(angles).items():
+            setattr(self, name, value)
+        return angles
+
+
+# Keys of `angles` promoted to typed columns of the same name
+METRIC_COLUMNS = (
+    "cobb_angle_proxy",
+    "neck_forward",
+    "rom_shoulder_flexion_left",
+    "rom_shoulder_flexion_right",
+    "rom_knee_flexion_left",
+    "rom_knee_flexion_right",
+    "rom_hip_flexion_left",
+    "rom_hip_flexion_right",
+)
+
+
+def metric_values(angles) -> dict:
+    """Typed column values for an `angles` dict (None for missing or non-numeric values)"""
+    angles = angles if isinstance(angles, dict) else {}
+    values = {}
+    for name in METRIC_COLUMNS:
+        value = angles.get(name)
+        finite = isinstance(value, numbers.Real) and not isinstance(value, bool) and math.isfinite(value)
+        values[name] = float(value) if finite else None
+    return values
+
+
+# Newest-first history per user; id breaks created_at ties for keyset pages
+Index(
+    "ix_posture_analyses_user_created",
+    PostureAnalysis.user_id,
+    PostureAnalysis.created_at.desc(),
+    PostureAnalysis.id.desc()
+)
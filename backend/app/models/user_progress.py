@@ -0,0 +1,37 @@
+"""
+Per-user progress aggregate database model
+"""
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, JSON, Float
+from datetime import datetime
+
+from app.db.base_class import Base
+
+
+class UserProgress(Base):
+    """
+    Running aggregates over a user's posture analyses
+
+    One row per user, updated in the same transaction that inserts an
+    analysis (see services/progress_aggregates), so summaries are a
+    single-row read instead of a scan of posture_analyses.
+    """
+    __tablename__ = "user_progress"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    analysis_count = Column(Integer, nullable=False, default=0)
+
+    # Posture score running mean / sum of squared deviations (Welford)
+    score_mean = Column(Float, nullable=False, default=0.0)
+    score_m2 = Column(Float, nullable=False, default=0.0)
+    score_min = Column(Float)
+    score_max = Column(Float)
+    last_score = Column(Float)
+    last_analysis_at = Column(DateTime)
+
+    issue_counts = Column(JSON, nullable=False, default=dict)  # {issue name: count}
+    severity_counts = Column(JSON, nullable=False, default=dict)  # {severity: count}
+    angle_stats = Column(JSON, nullable=False, default=dict)  # {angle: [count, mean, m2, min, max]}
+    daily = Column(JSON, nullable=False, default=dict)  # {"YYYY-MM-DD": {"count", "score_sum", "angle_sums"}}
+    recent = Column(JSON, nullable=False, default=list)  # Newest analysis summaries, newest first
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,9 +1,12 @@
 """
 Pydantic schemas for pose detection
 """
-from pydantic import BaseModel
-from typing import List, Dict, Optional
+from pydantic import BaseModel, PrivateAttr, field_validator, model_validator
+from typing import List, Dict, Optional, Union
 from datetime import datetime
+import numpy as np
+
+from app.services.landmarks import landmarks_to_dicts, unpack_landmarks
 
 
 class Landmark3D(BaseModel):
@@ -18,13 +21,60 @@ class PoseData(BaseModel):
     confidence: float
 
 
+class PackedLandmarks(BaseModel):
+    """
+    Landmarks packed as one array instead of one object per point
+
+    `data` is either a flat list of floats or a base64 little-endian float32
+    buffer; `shape` declares its layout, e.g. [33, 4].
+    """
+    shape: List[int]
+    data: Union[str, List[float]]
+
+    _array: np.ndarray = PrivateAttr()
+
+    @model_validator(mode='after')
+    def _unpack(self) -> 'PackedLandmarks':
+        self._array = unpack_landmarks(self.data, self.shape)
+        return self
+
+    def to_numpy(self) -> np.ndarray:
+        """Validated float32 array with the declared shape"""
+        return self._array
+
+
 class PoseSessionCreate(BaseModel):
     session_type: str
-    landmarks_3d: List[Dict]
+    landmarks_3d: Optional[List[Dict]] = None
     landmarks_2d: Optional[List[Dict]] = None
+    landmarks_3d_packed: Optional[PackedLandmarks] = None
+    landmarks_2d_packed: Optional[PackedLandmarks] = None
     confidence_score: float
     duration_seconds: Optional[float] = None
 
+    @field_validator('landmarks_3d', 'landmarks_2d')
+    @classmethod
+    def _check_landmark_dicts(cls, value: Optional[List[Dict]]) -> Optional[List[Dict]]:
+        """Each landmark needs numeric x and y; z and visibility may be omitted or null"""
+        for index, landmark in enumerate(value or ()):
+            for key in ('x', 'y', 'z', 'visibility'):
+                coordinate = landmark.get(key)
+                if coordinate is None and key in ('z', 'visibility'):
+                    continue
+                if isinstance(coordinate, bool) or not isinstance(coordinate, (int, float)):
+                    raise ValueError(f"Landmark {index} needs a numeric '{key}'")
+        return value
+
+    @model_validator(mode='after')
+    def _require_landmarks(self) -> 'PoseSessionCreate':
+        if self.landmarks_3d is None and self.landmarks_3d_packed is None:
+            raise ValueError("Either landmarks_3d or landmarks_3d_packed is required")
+        for name in ('landmarks_3d_packed', 'landmarks_2d_packed'):
+            packed = getattr(self, name)
+            if packed is not None and packed.to_numpy().ndim != 2:
+                raise ValueError(f"{name} must hold a single pose (33, 3|4)")
+        return self
+
 
 class PoseSessionResponse(BaseModel):
     id: int
@@ -33,6 +83,67 @@ class PoseSessionResponse(BaseModel):
     confidence_score: float
     duration_seconds: Optional[float]
     created_at: datetime
+    archived_at: Optional[datetime] = None  # Payloads moved to cold storage (loaded on demand)
     
     class Config:
         from_attributes = True
+
+
+class PoseSessionDetail(PoseSessionResponse):
+    """A session with its landmark payload (stored arrays are returned as landmark dicts)"""
+    landmarks_3d: Optional[List[Dict]] = None
+    landmarks_2d: Optional[List[Dict]] = None
+    video_path: Optional[str] = None
+    thumbnail_path: Optional[str] = None
+
+    @field_validator('landmarks_3d', 'landmarks_2d', mode='before')
+    @classmethod
+    def _landmark_dicts(cls, value):
+        if isinstance(value, np.ndarray):
+            return landmarks_to_dicts(value)
+        return value
+
+
+class LandmarkArrayRequest(BaseModel):
+    """Pre-computed landmarks as a flat [x, y, z(, visibility)] * 33 array"""
+    landmarks: List[float]
+    analysis_type: Optional[str] = None
+
+
+class PoseFramesCreate(BaseModel):
+    """
+    A batch of timeline frames for a session
+
+    `landmarks` has shape [frames, 33, 3|4]. Frame times come from
+    `timestamps` (finite, non-decreasing seconds, one per frame) or from a
+    constant `fps`.
+    `tolerance` overrides the keyframe compression error bound (0 stores
+    every frame).
+    """
+    landmarks: PackedLandmarks
+    timestamps: Optional[List[float]] = None
+    fps: Optional[float] = None
+    start_frame: int = 0
+    tolerance: Optional[float] = None
+
+    @model_validator(mode='after')
+    def _check_frames(self) -> 'PoseFramesCreate':
+        frames = self.landmarks.to_numpy()
+        if frames.ndim != 3:
+            raise ValueError("landmarks must have shape [frames, 33, 3|4]")
+        if self.timestamps is not None:
+            if len(self.timestamps) != len(frames):
+                raise ValueError(f"Got {len(self.timestamps)} timestamps for {len(frames)} frames")
+            timestamps = np.asarray(self.timestamps, dtype=np.float64)
+            if not np.isfinite(timestamps).all():
+                raise ValueError("timestamps must be finite")
+            if (np.diff(timestamps) < 0).any():
+                raise ValueError("timestamps must be non-decreasing")
+        elif not self.fps or not np.isfinite(self.fps) or self.fps <= 0:
+            raise ValueError("Either timestamps or a positive fps is required")
+        if self.start_frame < 0:
+            raise ValueError("start_frame must be >= 0")
+        if self.tolerance is not None and self.tolerance < 0:
+            raise ValueError("tolerance must be >= 0")
+        return self
+
@@ -39,3 +39,67 @@ class PostureAnalysisResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class PostureAnalysisSummary(BaseModel):
+    """History list entry; fetch /posture/analysis/{id} for the full analysis"""
+    id: int
+    pose_session_id: int
+    posture_score: float
+    severity: str
+    issue_count: int
+    primary_issue: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class AngleTrend(BaseModel):
+    count: int
+    mean: float
+    stddev: float
+    min: float
+    max: float
+
+
+class DailyProgress(BaseModel):
+    date: str
+    count: int
+    average_score: float
+    angles: Dict[str, float]
+
+
+class PostureSummary(BaseModel):
+    """Per-user aggregates, maintained as analyses are recorded"""
+    analysis_count: int
+    average_score: Optional[float] = None
+    score_stddev: float
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    last_score: Optional[float] = None
+    last_analysis_at: Optional[datetime] = None
+    issue_frequencies: Dict[str, int]
+    severity_counts: Dict[str, int]
+    angle_trends: Dict[str, AngleTrend]
+    daily: List[DailyProgress]
+    recent: List[PostureAnalysisSummary]
+
+
+class PostureAnalytics(BaseModel):
+    """
+    Bucketed series as parallel arrays: index i of every list is bucket t[i]
+
+    Missing angle values (no analysis in the bucket reported them) are null.
+    """
+    bucket: str
+    start: datetime
+    end: datetime
+    t: List[datetime]
+    count: List[int]
+    score_mean: List[Optional[float]]
+    score_percentiles: Dict[str, List[Optional[float]]]
+    angles: Dict[str, List[Optional[float]]]
+    issues: Dict[str, List[int]]
+    total_buckets: int
+    downsampled: bool
@@ -70,4 +70,6 @@ class ActivityClassifier:
         return "Standing"
 
     def _to_numpy(self, landmarks: List[Dict]) -> np.ndarray:
+        if isinstance(landmarks, np.ndarray):
+            return landmarks[:, :3]
         return np.array([[lm['x'], lm['y'], lm['z']] for lm in landmarks])
@@ -0,0 +1,56 @@
+"""
+Landmark analysis pipeline shared by server-side detection and client-side submissions
+"""
+from typing import Dict, Optional
+
+from app.services.exercise_analyzer import ExerciseAnalyzer
+from app.services.ergonomics_analyzer import ErgonomicsAnalyzer
+from app.services.activity_classifier import ActivityClassifier
+from app.services.posture_analyzer import PostureAnalyzer
+from app.services.landmarks import LandmarkInput
+
+
+class AnalysisPipeline:
+    """Run the analysis stages that operate on landmarks only (no inference)"""
+
+    ANALYSIS_TYPES = ('squat', 'pushup', 'plank', 'ergonomics', 'posture')
+
+    def __init__(self):
+        self.exercise_analyzer = ExerciseAnalyzer()
+        self.ergonomics_analyzer = ErgonomicsAnalyzer()
+        self.activity_classifier = ActivityClassifier()
+        self.posture_analyzer = PostureAnalyzer()
+
+    def run(self, landmarks: LandmarkInput, analysis_type: Optional[str] = None) -> Dict:
+        """
+        Analyze a single pose
+
+        Args:
+            landmarks: 33 landmarks as a list of dicts or an (33, 3|4) array
+            analysis_type: Optional analysis to run (squat, pushup, plank, ergonomics, posture)
+
+        Returns:
+            Dictionary with 'detected_activity' and, if requested,
+            'exercise_analysis' or 'posture_analysis'
+        """
+        response = {}
+        if landmarks is None or len(landmarks) == 0:
+            return response
+
+        analysis_type = (analysis_type or '').lower()
+
+        if analysis_type == 'squat':
+            response['exercise_analysis'] = self.exercise_analyzer.analyze_squat(landmarks)
+        elif analysis_type == 'pushup':
+            response['exercise_analysis'] = self.exercise_analyzer.analyze_pushup(landmarks)
+        elif analysis_type == 'plank':
+            response['exercise_analysis'] = self.exercise_analyzer.analyze_plank(landmarks)
+        elif analysis_type == 'ergonomics':
+            response['exercise_analysis'] = self.ergonomics_analyzer.analyze(landmarks)
+        elif analysis_type == 'posture':
+            response['posture_analysis'] = self.posture_analyzer.analyze(landmarks)
+
+        # Always detect activity state
+        response['detected_activity'] = self.activity_classifier.classify(landmarks)
+
+        return response
@@ -0,0 +1,57 @@
+"""
+Point series downsampling for charts
+"""
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: pick `threshold` points that preserve a series' shape
+
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the average of the next bucket. Missing (NaN) y values are treated as the
+    series mean so they neither win nor break the selection.
+
+    Args:
+        x: (N,) increasing positions (e.g. epoch seconds)
+        y: (N,) values
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted indices of the kept points (all of them if N <= threshold)
+    """
+    count = len(x)
+    if threshold >= count:
+        return np.arange(count)
+    if threshold < 3:
+        return np.array([0, count - 1][:max(threshold, 0)], dtype=np.int64)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if np.isnan(y).any():
+        y = np.where(np.isnan(y), np.nanmean(y) if not np.isnan(y).all() else 0.0, y)
+
+    # Interior points split into threshold - 2 buckets
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, count - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_start, next_end = count - 1, count
+        mean_x = x[next_start:next_end].mean()
+        mean_y = y[next_start:next_end].mean()
+
+        # Twice the triangle area for each candidate; the constant factor does not change argmax
+        areas = np.abs(
+            (x[previous] - mean_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (mean_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return kept
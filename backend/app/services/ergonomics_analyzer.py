@@ -86,4 +86,6 @@ class ErgonomicsAnalyzer:
         }
 
     def _to_numpy(self, landmarks: List[Dict]) -> np.ndarray:
+        if isinstance(landmarks, np.ndarray):
+            return landmarks[:, :3]
         return np.array([[lm['x'], lm['y'], lm['z']] for lm in landmarks])
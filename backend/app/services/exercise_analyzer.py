@@ -151,6 +151,8 @@ class ExerciseAnalyzer:
         }
 
     def _to_numpy(self, landmarks: List[Dict]) -> np.ndarray:
+        if isinstance(landmarks, np.ndarray):
+            return landmarks[:, :3]
         return np.array([[lm['x'], lm['y'], lm['z']] for lm in landmarks])
 
     def _calculate_angle_3d(self, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> float:
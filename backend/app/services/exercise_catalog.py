@@ -0,0 +1,180 @@
+"""
+In-process exercise catalog with inverted indexes and HTTP validators
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.exercise import Exercise
+from app.schemas.exercise import ExerciseResponse
+from app.services.response_encoding import encode_json
+
+# Record fields with an inverted index; list-valued fields index each element
+INDEXED_FIELDS = ('category', 'difficulty', 'tags', 'target_areas')
+
+
+def _keys(value) -> List[str]:
+    """Normalized index keys of a field value"""
+    values = value if isinstance(value, (list, tuple)) else [value]
+    return [str(item).strip().lower() for item in values if item is not None and str(item).strip()]
+
+
+def exercise_record(exercise: Exercise) -> Dict:
+    """JSON-ready record, shaped like ExerciseResponse"""
+    return ExerciseResponse.model_validate(exercise).model_dump()
+
+
+class ExerciseCatalog:
+    """
+    The full exercise catalog held in memory, with one inverted index per field
+
+    Filters intersect id sets, so any combination is answered without a
+    query. The ETag is a hash of the content, identical on every worker
+    holding the same catalog; Last-Modified is when this process last saw
+    the content change. Each worker reloads at most every
+    `refresh_seconds`, which bounds staleness after changes made elsewhere.
+    """
+
+    def __init__(self, refresh_seconds: float = 300):
+        self.refresh_seconds = refresh_seconds
+        self.records: Dict[int, Dict] = {}
+        self.indexes: Dict[str, Dict[str, Set[int]]] = {field: {} for field in INDEXED_FIELDS}
+        self.active: Set[int] = set()
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[datetime] = None
+        self.loaded_at: Optional[float] = None
+        self._record_hashes: Dict[int, str] = {}
+        self._listeners = []
+
+    @property
+    def stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at >= self.refresh_seconds
+
+    async def refresh(self, db: AsyncSession):
+        """Reload every exercise from the database"""
+        result = await db.execute(select(Exercise))
+        self.load(exercise_record(exercise) for exercise in result.scalars().all())
+
+    async def ensure_fresh(self, db: AsyncSession):
+        if self.stale:
+            await self.refresh(db)
+
+    def load(self, records: Iterable[Dict]):
+        """Replace the catalog; validators only change if the content did"""
+        records = {record['id']: record for record in records}
+        changed = [record for exercise_id, record in records.items() if self.records.get(exercise_id) != record]
+        removed = [exercise_id for exercise_id in self.records if exercise_id not in records]
+        for exercise_id in removed:
+            self._unindex(exercise_id)
+            del self.records[exercise_id]
+            del self._record_hashes[exercise_id]
+        for record in changed:
+            self._put(record)
+        self.loaded_at = time.monotonic()
+        if changed or removed or self.etag is None:
+            self._touch(changed, removed)
+
+    def upsert(self, record: Dict):
+        """Add or replace one exercise, updating only its index entries"""
+        if self.records.get(record['id']) == record:
+            return
+        self._put(record)
+        self._touch([record], [])
+
+    def subscribe(self, listener):
+        """Call `listener(changed_records, removed_ids)` whenever the content changes"""
+        self._listeners.append(listener)
+
+    def get(self, exercise_id: int) -> Optional[Dict]:
+        return self.records.get(exercise_id)
+
+    def filter(
+        self,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        tags: Sequence[str] = (),
+        target_areas: Sequence[str] = (),
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Active exercises matching every given criterion, in id order
+
+        Matching is case-insensitive; an exercise must carry all requested
+        tags and target areas.
+        """
+        criteria = [('category', category), ('difficulty', difficulty)]
+        criteria += [('tags', tag) for tag in tags or ()]
+        criteria += [('target_areas', area) for area in target_areas or ()]
+        candidates = [
+            self.indexes[field].get(key, set())
+            for field, value in criteria if value
+            for key in _keys(value)
+        ]
+        ids = self.active.intersection(*sorted(candidates, key=len)) if candidates else self.active
+        ids = sorted(ids)
+        if limit is not None:
+            ids = ids[:max(limit, 0)]
+        return [self.records[exercise_id] for exercise_id in ids]
+
+    def _put(self, record: Dict):
+        exercise_id = record['id']
+        if exercise_id in self.records:
+            self._unindex(exercise_id)
+        self.records[exercise_id] = record
+        self._record_hashes[exercise_id] = hashlib.sha1(encode_json(record)).hexdigest()
+        for field in INDEXED_FIELDS:
+            for key in _keys(record.get(field)):
+                self.indexes[field].setdefault(key, set()).add(exercise_id)
+        if record.get('is_active'):
+            self.active.add(exercise_id)
+
+    def _unindex(self, exercise_id: int):
+        record = self.records[exercise_id]
+        for field in INDEXED_FIELDS:
+            index = self.indexes[field]
+            for key in _keys(record.get(field)):
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(exercise_id)
+                    if not ids:
+                        del index[key]
+        self.active.discard(exercise_id)
+
+    def _touch(self, changed: List[Dict], removed: List[int]):
+        digest = hashlib.sha1()
+        for exercise_id in sorted(self._record_hashes):
+            digest.update(f"{exercise_id}:{self._record_hashes[exercise_id]};".encode())
+        self.etag = f'"{digest.hexdigest()[:32]}"'
+        # HTTP dates have one-second resolution
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        for listener in self._listeners:
+            listener(changed, removed)
+
+    def validators(self) -> Dict[str, str]:
+        """ETag and Last-Modified response headers"""
+        return {"ETag": self.etag, "Last-Modified": format_datetime(self.last_modified, usegmt=True)}
+
+    def not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        """
+        Whether a conditional GET can be answered with 304
+
+        If-None-Match takes precedence; If-Modified-Since is only used
+        without it (RFC 9110).
+        """
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or any(tag.removeprefix('W/') == self.etag for tag in tags)
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return self.last_modified <= since
+        return False
@@ -0,0 +1,153 @@
+"""
+Issue → exercise recommendations from a precomputed inverted index
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.services.exercise_catalog import ExerciseCatalog
+
+# Catalog tags that address each issue reported by PostureAnalyzer. The
+# issue name itself, slugified (e.g. "hip_asymmetry"), always matches too.
+ISSUE_TAGS = {
+    'Forward Head Posture': ('forward_head', 'neck_pain'),
+    'Rounded Shoulders': ('rounded_shoulders', 'kyphosis', 'chest_tightness'),
+    'Shoulder Asymmetry': ('shoulder_asymmetry', 'shoulder_imbalance'),
+    'Hip Asymmetry': ('hip_asymmetry', 'hip_imbalance'),
+    'Potential Scoliosis / Asymmetry': ('scoliosis', 'lateral_lean'),
+    'Lateral Spine Lean': ('lateral_lean', 'scoliosis'),
+}
+
+# A matching tag counts more than a matching target area (affected joint)
+TAG_WEIGHT = 3.0
+AREA_WEIGHT = 1.0
+SEVERITY_WEIGHTS = {'low': 1.0, 'medium': 1.5, 'high': 2.0}
+# Easier exercises first among equal scores
+DIFFICULTY_RANK = {'beginner': 0, 'intermediate': 1, 'advanced': 2}
+
+
+def slug(value: str) -> str:
+    """Normalized key: "Upper Back" / "upper_back" / "upper-back" -> "upper_back" """
+    return re.sub(r'[^a-z0-9]+', '_', str(value).lower()).strip('_')
+
+
+def issue_tags(name: str) -> Set[str]:
+    return {slug(tag) for tag in ISSUE_TAGS.get(name, ())} | {slug(name)}
+
+
+class ExerciseRecommender:
+    """
+    Ranks catalog exercises for detected posture issues
+
+    Two inverted indexes map tag keys and target-area keys to exercise ids.
+    Ranked candidate lists per issue name and per joint are built from them
+    on first use and cached; catalog changes (via ExerciseCatalog.subscribe)
+    update only the affected keys and drop only the cached lists that used
+    them. A recommendation therefore costs O(issues * candidates_per_key).
+    """
+
+    def __init__(self, catalog: ExerciseCatalog, limit: int = 5, candidates_per_key: int = 10):
+        self.catalog = catalog
+        self.limit = limit
+        self.candidates_per_key = candidates_per_key
+        self.tag_index: Dict[str, Set[int]] = {}
+        self.area_index: Dict[str, Set[int]] = {}
+        self._keys: Dict[int, Tuple[Set[str], Set[str]]] = {}
+        self._difficulty: Dict[int, int] = {}
+        self._issue_cache: Dict[str, List[int]] = {}
+        self._joint_cache: Dict[str, List[int]] = {}
+        self.update(list(catalog.records.values()), [])
+        catalog.subscribe(self.update)
+
+    def update(self, changed: Iterable[Dict], removed: Iterable[int]):
+        """Apply catalog changes to the indexes; inactive exercises are dropped"""
+        touched_tags: Set[str] = set()
+        touched_areas: Set[str] = set()
+        for exercise_id in removed:
+            tags, areas = self._remove(exercise_id)
+            touched_tags |= tags
+            touched_areas |= areas
+        for record in changed:
+            tags, areas = self._remove(record['id'])
+            touched_tags |= tags
+            touched_areas |= areas
+            if record.get('is_active'):
+                tags, areas = self._add(record)
+                touched_tags |= tags
+                touched_areas |= areas
+
+        self._issue_cache = {
+            name: ranked for name, ranked in self._issue_cache.items() if not issue_tags(name) & touched_tags
+        }
+        for joint in touched_areas:
+            self._joint_cache.pop(joint, None)
+
+    def _add(self, record: Dict) -> Tuple[Set[str], Set[str]]:
+        exercise_id = record['id']
+        tags = {slug(tag) for tag in record.get('tags') or ()}
+        areas = {slug(area) for area in record.get('target_areas') or ()}
+        for tag in tags:
+            self.tag_index.setdefault(tag, set()).add(exercise_id)
+        for area in areas:
+            self.area_index.setdefault(area, set()).add(exercise_id)
+        self._keys[exercise_id] = (tags, areas)
+        self._difficulty[exercise_id] = DIFFICULTY_RANK.get(record.get('difficulty'), len(DIFFICULTY_RANK))
+        return tags, areas
+
+    def _remove(self, exercise_id: int) -> Tuple[Set[str], Set[str]]:
+        tags, areas = self._keys.pop(exercise_id, (set(), set()))
+        self._difficulty.pop(exercise_id, None)
+        for index, keys in ((self.tag_index, tags), (self.area_index, areas)):
+            for key in keys:
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(exercise_id)
+                    if not ids:
+                        del index[key]
+        return tags, areas
+
+    def _ranked(self, scores: Dict[int, float], count: int) -> List[int]:
+        ranked = sorted(scores, key=lambda exercise_id: (-scores[exercise_id], self._difficulty[exercise_id], exercise_id))
+        return ranked[:count]
+
+    def issue_candidates(self, name: str) -> List[int]:
+        """Exercises tagged for an issue, most matching tags first"""
+        ranked = self._issue_cache.get(name)
+        if ranked is None:
+            scores: Dict[int, float] = {}
+            for tag in issue_tags(name):
+                for exercise_id in self.tag_index.get(tag, ()):
+                    scores[exercise_id] = scores.get(exercise_id, 0.0) + 1.0
+            ranked = self._issue_cache[name] = self._ranked(scores, self.candidates_per_key)
+        return ranked
+
+    def joint_candidates(self, joint: str) -> List[int]:
+        """Exercises targeting a joint / body area"""
+        joint = slug(joint)
+        ranked = self._joint_cache.get(joint)
+        if ranked is None:
+            ranked = self._joint_cache[joint] = self._ranked(
+                dict.fromkeys(self.area_index.get(joint, ()), 1.0), self.candidates_per_key
+            )
+        return ranked
+
+    def recommend(self, issues: List[Dict], limit: Optional[int] = None) -> List[int]:
+        """
+        Exercise ids for the detected issues, best first
+
+        Each issue adds its tagged exercises (TAG_WEIGHT) and exercises
+        targeting its affected joints (AREA_WEIGHT), scaled by severity;
+        higher-ranked candidates of a list score slightly more.
+        """
+        limit = self.limit if limit is None else limit
+        scores: Dict[int, float] = {}
+        for issue in issues or ():
+            if not isinstance(issue, dict) or not issue.get('name'):
+                continue
+            severity = SEVERITY_WEIGHTS.get(issue.get('severity'), 1.0)
+            lists = [(TAG_WEIGHT, self.issue_candidates(issue['name']))]
+            lists += [(AREA_WEIGHT, self.joint_candidates(joint)) for joint in issue.get('affected_joints') or ()]
+            for weight, ranked in lists:
+                for position, exercise_id in enumerate(ranked):
+                    bonus = 1.0 - position / (2 * self.candidates_per_key)
+                    scores[exercise_id] = scores.get(exercise_id, 0.0) + severity * weight * bonus
+        return self._ranked(scores, limit)
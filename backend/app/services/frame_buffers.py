@@ -0,0 +1,103 @@
+"""
+Reusable per-stream frame buffers
+"""
+import sys
+import tracemalloc
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+
+class FrameBuffers:
+    """
+    Named, preallocated arrays reused across the frames of one stream
+
+    Stages ask for a buffer by name and shape; it is only (re)allocated when
+    the shape or dtype changes, so a stream with a steady frame size stops
+    allocating images and landmark arrays once its double buffers have been
+    filled (two frames).
+
+    Pool misses only show what this pool allocates, so each frame (see
+    `frame()`) is also measured as a whole: the change in live Python heap
+    blocks (sys.getallocatedblocks) and, while tracemalloc is tracing, the
+    peak traced memory above the frame's start.
+    """
+
+    def __init__(self):
+        self._buffers: Dict[str, np.ndarray] = {}
+        self.frames = 0
+        self.allocations = 0
+        self.bytes_allocated = 0
+        self.last_frame_allocations = 0
+        self.last_frame_blocks = 0
+        self.retained_blocks = 0
+        self.last_frame_peak_bytes: Optional[int] = None
+        self.max_frame_peak_bytes: Optional[int] = None
+        self._frame_start_allocations = 0
+        self._frame_start_blocks = 0
+        self._frame_start_traced: Optional[int] = None
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Buffer `name` with the given shape/dtype (contents are undefined)"""
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buffer
+            self.allocations += 1
+            self.bytes_allocated += buffer.nbytes
+        return buffer
+
+    def begin_frame(self):
+        """
+        Mark the start of a frame for per-frame allocation accounting
+
+        Resets the process-wide tracemalloc peak when tracing.
+        """
+        self._frame_start_allocations = self.allocations
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._frame_start_traced = tracemalloc.get_traced_memory()[0]
+        else:
+            self._frame_start_traced = None
+        self._frame_start_blocks = sys.getallocatedblocks()
+
+    def end_frame(self):
+        """Mark the end of a frame started with begin_frame"""
+        self.last_frame_blocks = sys.getallocatedblocks() - self._frame_start_blocks
+        self.retained_blocks += self.last_frame_blocks
+        if self._frame_start_traced is not None:
+            self.last_frame_peak_bytes = tracemalloc.get_traced_memory()[1] - self._frame_start_traced
+            self.max_frame_peak_bytes = max(self.max_frame_peak_bytes or 0, self.last_frame_peak_bytes)
+        else:
+            self.last_frame_peak_bytes = None
+        self.frames += 1
+        self.last_frame_allocations = self.allocations - self._frame_start_allocations
+
+    @contextmanager
+    def frame(self):
+        """Measure everything done for one frame inside the block"""
+        self.begin_frame()
+        try:
+            yield self
+        finally:
+            self.end_frame()
+
+    def stats(self) -> Dict:
+        """
+        Allocation counters for monitoring
+
+        `frame_peak_bytes_*` are None unless tracemalloc is tracing
+        (e.g. PYTHONTRACEMALLOC=1); it slows every allocation down.
+        """
+        return {
+            "frames": self.frames,
+            "buffer_allocations": self.allocations,
+            "buffer_allocations_last_frame": self.last_frame_allocations,
+            "buffer_allocations_per_frame": self.allocations / self.frames if self.frames else 0.0,
+            "buffer_bytes_allocated": self.bytes_allocated,
+            "buffer_bytes_held": sum(buffer.nbytes for buffer in self._buffers.values()),
+            "heap_blocks_last_frame": self.last_frame_blocks,
+            "heap_blocks_per_frame": self.retained_blocks / self.frames if self.frames else 0.0,
+            "frame_peak_bytes_last_frame": self.last_frame_peak_bytes,
+            "frame_peak_bytes_max": self.max_frame_peak_bytes,
+        }
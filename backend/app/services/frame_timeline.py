@@ -0,0 +1,294 @@
+"""
+Session frame timelines stored as chunked landmark arrays
+"""
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.models.pose_frame import PoseFrameChunk
+from app.models.pose_session import PoseSession
+from app.services.keyframe_compression import compress_timeline, interpolate_keyframes, quantize
+from app.services.landmarks import NUM_LANDMARKS
+
+FRAMES_PER_CHUNK = 256
+
+_TABLE = PoseFrameChunk.__table__
+_SESSIONS = PoseSession.__table__
+
+
+class TimelineConflict(ValueError):
+    """New frames overlap stored frames, or their times are out of order with them"""
+
+
+class FrameRange(NamedTuple):
+    """A contiguous read of a session timeline"""
+    frame_indices: np.ndarray  # (N,) int64
+    timestamps: np.ndarray  # (N,) float64 seconds
+    landmarks: np.ndarray  # (N, 33, 4) float32
+
+
+def frame_timestamps(frame_count: int, fps: float, start_frame: int = 0) -> np.ndarray:
+    """Timestamps (seconds) of evenly spaced frames"""
+    return (np.arange(frame_count, dtype=np.float64) + start_frame) / fps
+
+
+def chunk_rows(
+    session_id: int,
+    landmarks: np.ndarray,
+    timestamps: np.ndarray,
+    start_frame: int = 0,
+    tolerance: float = 0.0,
+    max_gap: int = 30,
+    frames_per_chunk: int = FRAMES_PER_CHUNK,
+    storage_dtype: str = None
+) -> List[Dict]:
+    """
+    Split a (N, 33, 3|4) timeline into pose_frame_chunks rows
+
+    Args:
+        tolerance: Keyframe-compress each chunk within this coordinate error
+            bound (see keyframe_compression); 0 stores every frame
+        max_gap: Keep an anchor frame at least every this many frames
+        storage_dtype: Precision the landmarks column stores (defaults to
+            LANDMARK_STORAGE_DTYPE); max_error includes its quantization
+
+    Raises:
+        ValueError: If shapes do not match
+    """
+    if landmarks.ndim != 3 or landmarks.shape[1] != NUM_LANDMARKS:
+        raise ValueError(f"Frame landmarks must have shape (N, {NUM_LANDMARKS}, 3|4), got {landmarks.shape}")
+    if len(timestamps) != len(landmarks):
+        raise ValueError(f"Got {len(timestamps)} timestamps for {len(landmarks)} frames")
+
+    if landmarks.shape[2] == 3:
+        padded = np.ones(landmarks.shape[:2] + (4,), dtype=np.float32)
+        padded[..., :3] = landmarks
+        landmarks = padded
+
+    storage_dtype = storage_dtype or settings.LANDMARK_STORAGE_DTYPE
+    timestamps = np.ascontiguousarray(timestamps, dtype='<f8')
+    rows = []
+    for offset in range(0, len(landmarks), frames_per_chunk):
+        chunk = slice(offset, offset + frames_per_chunk)
+        points, times = landmarks[chunk], timestamps[chunk]
+        row = {
+            "pose_session_id": session_id,
+            "start_frame": start_frame + offset,
+            "frame_count": len(times),
+            "start_time": float(times[0]),
+            "end_time": float(times[-1]),
+            "keyframe_offsets": None,
+            "max_error": 0.0,
+        }
+        if tolerance > 0:
+            compressed = compress_timeline(points, times, tolerance, max_gap=max_gap, storage_dtype=storage_dtype)
+            points, times = compressed.landmarks, compressed.timestamps
+            row["keyframe_offsets"] = compressed.keyframe_indices.astype('<u2').tobytes()
+            row["max_error"] = compressed.max_error
+        elif len(points):
+            row["max_error"] = float(np.abs(quantize(points[..., :3], storage_dtype) - points[..., :3]).max())
+
+        row["landmarks"] = points
+        row["timestamps"] = np.ascontiguousarray(times).tobytes()
+        rows.append(row)
+    return rows
+
+
+def timeline_stats(rows: List[Dict]) -> Dict:
+    """Frame counts, compression ratio and worst-case error of chunk rows"""
+    frames = sum(row["frame_count"] for row in rows)
+    stored = sum(len(row["landmarks"]) for row in rows)
+    return {
+        "chunks": len(rows),
+        "frames": frames,
+        "stored_frames": stored,
+        "compression_ratio": frames / stored if stored else 1.0,
+        "max_error": max((row["max_error"] for row in rows), default=0.0),
+    }
+
+
+def assemble_frames(
+    rows: Iterable,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None
+) -> FrameRange:
+    """
+    Concatenate chunk rows and trim to the range
+
+    Rows are (start_frame, frame_count, landmarks, timestamps, keyframe_offsets);
+    keyframe-compressed chunks are interpolated back to every frame. Frame
+    bounds are [start, end); time bounds are [start_time, end_time).
+    """
+    indices, times, points = [], [], []
+    for start_frame, frame_count, landmarks, timestamps, keyframe_offsets in rows:
+        timestamps = np.frombuffer(timestamps, dtype='<f8')
+        if keyframe_offsets is not None:
+            timestamps, landmarks = interpolate_keyframes(
+                np.frombuffer(keyframe_offsets, dtype='<u2').astype(np.int64),
+                landmarks,
+                timestamps,
+                frame_count
+            )
+        indices.append(np.arange(start_frame, start_frame + frame_count))
+        times.append(timestamps)
+        points.append(landmarks)
+
+    if not points:
+        return FrameRange(
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.float64),
+            np.empty((0, NUM_LANDMARKS, 4), dtype=np.float32)
+        )
+
+    frame_indices = np.concatenate(indices)
+    timestamps = np.concatenate(times)
+    landmarks = np.concatenate(points)
+
+    keep = np.ones(len(frame_indices), dtype=bool)
+    if start is not None:
+        keep &= frame_indices >= start
+    if end is not None:
+        keep &= frame_indices < end
+    if start_time is not None:
+        keep &= timestamps >= start_time
+    if end_time is not None:
+        keep &= timestamps < end_time
+
+    if keep.all():
+        return FrameRange(frame_indices, timestamps, landmarks)
+    return FrameRange(frame_indices[keep], timestamps[keep], landmarks[keep])
+
+
+def range_conflict(
+    stored: Iterable[Tuple[int, int, float, float]],
+    start_frame: int,
+    frame_count: int,
+    start_time: float,
+    end_time: float
+) -> Optional[str]:
+    """
+    Why a new frame range cannot join a timeline, or None
+
+    Args:
+        stored: (start_frame, frame_count, start_time, end_time) of the stored chunks
+    """
+    end_frame = start_frame + frame_count
+    for chunk_start, chunk_count, chunk_start_time, chunk_end_time in stored:
+        chunk_end = chunk_start + chunk_count
+        if chunk_start < end_frame and chunk_end > start_frame:
+            return (
+                f"Frames {start_frame}-{end_frame - 1} overlap stored frames {chunk_start}-{chunk_end - 1}"
+            )
+        if chunk_end <= start_frame and chunk_end_time > start_time:
+            return f"Timestamps from frame {start_frame} precede stored frames {chunk_start}-{chunk_end - 1}"
+        if chunk_start >= end_frame and chunk_start_time < end_time:
+            return f"Timestamps up to frame {end_frame - 1} follow stored frames {chunk_start}-{chunk_end - 1}"
+    return None
+
+
+async def ingest_frames(
+    db: AsyncSession,
+    session_id: int,
+    landmarks: np.ndarray,
+    timestamps: np.ndarray,
+    start_frame: int = 0,
+    tolerance: float = 0.0,
+    max_gap: int = 30
+) -> Dict:
+    """
+    Bulk insert a timeline as chunk rows in one executemany (no ORM objects)
+
+    Concurrent ingests of a session are serialized on its row, so frames
+    are checked against everything stored before them. The caller commits.
+
+    Returns:
+        Ingest stats (see timeline_stats)
+
+    Raises:
+        TimelineConflict: If the frames overlap stored frames or their times are out of order
+    """
+    rows = chunk_rows(session_id, landmarks, timestamps, start_frame, tolerance, max_gap)
+    if rows:
+        await db.execute(select(_SESSIONS.c.id).where(_SESSIONS.c.id == session_id).with_for_update())
+        stored = await db.execute(
+            select(_TABLE.c.start_frame, _TABLE.c.frame_count, _TABLE.c.start_time, _TABLE.c.end_time)
+            .where(_TABLE.c.pose_session_id == session_id)
+        )
+        conflict = range_conflict(
+            stored.all(), start_frame, len(landmarks), rows[0]["start_time"], rows[-1]["end_time"]
+        )
+        if conflict:
+            raise TimelineConflict(conflict)
+        await db.execute(insert(_TABLE), rows)
+    return timeline_stats(rows)
+
+
+async def has_frames(db: AsyncSession, session_id: int) -> bool:
+    """Whether a session has a stored timeline"""
+    result = await db.execute(
+        select(_TABLE.c.id).where(_TABLE.c.pose_session_id == session_id).limit(1)
+    )
+    return result.first() is not None
+
+
+async def read_frames(
+    db: AsyncSession,
+    session_id: int,
+    start: int = 0,
+    end: Optional[int] = None
+) -> FrameRange:
+    """Read frames [start, end) of a session timeline as arrays"""
+    query = _chunk_query(session_id).where(_TABLE.c.start_frame + _TABLE.c.frame_count > start)
+    if end is not None:
+        query = query.where(_TABLE.c.start_frame < end)
+    result = await db.execute(query)
+    return assemble_frames(result.all(), start=start, end=end)
+
+
+async def read_frames_between(
+    db: AsyncSession,
+    session_id: int,
+    start_time: float,
+    end_time: float
+) -> FrameRange:
+    """Read frames with start_time <= timestamp < end_time"""
+    query = _chunk_query(session_id).where(
+        _TABLE.c.end_time >= start_time,
+        _TABLE.c.start_time < end_time
+    )
+    result = await db.execute(query)
+    return assemble_frames(result.all(), start_time=start_time, end_time=end_time)
+
+
+async def stream_frames(
+    db: AsyncSession,
+    session_id: int,
+    chunks_per_fetch: int = 16
+) -> AsyncIterator[FrameRange]:
+    """
+    Yield a session timeline one chunk at a time through a server-side cursor
+
+    Memory stays bounded by `chunks_per_fetch` chunks however long the
+    timeline is.
+    """
+    result = await db.stream(_chunk_query(session_id).execution_options(yield_per=chunks_per_fetch))
+    async for row in result:
+        yield assemble_frames([row])
+
+
+def _chunk_query(session_id: int):
+    return (
+        select(
+            _TABLE.c.start_frame,
+            _TABLE.c.frame_count,
+            _TABLE.c.landmarks,
+            _TABLE.c.timestamps,
+            _TABLE.c.keyframe_offsets
+        )
+        .where(_TABLE.c.pose_session_id == session_id)
+        .order_by(_TABLE.c.start_frame)
+    )
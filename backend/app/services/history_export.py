@@ -0,0 +1,346 @@
+"""
+Streaming export of a user's history (sessions, analyses, frame timelines)
+"""
+import csv
+import io
+import json
+import zlib
+import numpy as np
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
+
+from app.db.session import AsyncSessionLocal
+from app.models.pose_session import PoseSession
+from app.models.posture_analysis import PostureAnalysis
+from app.services.frame_timeline import FrameRange
+from app.services.landmarks import NUM_LANDMARKS
+from app.services.response_encoding import encode_json
+from app.services.session_archive import rehydrate_session, stream_session_frames
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional format
+    pa = None
+
+EXPORT_FORMATS = ('ndjson', 'csv', 'parquet')
+DATASETS = ('sessions', 'analyses', 'frames')
+MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+FIELDS = {
+    'sessions': ('id', 'session_type', 'confidence_score', 'duration_seconds', 'created_at', 'landmarks_3d', 'landmarks_2d'),
+    'analyses': (
+        'id', 'pose_session_id', 'posture_score', 'severity', 'issues_detected', 'angles',
+        'deviations', 'recommendations', 'recommended_exercises', 'created_at'
+    ),
+    'frames': ('session_id', 'frame', 't', 'landmarks'),
+}
+# Fields holding (33, 4) landmark arrays, flattened in tabular formats
+LANDMARK_FIELDS = ('landmarks_3d', 'landmarks_2d', 'landmarks')
+
+# Yield to the client once this many bytes are ready
+CHUNK_BYTES = 64 * 1024
+
+
+def validate_export(fmt: str, datasets: Sequence[str]):
+    """
+    Check an export request before streaming starts
+
+    Raises:
+        ValueError: On an unknown format or dataset, several datasets in a
+            tabular format, or Parquet without pyarrow installed
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}', expected one of {', '.join(EXPORT_FORMATS)}")
+    unknown = [name for name in datasets if name not in DATASETS]
+    if unknown or not datasets:
+        raise ValueError(f"Datasets must be among {', '.join(DATASETS)}")
+    if fmt != 'ndjson' and len(datasets) != 1:
+        raise ValueError(f"{fmt.upper()} exports hold one dataset; request them separately or use ndjson")
+    if fmt == 'parquet' and pa is None:
+        raise ValueError("Parquet export requires pyarrow")
+
+
+async def session_record(session: PoseSession) -> Dict:
+    await rehydrate_session(session)
+    return {
+        'id': session.id,
+        'session_type': session.session_type,
+        'confidence_score': session.confidence_score,
+        'duration_seconds': session.duration_seconds,
+        'created_at': session.created_at,
+        'landmarks_3d': session.landmarks_3d,
+        'landmarks_2d': session.landmarks_2d,
+    }
+
+
+def analysis_record(analysis: PostureAnalysis) -> Dict:
+    return {field: getattr(analysis, field) for field in FIELDS['analyses']}
+
+
+def frame_records(session_id: int, frames: FrameRange) -> Iterator[Dict]:
+    for index, t, landmarks in zip(frames.frame_indices.tolist(), frames.timestamps.tolist(), frames.landmarks):
+        yield {'session_id': session_id, 'frame': index, 't': t, 'landmarks': landmarks}
+
+
+async def iter_records(
+    db: AsyncSession,
+    user_id: int,
+    datasets: Sequence[str],
+    batch_size: int = 500
+) -> AsyncIterator[Tuple[str, List[Dict]]]:
+    """
+    Yield (dataset, records) batches through server-side cursors
+
+    At most `batch_size` rows (or 16 timeline chunks) are held at a time.
+    """
+    if 'sessions' in datasets:
+        result = await db.stream_scalars(
+            select(PoseSession)
+            .options(undefer_group("landmarks"))
+            .where(PoseSession.user_id == user_id)
+            .order_by(PoseSession.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield 'sessions', [await session_record(session) for session in partition]
+
+    if 'analyses' in datasets:
+        result = await db.stream_scalars(
+            select(PostureAnalysis)
+            .options(undefer_group("detail"))
+            .where(PostureAnalysis.user_id == user_id)
+            .order_by(PostureAnalysis.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield 'analyses', [analysis_record(analysis) for analysis in partition]
+
+    if 'frames' in datasets:
+        # Session ids first, so only one server-side cursor is open at a time
+        result = await db.execute(
+            select(PoseSession.id, PoseSession.archive_path)
+            .where(PoseSession.user_id == user_id)
+            .order_by(PoseSession.id)
+        )
+        for session_id, archive_path in result.all():
+            async for frames in stream_session_frames(db, session_id, archive_path):
+                yield 'frames', list(frame_records(session_id, frames))
+
+
+def _plain(value):
+    """JSON-ready value: arrays to lists, datetimes to ISO strings"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _cell(value):
+    """Scalar cell for tabular formats: nested values as JSON text"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(',', ':'))
+    return _plain(value)
+
+
+def _flat_landmarks(value) -> Optional[List[float]]:
+    if value is None:
+        return None
+    return np.asarray(value, dtype=np.float32).reshape(-1).tolist()
+
+
+class NdjsonWriter:
+    """One JSON object per line, tagged with its dataset as "type" """
+
+    def write(self, dataset: str, records: List[Dict]) -> bytes:
+        return b''.join(
+            encode_json({'type': dataset, **{key: _plain(value) for key, value in record.items()}}) + b'\n'
+            for record in records
+        )
+
+    def close(self) -> bytes:
+        return b''
+
+
+class CsvWriter:
+    """CSV of one dataset; landmark arrays become x0,y0,z0,v0,... columns"""
+
+    def __init__(self, dataset: str):
+        self.dataset = dataset
+        self.header_written = False
+
+    def _columns(self) -> List[str]:
+        columns = []
+        for field in FIELDS[self.dataset]:
+            if field in LANDMARK_FIELDS:
+                prefix = '' if field == 'landmarks' else field[len('landmarks_'):] + '_'
+                columns += [f"{prefix}{axis}{i}" for i in range(NUM_LANDMARKS) for axis in 'xyzv']
+            else:
+                columns.append(field)
+        return columns
+
+    def write(self, dataset: str, records: List[Dict]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not self.header_written:
+            writer.writerow(self._columns())
+            self.header_written = True
+        width = NUM_LANDMARKS * 4
+        for record in records:
+            row = []
+            for field in FIELDS[self.dataset]:
+                if field in LANDMARK_FIELDS:
+                    flat = _flat_landmarks(record[field])
+                    row += flat if flat is not None and len(flat) == width else [''] * width
+                else:
+                    row.append(_cell(record[field]))
+            writer.writerow(row)
+        return buffer.getvalue().encode('utf-8')
+
+    def close(self) -> bytes:
+        return b'' if self.header_written else self.write(self.dataset, [])
+
+
+class _DrainSink:
+    """Write-only file object whose bytes are taken as they are produced"""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def take(self) -> bytes:
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def _parquet_schema(dataset: str):
+    landmarks = pa.list_(pa.float32())
+    json_text = pa.string()
+    types = {
+        'sessions': [
+            ('id', pa.int64()), ('session_type', pa.string()), ('confidence_score', pa.float64()),
+            ('duration_seconds', pa.float64()), ('created_at', pa.timestamp('us')),
+            ('landmarks_3d', landmarks), ('landmarks_2d', landmarks),
+        ],
+        'analyses': [
+            ('id', pa.int64()), ('pose_session_id', pa.int64()), ('posture_score', pa.float64()),
+            ('severity', pa.string()), ('issues_detected', json_text), ('angles', json_text),
+            ('deviations', json_text), ('recommendations', pa.string()),
+            ('recommended_exercises', json_text), ('created_at', pa.timestamp('us')),
+        ],
+        'frames': [
+            ('session_id', pa.int64()), ('frame', pa.int64()), ('t', pa.float64()), ('landmarks', landmarks),
+        ],
+    }
+    return pa.schema(types[dataset])
+
+
+class ParquetWriter:
+    """Parquet of one dataset, one row group per batch; nested JSON values as text"""
+
+    def __init__(self, dataset: str):
+        self.dataset = dataset
+        self.schema = _parquet_schema(dataset)
+        self.sink = _DrainSink()
+        self.writer = pq.ParquetWriter(self.sink, self.schema, compression='zstd')
+
+    def write(self, dataset: str, records: List[Dict]) -> bytes:
+        columns = {}
+        for field in FIELDS[self.dataset]:
+            values = [record[field] for record in records]
+            if field in LANDMARK_FIELDS:
+                columns[field] = [_flat_landmarks(value) for value in values]
+            elif field == 'created_at':
+                columns[field] = values
+            else:
+                columns[field] = [_cell(value) for value in values]
+        self.writer.write_table(pa.table(columns, schema=self.schema))
+        return self.sink.take()
+
+    def close(self) -> bytes:
+        self.writer.close()
+        return self.sink.take()
+
+
+def _writer(fmt: str, datasets: Sequence[str]):
+    if fmt == 'csv':
+        return CsvWriter(datasets[0])
+    if fmt == 'parquet':
+        return ParquetWriter(datasets[0])
+    return NdjsonWriter()
+
+
+async def export_history(
+    user_id: int,
+    fmt: str,
+    datasets: Sequence[str],
+    gzip: bool = False,
+    batch_size: int = 500
+) -> AsyncIterator[bytes]:
+    """
+    Stream a user's history in the requested format, optionally gzip-compressed
+
+    Opens its own database session: the response body is produced after the
+    request's dependencies have been closed. Bytes are yielded in chunks of
+    about CHUNK_BYTES, so the first bytes go out after the first batch and
+    memory stays constant however long the history is. Call
+    validate_export first.
+    """
+    writer = _writer(fmt, datasets)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    pending: List[bytes] = []
+    pending_size = 0
+
+    def emit(data: bytes) -> Optional[bytes]:
+        nonlocal pending_size
+        if compressor is not None:
+            data = compressor.compress(data)
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size < CHUNK_BYTES:
+            return None
+        chunk = b''.join(pending)
+        pending.clear()
+        pending_size = 0
+        return chunk
+
+    async with AsyncSessionLocal() as db:
+        async for dataset, records in iter_records(db, user_id, datasets, batch_size):
+            chunk = emit(writer.write(dataset, records))
+            if chunk:
+                yield chunk
+
+    tail = writer.close()
+    if compressor is not None:
+        tail = compressor.compress(tail) + compressor.flush()
+    pending.append(tail)
+    yield b''.join(pending)
@@ -0,0 +1,134 @@
+"""
+Frame ingest: reduced-resolution image decode and raw pixel buffers
+"""
+import struct
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+from app.services.frame_buffers import FrameBuffers
+
+# OpenCV flags for JPEG DCT-domain downscaling during decode
+REDUCED_DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+# Raw pixel formats: name -> (bytes for a w*h frame, cvtColor code to RGB or None)
+RAW_PIXEL_FORMATS = {
+    'rgb24': (lambda w, h: w * h * 3, None),
+    'bgr24': (lambda w, h: w * h * 3, cv2.COLOR_BGR2RGB),
+    'rgba': (lambda w, h: w * h * 4, cv2.COLOR_RGBA2RGB),
+    'nv12': (lambda w, h: w * h * 3 // 2, cv2.COLOR_YUV2RGB_NV12),
+    'i420': (lambda w, h: w * h * 3 // 2, cv2.COLOR_YUV2RGB_I420),
+    'yuyv': (lambda w, h: w * h * 2, cv2.COLOR_YUV2RGB_YUY2),
+}
+
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def read_image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from a JPEG or PNG header without decoding pixels
+
+    Returns:
+        (width, height), or None for unknown or truncated formats
+    """
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and len(data) >= 24:
+        return struct.unpack('>II', data[16:24])
+
+    if data[:2] != b'\xff\xd8':
+        return None
+
+    offset = 2
+    while offset + 9 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            offset += 1
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+            return width, height
+        segment_length = struct.unpack('>H', data[offset + 2:offset + 4])[0]
+        offset += 2 + segment_length
+    return None
+
+
+def reduction_factor(width: int, height: int, min_side: int) -> int:
+    """Largest decode reduction (1, 2, 4, 8) keeping the short side >= min_side"""
+    short_side = min(width, height)
+    for factor in (8, 4, 2):
+        if short_side // factor >= min_side:
+            return factor
+    return 1
+
+
+def decode_image(data: bytes, min_side: int = 0) -> Optional[np.ndarray]:
+    """
+    Decode an encoded image to BGR, downscaling during decode where possible
+
+    Args:
+        data: Encoded image bytes (JPEG, PNG, ...)
+        min_side: Keep at least this many pixels on the short side; 0 decodes at full size
+
+    Returns:
+        BGR array, or None if the data is not a decodable image
+    """
+    if not data:
+        return None
+
+    flags = cv2.IMREAD_COLOR
+    if min_side > 0:
+        size = read_image_size(data)
+        if size is not None:
+            flags = REDUCED_DECODE_FLAGS[reduction_factor(size[0], size[1], min_side)]
+
+    return cv2.imdecode(np.frombuffer(data, np.uint8), flags)
+
+
+def decode_raw(
+    data: bytes,
+    width: int,
+    height: int,
+    pixel_format: str,
+    buffers: Optional[FrameBuffers] = None
+) -> np.ndarray:
+    """
+    Wrap an already-decoded frame as an RGB array
+
+    RGB frames are used in place; other formats need a single color conversion,
+    written into `buffers` when given.
+
+    Raises:
+        ValueError: On unknown format or a buffer size that does not match width/height
+    """
+    if pixel_format not in RAW_PIXEL_FORMATS:
+        raise ValueError(f"pixel_format must be one of: {', '.join(RAW_PIXEL_FORMATS)}")
+    if width <= 0 or height <= 0:
+        raise ValueError("width and height must be positive")
+
+    frame_size, conversion = RAW_PIXEL_FORMATS[pixel_format]
+    expected = frame_size(width, height)
+    if len(data) != expected:
+        raise ValueError(f"Expected {expected} bytes for {width}x{height} {pixel_format}, got {len(data)}")
+
+    if pixel_format in ('nv12', 'i420', 'yuyv') and (width % 2 or height % 2):
+        raise ValueError(f"{pixel_format} requires even width and height")
+
+    buffer = np.frombuffer(data, np.uint8)
+    if pixel_format in ('nv12', 'i420'):
+        frame = buffer.reshape(height * 3 // 2, width)
+    elif pixel_format == 'yuyv':
+        frame = buffer.reshape(height, width, 2)
+    else:
+        frame = buffer.reshape(height, width, -1)
+
+    if conversion is None:
+        return frame
+    if buffers is not None:
+        return cv2.cvtColor(frame, conversion, dst=buffers.get('raw_rgb', (height, width, 3)))
+    return cv2.cvtColor(frame, conversion)
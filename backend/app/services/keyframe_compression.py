@@ -0,0 +1,170 @@
+"""
+Error-bounded temporal keyframe compression for landmark timelines
+"""
+import numpy as np
+from typing import NamedTuple, Optional, Tuple, Union
+
+from app.services.landmarks import NUM_LANDMARKS
+
+
+class CompressedTimeline(NamedTuple):
+    """Keyframes of a timeline and how well they reproduce it"""
+    keyframe_indices: np.ndarray  # (K,) indices into the dense timeline, first and last included
+    landmarks: np.ndarray  # (K, 33, 4) float32, already quantized to the storage dtype
+    timestamps: np.ndarray  # (K,)
+    frame_count: int  # Dense frame count
+    max_error: float  # Largest coordinate error after storage and interpolation
+
+    @property
+    def ratio(self) -> float:
+        """Dense frames per stored keyframe"""
+        return self.frame_count / max(len(self.keyframe_indices), 1)
+
+
+def _tolerances(tolerance: Union[float, np.ndarray], visibility_tolerance: float) -> np.ndarray:
+    """(33, 4) per-joint, per-channel error bounds"""
+    bounds = np.empty((NUM_LANDMARKS, 4))
+    bounds[:, :3] = np.broadcast_to(np.asarray(tolerance, dtype=np.float64).reshape(-1, 1), (NUM_LANDMARKS, 3))
+    bounds[:, 3] = visibility_tolerance
+    return bounds
+
+
+def quantize(landmarks: np.ndarray, storage_dtype: str = 'float32') -> np.ndarray:
+    """float32 copy of landmarks as they read back after storage in `storage_dtype`"""
+    return np.asarray(landmarks).astype(storage_dtype).astype(np.float32)
+
+
+def _segment_fits(
+    landmarks: np.ndarray,
+    reference: np.ndarray,
+    timestamps: np.ndarray,
+    start: int,
+    end: int,
+    bounds: np.ndarray,
+    time_tolerance: float
+) -> bool:
+    """
+    Whether interpolating between stored frames start and end reproduces every frame in between
+
+    `reference` holds the values as stored; interpolation uses the same
+    arithmetic as interpolate_keyframes, so the check matches what reads see.
+    """
+    if end - start < 2:
+        return True
+    weights = np.arange(1, end - start) / (end - start)
+
+    times = timestamps[start] + weights * (timestamps[end] - timestamps[start])
+    if np.abs(times - timestamps[start + 1:end]).max() > time_tolerance:
+        return False
+
+    weights = weights.astype(reference.dtype)[:, None, None]
+    interpolated = reference[start] + weights * (reference[end] - reference[start])
+    return bool((np.abs(interpolated - landmarks[start + 1:end]) <= bounds).all())
+
+
+def select_keyframes(
+    landmarks: np.ndarray,
+    timestamps: np.ndarray,
+    tolerance: Union[float, np.ndarray] = 0.005,
+    visibility_tolerance: float = 0.1,
+    time_tolerance: float = 0.002,
+    max_gap: int = 30,
+    reference: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Pick the frames to keep so linear interpolation stays within the bounds
+
+    Each segment starts at the last kept frame and is extended while every
+    frame inside it is reproduced within the per-joint bound; the frame
+    where that fails (or an anchor `max_gap` frames on) is kept.
+
+    Args:
+        landmarks: (N, 33, 4) timeline
+        timestamps: (N,) seconds
+        tolerance: Coordinate error bound, scalar or per joint (33,)
+        visibility_tolerance: Visibility error bound
+        time_tolerance: Timestamp error bound (seconds)
+        max_gap: Keep an anchor frame at least every this many frames
+        reference: (N, 33, 4) values as they will be stored (see quantize),
+            interpolated in place of `landmarks`; defaults to `landmarks`
+
+    Returns:
+        Sorted indices of the kept frames (first and last frame always included)
+    """
+    frame_count = len(landmarks)
+    if frame_count <= 2:
+        return np.arange(frame_count)
+    if reference is None:
+        reference = landmarks
+
+    bounds = _tolerances(tolerance, visibility_tolerance)
+    keep = [0]
+    start = 0
+    while start < frame_count - 1:
+        end = start + 1
+        limit = min(start + max_gap, frame_count - 1)
+        while end < limit and _segment_fits(landmarks, reference, timestamps, start, end + 1, bounds, time_tolerance):
+            end += 1
+        keep.append(end)
+        start = end
+    return np.array(keep)
+
+
+def interpolate_keyframes(
+    keyframe_indices: np.ndarray,
+    landmarks: np.ndarray,
+    timestamps: np.ndarray,
+    frame_count: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rebuild a dense (frame_count, 33, 4) timeline from keyframes by linear interpolation
+
+    Returns:
+        (timestamps, landmarks)
+    """
+    if len(keyframe_indices) == 1:
+        return (
+            np.repeat(timestamps.astype(np.float64), frame_count),
+            np.repeat(landmarks, frame_count, axis=0)
+        )
+
+    frames = np.arange(frame_count)
+    right = np.clip(np.searchsorted(keyframe_indices, frames, side='right'), 1, len(keyframe_indices) - 1)
+    left = right - 1
+    weights = (frames - keyframe_indices[left]) / (keyframe_indices[right] - keyframe_indices[left])
+
+    dense_times = timestamps[left] + weights * (timestamps[right] - timestamps[left])
+    weights = weights.astype(landmarks.dtype)[:, None, None]
+    dense = landmarks[left] + weights * (landmarks[right] - landmarks[left])
+    return dense_times, dense
+
+
+def compress_timeline(
+    landmarks: np.ndarray,
+    timestamps: np.ndarray,
+    tolerance: Union[float, np.ndarray] = 0.005,
+    visibility_tolerance: float = 0.1,
+    time_tolerance: float = 0.002,
+    max_gap: int = 30,
+    storage_dtype: str = 'float32'
+) -> CompressedTimeline:
+    """
+    Select keyframes (see select_keyframes) and measure the reconstruction error
+
+    Keyframes are fitted and measured as they will read back from
+    `storage_dtype` storage, so the bound covers quantization too (as long
+    as quantization alone stays within it, e.g. float16 for values below 2).
+    """
+    reference = quantize(landmarks, storage_dtype)
+    indices = select_keyframes(
+        landmarks, timestamps, tolerance, visibility_tolerance, time_tolerance, max_gap, reference
+    )
+    key_landmarks = reference[indices]
+    key_timestamps = timestamps[indices]
+
+    max_error = 0.0
+    if len(landmarks):
+        _, dense = interpolate_keyframes(indices, key_landmarks, key_timestamps, len(landmarks))
+        max_error = float(np.abs(dense[..., :3] - landmarks[..., :3]).max())
+
+    return CompressedTimeline(indices, key_landmarks, key_timestamps, len(landmarks), max_error)
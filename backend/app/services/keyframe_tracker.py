@@ -0,0 +1,149 @@
+"""
+Keyframe-based inference with optical-flow propagation between detections
+"""
+import cv2
+import numpy as np
+from typing import Dict, Optional
+
+from app.services.frame_buffers import FrameBuffers
+from app.services.landmarks import landmarks_to_array
+from app.services.pose_detector import PoseDetector
+
+
+class KeyframeTracker:
+    """
+    Run full pose inference on keyframes only
+
+    Between keyframes, the previous landmarks are propagated with sparse
+    Lucas-Kanade optical flow on the joint positions (x/y only; z, world
+    landmarks and visibility carry over). A new keyframe is triggered every
+    `keyframe_interval` frames, when too few joints track, when joints move
+    faster than flow can follow, or when the last detection was low-confidence.
+    """
+
+    LK_PARAMS = dict(
+        winSize=(21, 21),
+        maxLevel=3,
+        criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03)
+    )
+
+    def __init__(
+        self,
+        keyframe_interval: int = 5,
+        min_tracked_ratio: float = 0.8,
+        min_confidence: float = 0.5,
+        max_flow: float = 0.08,
+        track_width: int = 320,
+        buffers: Optional[FrameBuffers] = None
+    ):
+        """
+        Args:
+            keyframe_interval: Run full inference at least every N frames
+            min_tracked_ratio: Resync if fewer visible joints than this track
+            min_confidence: Resync after a detection below this confidence
+            max_flow: Resync if the median joint moves more than this (normalized units/frame)
+            track_width: Width of the grayscale image used for flow
+            buffers: Per-stream buffers for the flow images
+        """
+        self.keyframe_interval = keyframe_interval
+        self.min_tracked_ratio = min_tracked_ratio
+        self.min_confidence = min_confidence
+        self.max_flow = max_flow
+        self.track_width = track_width
+        self.buffers = buffers if buffers is not None else FrameBuffers()
+
+        self.keyframes = 0
+        self.tracked_frames = 0
+        self._prev_gray: Optional[np.ndarray] = None
+        self._result: Optional[Dict] = None
+        self._points: Optional[np.ndarray] = None
+        self._since_keyframe = 0
+        # Gray frames are double-buffered: previous and current
+        self._slot = 0
+
+    def reset(self):
+        """Force full inference on the next frame"""
+        self._result = None
+        self._points = None
+
+    def _to_gray(self, image: np.ndarray, rgb: bool) -> np.ndarray:
+        height, width = image.shape[:2]
+        if width > self.track_width:
+            size = (self.track_width, round(height * self.track_width / width))
+            image = cv2.resize(
+                image,
+                size,
+                dst=self.buffers.get('track_small', (size[1], size[0]) + image.shape[2:]),
+                interpolation=cv2.INTER_AREA
+            )
+
+        gray = self.buffers.get(f'track_gray_{self._slot}', image.shape[:2])
+        self._slot ^= 1
+        if image.ndim == 2:
+            np.copyto(gray, image)
+        else:
+            cv2.cvtColor(image, cv2.COLOR_RGB2GRAY if rgb else cv2.COLOR_BGR2GRAY, dst=gray)
+        return gray
+
+    def process(self, image: np.ndarray, pose_detector: PoseDetector, rgb: bool = False) -> Optional[Dict]:
+        """
+        Detect on keyframes, propagate by optical flow otherwise
+
+        Tracked landmarks are the tracker's buffer, updated in place by the next frame.
+        """
+        gray = self._to_gray(image, rgb)
+        result = None
+
+        if (
+            self._result is not None
+            and self._since_keyframe < self.keyframe_interval - 1
+            and self._result['confidence'] >= self.min_confidence
+        ):
+            result = self._propagate(gray)
+
+        if result is None:
+            result = pose_detector.detect(image, rgb=rgb, buffers=self.buffers)
+            self.keyframes += 1
+            self._since_keyframe = 0
+            self._result = result
+            self._points = None
+            if result:
+                # The tracker's own copy: detector arrays are overwritten by the next detection
+                source = landmarks_to_array(result['landmarks_3d'])
+                self._points = self.buffers.get('track_points', source.shape, np.float64)
+                np.copyto(self._points, source)
+        else:
+            self.tracked_frames += 1
+            self._since_keyframe += 1
+
+        self._prev_gray = gray
+        return result
+
+    def _propagate(self, gray: np.ndarray) -> Optional[Dict]:
+        """Move the previous landmarks with LK flow; None means resync"""
+        if self._prev_gray is None or self._prev_gray.shape != gray.shape:
+            return None
+
+        height, width = gray.shape
+        scale = np.array([width, height], dtype=np.float32)
+        prev_xy = (self._points[:, :2] * scale).astype(np.float32).reshape(-1, 1, 2)
+
+        next_xy, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, prev_xy, None, **self.LK_PARAMS)
+        if next_xy is None:
+            return None
+
+        tracked = status.ravel() == 1
+        visible = self._points[:, 3] >= 0.5
+        if visible.any() and (tracked & visible).sum() < self.min_tracked_ratio * visible.sum():
+            return None
+
+        flow = (next_xy.reshape(-1, 2) - prev_xy.reshape(-1, 2)) / scale
+        if tracked.any() and np.median(np.linalg.norm(flow[tracked], axis=1)) > self.max_flow:
+            return None
+
+        self._points[tracked, :2] += flow[tracked]
+
+        result = dict(self._result)
+        result['landmarks_3d'] = self._points
+        result['tracked'] = True
+        return result
@@ -0,0 +1,127 @@
+"""
+Temporal landmark filtering (One Euro filter)
+"""
+import math
+import numpy as np
+from typing import Dict, Optional
+
+# Filter parameters per analysis type. Coordinates are normalized, so `beta`
+# is in (cutoff Hz) per (frame-widths / second). Static assessments smooth
+# hard; fast exercises stay responsive.
+FILTER_PRESETS = {
+    'default': {'min_cutoff': 1.0, 'beta': 5.0},
+    'posture': {'min_cutoff': 0.5, 'beta': 2.0},
+    'ergonomics': {'min_cutoff': 0.5, 'beta': 2.0},
+    'plank': {'min_cutoff': 0.5, 'beta': 2.0},
+    'squat': {'min_cutoff': 1.5, 'beta': 10.0},
+    'pushup': {'min_cutoff': 1.5, 'beta': 10.0},
+}
+
+
+def filter_params(analysis_type: Optional[str]) -> Dict[str, float]:
+    """Filter preset for an analysis type"""
+    return FILTER_PRESETS.get((analysis_type or '').lower(), FILTER_PRESETS['default'])
+
+
+def _smoothing_factor(cutoff, dt: float):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    Vectorized One Euro filter over all landmark coordinates at once
+
+    The cutoff frequency rises with joint speed, so slow or static joints are
+    smoothed strongly while fast movements keep low latency. Updates are
+    weighted by landmark visibility: occluded joints mostly hold their
+    previous estimate instead of following noisy guesses.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 5.0, d_cutoff: float = 1.0):
+        """
+        Args:
+            min_cutoff: Cutoff frequency (Hz) at zero speed; lower = smoother
+            beta: Speed coefficient; higher = less lag on fast movement
+            d_cutoff: Cutoff frequency (Hz) for the derivative estimate
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def configure(self, min_cutoff: Optional[float] = None, beta: Optional[float] = None):
+        """Change parameters without losing filter state"""
+        if min_cutoff is not None:
+            self.min_cutoff = min_cutoff
+        if beta is not None:
+            self.beta = beta
+
+    def reset(self):
+        self._x: Optional[np.ndarray] = None
+        self._dx: Optional[np.ndarray] = None
+        self._t: Optional[float] = None
+
+    def _allocate(self, points: np.ndarray):
+        coords_shape = (points.shape[0], 3)
+        self._x = np.empty(coords_shape)
+        self._dx = np.zeros(coords_shape)
+        # Scratch arrays reused every frame so steady-state filtering does not allocate
+        self._delta = np.empty(coords_shape)
+        self._rate = np.empty(coords_shape)
+        self._weight = np.ones((points.shape[0], 1))
+        self._out = np.empty(points.shape)
+
+    def __call__(self, points: np.ndarray, timestamp: float) -> np.ndarray:
+        """
+        Filter one (33, 3|4) frame
+
+        Args:
+            points: Landmarks; column 3 (if present) is visibility and is passed through
+            timestamp: Frame time in seconds
+
+        Returns:
+            Filtered landmarks. The array is reused by the next call; copy it to keep it.
+        """
+        coords = points[:, :3]
+
+        if self._x is None or self._out.shape != points.shape or timestamp <= self._t:
+            self._allocate(points)
+            self._x[:] = coords
+            self._t = timestamp
+            self._out[:] = points
+            return self._out
+
+        dt = timestamp - self._t
+        self._t = timestamp
+
+        if points.shape[1] > 3:
+            np.clip(points[:, 3:4], 0.0, 1.0, out=self._weight)
+
+        delta, rate = self._delta, self._rate
+
+        # Derivative estimate, low-passed at d_cutoff
+        np.subtract(coords, self._x, out=delta)
+        np.multiply(delta, 1.0 / dt, out=rate)
+        rate -= self._dx
+        rate *= self._weight
+        rate *= _smoothing_factor(self.d_cutoff, dt)
+        self._dx += rate
+
+        # Speed-adaptive cutoff -> per-coordinate smoothing factor
+        # a = 1 / (1 + tau / dt), tau = 1 / (2 * pi * cutoff)
+        np.abs(self._dx, out=rate)
+        rate *= self.beta
+        rate += self.min_cutoff
+        rate *= 2 * math.pi * dt
+        np.reciprocal(rate, out=rate)
+        rate += 1.0
+        np.reciprocal(rate, out=rate)
+
+        rate *= self._weight
+        delta *= rate
+        self._x += delta
+
+        self._out[:, :3] = self._x
+        self._out[:, 3:] = points[:, 3:]
+        return self._out
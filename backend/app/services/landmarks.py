@@ -0,0 +1,164 @@
+"""
+Landmark array helpers shared by the analysis and transport layers
+"""
+import base64
+import struct
+import numpy as np
+from typing import Dict, List, Sequence, Union
+
+# MediaPipe Pose always produces 33 landmarks
+NUM_LANDMARKS = 33
+
+# Channels per landmark: x, y, z and (optionally) visibility
+LANDMARK_CHANNELS = ('x', 'y', 'z', 'visibility')
+
+# Sanity bound for normalized/world coordinates; anything beyond is garbage input
+COORDINATE_LIMIT = 10.0
+
+LandmarkInput = Union[List[Dict], np.ndarray]
+
+# Stored landmark blobs: magic, format version, dtype code, ndim, then ndim
+# little-endian uint32 dimensions and the little-endian array data
+BLOB_MAGIC = b'LM'
+BLOB_VERSION = 1
+BLOB_DTYPES = {1: '<f4', 2: '<f2'}
+_BLOB_HEADER = struct.Struct('<2sBBB')
+
+
+def validate_landmark_array(points: np.ndarray) -> None:
+    """
+    Check a (..., 33, 3|4) landmark array in a single vectorized pass
+
+    Raises:
+        ValueError: On non-finite values, out-of-range coordinates or visibility
+    """
+    if not np.isfinite(points).all():
+        raise ValueError("Landmarks contain non-finite values")
+
+    if (np.abs(points[..., :3]) > COORDINATE_LIMIT).any():
+        raise ValueError(f"Landmark coordinates must be within +/-{COORDINATE_LIMIT}")
+
+    if points.shape[-1] == 4:
+        visibility = points[..., 3]
+        if (visibility < 0.0).any() or (visibility > 1.0).any():
+            raise ValueError("Landmark visibility must be within [0, 1]")
+
+
+def unpack_landmarks(data: Union[str, Sequence[float]], shape: Sequence[int]) -> np.ndarray:
+    """
+    Decode a packed landmark payload straight to a float32 array
+
+    Args:
+        data: Flat list of floats, or base64 of a little-endian float32 buffer
+        shape: Declared shape, e.g. [33, 4] or [frames, 33, 4]
+
+    Raises:
+        ValueError: If the payload does not match the shape or fails validation
+    """
+    shape = tuple(int(dim) for dim in shape)
+    if len(shape) < 2 or shape[-2] != NUM_LANDMARKS or shape[-1] not in (3, 4):
+        raise ValueError(f"Shape must end with ({NUM_LANDMARKS}, 3) or ({NUM_LANDMARKS}, 4), got {shape}")
+
+    if isinstance(data, str):
+        try:
+            buffer = base64.b64decode(data, validate=True)
+        except ValueError:
+            raise ValueError("Landmark data is not valid base64")
+        if len(buffer) % 4:
+            raise ValueError("Landmark buffer length is not a multiple of 4 bytes")
+        arr = np.frombuffer(buffer, dtype='<f4')
+    else:
+        arr = np.asarray(data, dtype=np.float32)
+
+    if arr.size != int(np.prod(shape)):
+        raise ValueError(f"Landmark data has {arr.size} values, shape {shape} requires {int(np.prod(shape))}")
+
+    points = arr.reshape(shape)
+    validate_landmark_array(points)
+    return points
+
+
+def landmarks_from_flat(values: Sequence[float]) -> np.ndarray:
+    """
+    Validate a flat landmark array and reshape it to (33, 4)
+
+    Accepts either 33*3 values (x, y, z) or 33*4 values (x, y, z, visibility).
+    Missing visibility is filled with 1.0.
+
+    Raises:
+        ValueError: If the array has the wrong length or fails validation
+    """
+    arr = np.asarray(values, dtype=np.float64).ravel()
+
+    if arr.size == NUM_LANDMARKS * 4:
+        points = arr.reshape(NUM_LANDMARKS, 4)
+    elif arr.size == NUM_LANDMARKS * 3:
+        points = np.ones((NUM_LANDMARKS, 4), dtype=np.float64)
+        points[:, :3] = arr.reshape(NUM_LANDMARKS, 3)
+    else:
+        raise ValueError(
+            f"Expected {NUM_LANDMARKS * 3} or {NUM_LANDMARKS * 4} values, got {arr.size}"
+        )
+
+    validate_landmark_array(points)
+    return points
+
+
+def landmarks_to_array(landmarks: LandmarkInput) -> np.ndarray:
+    """Convert a list of landmark dicts (or an existing array) to an (N, 4) array"""
+    if isinstance(landmarks, np.ndarray):
+        return landmarks
+
+    return np.array(
+        [[lm['x'], lm['y'], lm.get('z') or 0.0, lm.get('visibility') or 0.0] for lm in landmarks],
+        dtype=np.float64
+    )
+
+
+def pack_landmark_blob(landmarks: LandmarkInput, dtype: str = 'float16') -> bytes:
+    """
+    Pack landmarks into the compact binary storage format
+
+    Args:
+        landmarks: Landmark dicts or an (..., N, 3|4) array
+        dtype: 'float16' (default, ~1e-3 relative precision) or 'float32'
+    """
+    points = landmarks_to_array(landmarks)
+    code = 2 if dtype == 'float16' else 1
+    data = np.ascontiguousarray(points, dtype=BLOB_DTYPES[code])
+    header = _BLOB_HEADER.pack(BLOB_MAGIC, BLOB_VERSION, code, data.ndim)
+    return header + struct.pack(f'<{data.ndim}I', *data.shape) + data.tobytes()
+
+
+def unpack_landmark_blob(blob: bytes) -> np.ndarray:
+    """
+    Decode a stored landmark blob to a float32 array
+
+    Raises:
+        ValueError: On an unknown format or a truncated blob
+    """
+    if len(blob) < _BLOB_HEADER.size:
+        raise ValueError("Landmark blob is truncated")
+    magic, version, code, ndim = _BLOB_HEADER.unpack_from(blob)
+    if magic != BLOB_MAGIC or version != BLOB_VERSION or code not in BLOB_DTYPES:
+        raise ValueError("Unknown landmark blob format")
+
+    offset = _BLOB_HEADER.size + 4 * ndim
+    shape = struct.unpack_from(f'<{ndim}I', blob, _BLOB_HEADER.size)
+    data = np.frombuffer(blob, dtype=BLOB_DTYPES[code], offset=offset)
+    if data.size != int(np.prod(shape)):
+        raise ValueError("Landmark blob is truncated")
+    return data.reshape(shape).astype(np.float32)
+
+
+def landmarks_to_dicts(points: np.ndarray) -> List[Dict]:
+    """Convert an (N, 3) or (N, 4) array back to the JSON landmark dict format"""
+    keys = LANDMARK_CHANNELS[:points.shape[1]]
+    return [dict(zip(keys, row)) for row in points.tolist()]
+
+
+def mean_visibility(points: np.ndarray) -> float:
+    """Average visibility of an (N, 4) landmark array"""
+    if points.size == 0 or points.shape[1] < 4:
+        return 0.0
+    return float(points[:, 3].mean())
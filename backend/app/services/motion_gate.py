@@ -0,0 +1,129 @@
+"""
+Motion gate that skips pose inference on near-identical frames
+"""
+import cv2
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+from app.services.frame_buffers import FrameBuffers
+from app.services.landmarks import landmarks_to_array
+
+
+class MotionGate:
+    """
+    Per-stream frame-difference gate
+
+    Each frame is downsampled to a small grayscale thumbnail and compared with
+    the thumbnail of the last frame that went through full inference. Below
+    the threshold, the previous landmarks are reused (optionally extrapolated
+    at constant velocity). Full inference is forced every `max_skip` frames.
+    Thumbnails and landmark arrays live in the stream's buffers.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 3.0,
+        max_skip: int = 10,
+        extrapolate: bool = False,
+        thumbnail_size: Tuple[int, int] = (64, 48),
+        buffers: Optional[FrameBuffers] = None
+    ):
+        """
+        Args:
+            threshold: Mean absolute gray-level difference (0-255) that counts as motion
+            max_skip: Maximum consecutive frames served without inference
+            extrapolate: Extrapolate reused landmarks from the last two detections
+            thumbnail_size: (width, height) of the comparison thumbnail
+            buffers: Per-stream buffers for the thumbnails and landmarks
+        """
+        self.threshold = threshold
+        self.max_skip = max_skip
+        self.extrapolate = extrapolate
+        self.thumbnail_size = thumbnail_size
+        self.buffers = buffers if buffers is not None else FrameBuffers()
+
+        # Thumbnails are double-buffered: one holds the reference, the other the current frame
+        self._slot = 0
+        self._reference: Optional[np.ndarray] = None
+        self._thumbnail: Optional[np.ndarray] = None
+        self._skipped = 0
+        self._last_result: Optional[Dict] = None
+        self._last_points: Optional[np.ndarray] = None
+        self._points_slot = 0
+        self._has_velocity = False
+        self._frames_between = 1
+
+    def motion_score(self, image: np.ndarray, rgb: bool = False) -> float:
+        """Mean absolute difference between this frame and the reference thumbnail"""
+        width, height = self.thumbnail_size
+        small = cv2.resize(
+            image,
+            self.thumbnail_size,
+            dst=self.buffers.get('motion_small', (height, width) + image.shape[2:]),
+            interpolation=cv2.INTER_AREA
+        )
+        thumbnail = self.buffers.get(f'motion_thumbnail_{self._slot}', (height, width))
+        if small.ndim == 3:
+            cv2.cvtColor(small, cv2.COLOR_RGB2GRAY if rgb else cv2.COLOR_BGR2GRAY, dst=thumbnail)
+        else:
+            np.copyto(thumbnail, small)
+        self._thumbnail = thumbnail
+
+        if self._reference is None:
+            return float('inf')
+        difference = cv2.absdiff(self._thumbnail, self._reference, dst=self.buffers.get('motion_diff', (height, width)))
+        return cv2.mean(difference)[0]
+
+    def should_infer(self, image: np.ndarray, rgb: bool = False) -> bool:
+        """Decide whether this frame needs full inference"""
+        score = self.motion_score(image, rgb)
+        return score >= self.threshold or self._skipped >= self.max_skip
+
+    def update(self, result: Optional[Dict]):
+        """Record the result of a full inference on the frame last passed to should_infer"""
+        self._reference = self._thumbnail
+        self._slot ^= 1
+
+        # Copied into the gate's own double buffer: detector arrays are overwritten by the next detection
+        points = None
+        if result:
+            source = landmarks_to_array(result['landmarks_3d'])
+            points = self.buffers.get(f'motion_points_{self._points_slot}', source.shape, np.float64)
+            np.copyto(points, source)
+            self._points_slot ^= 1
+            result = {**result, 'landmarks_3d': points}
+
+        last = self._last_points
+        self._has_velocity = points is not None and last is not None and points.shape == last.shape
+        if self._has_velocity:
+            velocity = self.buffers.get('motion_velocity', points.shape, np.float64)
+            np.subtract(points, last, out=velocity)
+            velocity /= max(self._frames_between, 1)
+
+        self._last_result = result
+        self._last_points = points
+        self._frames_between = 1
+        self._skipped = 0
+
+    def reuse(self) -> Optional[Dict]:
+        """
+        Previous result for a skipped frame, flagged as reused
+
+        Landmark arrays are the gate's buffers; they stay valid until the
+        next update().
+        """
+        self._skipped += 1
+        self._frames_between += 1
+
+        if self._last_result is None:
+            return None
+
+        result = dict(self._last_result)
+        if self.extrapolate and self._has_velocity:
+            points = self.buffers.get('motion_extrapolated', self._last_points.shape, np.float64)
+            np.multiply(self.buffers.get('motion_velocity', points.shape, np.float64), self._skipped, out=points)
+            points += self._last_points
+            points[:, 3] = self._last_points[:, 3]
+            result['landmarks_3d'] = points
+        result['reused'] = True
+        return result
@@ -0,0 +1,104 @@
+"""
+Password hashing off the event loop, on a small bounded thread pool
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from app.core.security import get_password_hash, verify_and_update_password
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when more hashing requests are pending than the hasher accepts"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on dedicated threads so auth bursts do not stall the event loop
+
+    bcrypt releases the GIL while hashing, so threads run in parallel with
+    request handling. At most `workers` hashes run at once; up to
+    `max_pending` requests (running plus queued) are accepted, and further
+    ones fail fast with PasswordHasherBusy instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 32):
+        self.workers = workers
+        self.max_pending = max(max_pending, workers)
+        self.pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+
+    async def hash(self, password: str) -> str:
+        """
+        Raises:
+            PasswordHasherBusy: If the pending limit is reached
+        """
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password, rehashing it when the cost parameters changed
+
+        Returns:
+            (verified, new_hash); store new_hash when it is not None
+
+        Raises:
+            PasswordHasherBusy: If the pending limit is reached
+        """
+        verified, new_hash = await self._run(verify_and_update_password, password, hashed_password)
+        if new_hash is not None:
+            self.rehashed += 1
+        return verified, new_hash
+
+    async def _run(self, function, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy("Too many authentication requests, try again shortly")
+
+        self.pending += 1
+        self.submitted += 1
+        try:
+            result, waited, took = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _timed, function, time.perf_counter(), *args
+            )
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        self.queue_wait_total += waited
+        self.queue_wait_max = max(self.queue_wait_max, waited)
+        self.hash_time_total += took
+        return result
+
+    def stats(self) -> Dict:
+        """Queueing counters for monitoring; times in milliseconds"""
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "queued": max(self.pending - self.workers, 0),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "queue_wait_ms_mean": 1000 * self.queue_wait_total / self.completed if self.completed else 0.0,
+            "queue_wait_ms_max": 1000 * self.queue_wait_max,
+            "hash_ms_mean": 1000 * self.hash_time_total / self.completed if self.completed else 0.0,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _timed(function, submitted_at: float, *args):
+    """Run on a pool thread: (result, seconds queued, seconds hashing)"""
+    started = time.perf_counter()
+    result = function(*args)
+    return result, started - submitted_at, time.perf_counter() - started
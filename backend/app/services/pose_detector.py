@@ -6,6 +6,10 @@ import mediapipe as mp
 import numpy as np
 from typing import Optional, Dict, List, Tuple
 
+from app.services.frame_buffers import FrameBuffers
+from app.services.landmarks import NUM_LANDMARKS, mean_visibility
+from app.services.skeleton_renderer import SkeletonRenderer
+
 
 class PoseDetector:
     """3D pose detection using MediaPipe Pose"""
@@ -29,8 +33,7 @@ class PoseDetector:
             min_tracking_confidence: Minimum confidence for tracking
         """
         self.mp_pose = mp.solutions.pose
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_drawing_styles = mp.solutions.drawing_styles
+        self.renderer = SkeletonRenderer()
         
         self.pose = self.mp_pose.Pose(
             static_image_mode=static_image_mode,
@@ -40,18 +43,32 @@ class PoseDetector:
             min_tracking_confidence=min_tracking_confidence
         )
     
-    def detect(self, image: np.ndarray) -> Optional[Dict]:
+    def detect(
+        self,
+        image: np.ndarray,
+        rgb: bool = False,
+        buffers: Optional[FrameBuffers] = None
+    ) -> Optional[Dict]:
         """
         Detect pose in an image
         
         Args:
-            image: Input image (BGR format)
+            image: Input image (BGR format, or RGB if `rgb` is set)
+            rgb: Image is already RGB; skips the color conversion
+            buffers: Per-stream buffers to convert into instead of allocating
             
         Returns:
-            Dictionary containing landmarks and metadata, or None if no pose detected
+            Dictionary containing landmarks and metadata, or None if no pose detected.
+            With `buffers`, landmarks are (33, 4) arrays held in the buffers and
+            overwritten by the next detection; otherwise lists of landmark dicts.
         """
         # Convert BGR to RGB
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        if rgb:
+            image_rgb = image
+        elif buffers is not None:
+            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=buffers.get('rgb', image.shape))
+        else:
+            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         
         # Process the image
         results = self.pose.process(image_rgb)
@@ -59,6 +76,22 @@ class PoseDetector:
         if not results.pose_landmarks:
             return None
         
+        if buffers is not None:
+            landmarks_3d = self._fill(
+                buffers.get('landmarks_3d', (NUM_LANDMARKS, 4), np.float64), results.pose_landmarks
+            )
+            landmarks_world = []
+            if results.pose_world_landmarks:
+                landmarks_world = self._fill(
+                    buffers.get('landmarks_world', (NUM_LANDMARKS, 4), np.float64), results.pose_world_landmarks
+                )
+            return {
+                'landmarks_3d': landmarks_3d,
+                'landmarks_world': landmarks_world,
+                'raw_landmarks': results.pose_landmarks,
+                'confidence': mean_visibility(landmarks_3d)
+            }
+
         # Extract 3D landmarks
         landmarks_3d = []
         for landmark in results.pose_landmarks.landmark:
@@ -86,6 +119,16 @@ class PoseDetector:
             'raw_landmarks': results.pose_landmarks,
             'confidence': self._calculate_confidence(landmarks_3d)
         }
+
+    @staticmethod
+    def _fill(out: np.ndarray, landmark_list) -> np.ndarray:
+        """Copy MediaPipe landmarks into an (N, 4) array"""
+        for row, landmark in zip(out, landmark_list.landmark):
+            row[0] = landmark.x
+            row[1] = landmark.y
+            row[2] = landmark.z
+            row[3] = landmark.visibility
+        return out
     
     def _calculate_confidence(self, landmarks: List[Dict]) -> float:
         """Calculate average confidence from landmark visibility scores"""
@@ -99,36 +142,28 @@ class PoseDetector:
         self,
         image: np.ndarray,
         landmarks,
-        draw_connections: bool = True
+        draw_connections: bool = True,
+        out: Optional[np.ndarray] = None
     ) -> np.ndarray:
         """
         Draw pose landmarks on image
         
         Args:
             image: Input image
-            landmarks: Pose landmarks from detection
+            landmarks: Pose landmarks from detection (MediaPipe landmark list,
+                landmark dicts or a (33, 4) array)
             draw_connections: Whether to draw skeleton connections
+            out: Preallocated array (same shape as image) to draw into
             
         Returns:
             Image with drawn landmarks
         """
-        annotated_image = image.copy()
-        
-        if draw_connections:
-            self.mp_drawing.draw_landmarks(
-                annotated_image,
-                landmarks,
-                self.mp_pose.POSE_CONNECTIONS,
-                landmark_drawing_spec=self.mp_drawing_styles.get_default_pose_landmarks_style()
+        if hasattr(landmarks, 'landmark'):
+            landmarks = np.array(
+                [[lm.x, lm.y, lm.z, lm.visibility] for lm in landmarks.landmark],
+                dtype=np.float64
             )
-        else:
-            self.mp_drawing.draw_landmarks(
-                annotated_image,
-                landmarks,
-                None
-            )
-        
-        return annotated_image
+        return self.renderer.render(landmarks, image, draw_connections=draw_connections, out=out)
     
     def close(self):
         """Release resources"""
@@ -0,0 +1,198 @@
+"""
+Per-connection state for live pose streams
+"""
+import math
+import time
+import numpy as np
+from typing import Dict, Optional
+
+from app.services.frame_buffers import FrameBuffers
+from app.services.keyframe_tracker import KeyframeTracker
+from app.services.landmark_filter import OneEuroFilter, filter_params
+from app.services.landmarks import landmarks_to_array, landmarks_to_dicts
+from app.services.motion_gate import MotionGate
+from app.services.pose_detector import PoseDetector
+from app.services.response_encoding import LANDMARK_FIELDS
+from app.services.stream_codec import DeltaLandmarkEncoder
+
+
+class PoseStream:
+    """State kept for one live WebSocket stream"""
+
+    def __init__(self):
+        # Decode/convert buffers reused across this stream's frames
+        self.buffers = FrameBuffers()
+        # Landmark field -> encoder, empty when the client wants plain landmarks
+        self.encoders: Dict[str, DeltaLandmarkEncoder] = {}
+        self.motion_gate: Optional[MotionGate] = None
+        self.tracker: Optional[KeyframeTracker] = None
+        # Landmark field -> temporal filter; on by default since the stream
+        # detector runs without MediaPipe's own smoothing
+        self.filters: Dict[str, OneEuroFilter] = self._create_filters()
+        self.filter_overrides: Dict[str, float] = {}
+        # Parameters (pixel_format, width, height, analysis_type) for binary frame messages
+        self.binary_frame_params: Dict = {}
+
+    @staticmethod
+    def _create_filters() -> Dict[str, OneEuroFilter]:
+        return {field: OneEuroFilter() for field in LANDMARK_FIELDS}
+
+    def configure(self, config: Dict):
+        """
+        Apply a client "config" message
+
+        Keys:
+            codec: "delta" to enable delta-quantized landmarks, None to disable
+            precision: Maximum reconstruction error per coordinate (delta codec)
+            keyframe_interval: Frames between forced keyframes (delta codec)
+            motion_gate: Skip inference on frames without motion
+            motion_threshold: Mean gray-level difference that counts as motion
+            max_skip: Force full inference after this many skipped frames
+            extrapolate: Extrapolate skipped-frame landmarks at constant velocity
+            tracking: Run inference on keyframes only, optical flow in between
+            inference_interval: Frames per full inference when tracking
+            filter: "one_euro" (default) or None to disable temporal filtering
+            min_cutoff, beta: Override the per-analysis-type filter preset
+                (min_cutoff > 0, beta >= 0)
+            binary_frames: Frame parameters applied to binary messages, e.g.
+                {"pixel_format": "rgb24", "width": 640, "height": 480, "analysis_type": "squat"};
+                without pixel_format, binary messages are encoded images
+
+        Raises:
+            ValueError: On unknown codec or invalid parameters
+        """
+        if "codec" in config:
+            codec = config["codec"]
+            if codec == "delta":
+                precision = float(config.get("precision", 0.001))
+                keyframe_interval = int(config.get("keyframe_interval", 30))
+                self.encoders = {
+                    field: DeltaLandmarkEncoder(precision, keyframe_interval)
+                    for field in LANDMARK_FIELDS
+                }
+            elif codec is None:
+                self.encoders = {}
+            else:
+                raise ValueError(f"Unknown codec: {codec}")
+
+        if "motion_gate" in config:
+            if config["motion_gate"]:
+                self.motion_gate = MotionGate(
+                    threshold=float(config.get("motion_threshold", 3.0)),
+                    max_skip=int(config.get("max_skip", 10)),
+                    extrapolate=bool(config.get("extrapolate", False)),
+                    buffers=self.buffers
+                )
+            else:
+                self.motion_gate = None
+
+        if "tracking" in config:
+            if config["tracking"]:
+                self.tracker = KeyframeTracker(
+                    keyframe_interval=int(config.get("inference_interval", 5)),
+                    buffers=self.buffers
+                )
+            else:
+                self.tracker = None
+
+        if "filter" in config:
+            if config["filter"] == "one_euro":
+                if not self.filters:
+                    self.filters = self._create_filters()
+            elif config["filter"] is None:
+                self.filters = {}
+            else:
+                raise ValueError(f"Unknown filter: {config['filter']}")
+
+        overrides = {key: float(config[key]) for key in ("min_cutoff", "beta") if key in config}
+        min_cutoff = overrides.get("min_cutoff", 1.0)
+        if not math.isfinite(min_cutoff) or min_cutoff <= 0:
+            raise ValueError("min_cutoff must be a positive number")
+        beta = overrides.get("beta", 0.0)
+        if not math.isfinite(beta) or beta < 0:
+            raise ValueError("beta must be a non-negative number")
+        self.filter_overrides.update(overrides)
+
+        if "binary_frames" in config:
+            self.binary_frame_params = dict(config["binary_frames"] or {})
+
+    def detect(
+        self,
+        image: np.ndarray,
+        pose_detector: PoseDetector,
+        analysis_type: Optional[str] = None,
+        timestamp: Optional[float] = None,
+        rgb: bool = False
+    ) -> Optional[Dict]:
+        """
+        Produce landmarks for one frame
+
+        Static frames may be skipped by the motion gate; with tracking on,
+        full inference runs on keyframes and optical flow fills the rest.
+
+        Args:
+            image: BGR frame (RGB if `rgb` is set)
+            pose_detector: Detector used for full inference
+            analysis_type: Selects the temporal filter preset
+            timestamp: Frame capture time in seconds (defaults to arrival time)
+            rgb: Frame is already RGB (raw pixel ingest)
+
+        Returns:
+            Result with (33, 4) landmark arrays held in per-stream buffers,
+            valid until the next frame; see encode_landmarks for the wire format
+        """
+        if self.motion_gate is not None and not self.motion_gate.should_infer(image, rgb):
+            result = self.motion_gate.reuse()
+        else:
+            if self.tracker is not None:
+                result = self.tracker.process(image, pose_detector, rgb)
+            else:
+                result = pose_detector.detect(image, rgb=rgb, buffers=self.buffers)
+            if self.motion_gate is not None:
+                self.motion_gate.update(result)
+
+        if result is None or not self.filters:
+            return result
+
+        return self._filter(result, analysis_type, timestamp if timestamp is not None else time.monotonic())
+
+    def _filter(self, result: Dict, analysis_type: Optional[str], timestamp: float) -> Dict:
+        params = {**filter_params(analysis_type), **self.filter_overrides}
+        result = dict(result)
+        for field, landmark_filter in self.filters.items():
+            landmarks = result.get(field)
+            if landmarks is not None and len(landmarks):
+                landmark_filter.configure(**params)
+                result[field] = landmark_filter(landmarks_to_array(landmarks), timestamp)
+        return result
+
+    def stats(self) -> Dict:
+        """Per-stream counters: frames, per-frame allocations, tracker keyframes"""
+        stats = self.buffers.stats()
+        if self.tracker is not None:
+            stats["keyframes"] = self.tracker.keyframes
+            stats["tracked_frames"] = self.tracker.tracked_frames
+        return stats
+
+    def request_keyframe(self):
+        """Client lost sync; send full landmarks on the next frame"""
+        for encoder in self.encoders.values():
+            encoder.force_keyframe()
+
+    def encode_landmarks(self, response: Dict) -> Dict:
+        """
+        Replace landmark fields with their wire form
+
+        Encoded when a codec is active, landmark dicts otherwise. Landmarks
+        stay arrays until here, so this is their only conversion per frame.
+        """
+        for field in LANDMARK_FIELDS:
+            landmarks = response.get(field)
+            if landmarks is None or not len(landmarks):
+                continue
+            encoder = self.encoders.get(field)
+            if encoder is not None:
+                response[field] = encoder.encode(landmarks_to_array(landmarks))
+            elif isinstance(landmarks, np.ndarray):
+                response[field] = landmarks_to_dicts(landmarks)
+        return response
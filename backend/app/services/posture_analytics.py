@@ -0,0 +1,173 @@
+"""
+Time-bucketed posture analytics computed in Postgres
+"""
+import numpy as np
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence
+
+from sqlalchemy import JSON, case, cast, func, literal, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.posture_analysis import PostureAnalysis
+from app.services.downsampling import lttb_indices
+from app.services.posture_analyzer import ANGLE_METRICS
+
+BUCKETS = ('hour', 'day', 'week')
+SCORE_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _bucket_start(bucket: str):
+    """
+    date_trunc of created_at; the unit is inlined (not bound) so GROUP BY matches the select
+
+    Raises:
+        ValueError: If the bucket size is not supported
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unsupported bucket '{bucket}', expected one of {', '.join(BUCKETS)}")
+    return func.date_trunc(literal_column(f"'{bucket}'"), PostureAnalysis.created_at).label("bucket")
+
+
+def bucket_query(user_id: int, start: datetime, end: datetime, bucket: str):
+    """
+    One row per non-empty bucket: analysis total, score mean and percentiles, mean angles
+
+    Raises:
+        ValueError: If the bucket size is not supported
+    """
+    bucket_start = _bucket_start(bucket)
+    score = PostureAnalysis.posture_score
+    columns = [
+        bucket_start,
+        func.count().label("total"),
+        func.avg(score).label("score_mean"),
+    ]
+    columns += [
+        func.percentile_cont(p / 100).within_group(score).label(f"score_p{p}")
+        for p in SCORE_PERCENTILES
+    ]
+    columns += [
+        func.avg(PostureAnalysis.angles[name].as_float()).label(name)
+        for name in ANGLE_METRICS
+    ]
+    return (
+        select(*columns)
+        .where(
+            PostureAnalysis.user_id == user_id,
+            PostureAnalysis.created_at >= start,
+            PostureAnalysis.created_at < end
+        )
+        .group_by(bucket_start)
+        .order_by(bucket_start)
+    )
+
+
+def issue_query(user_id: int, start: datetime, end: datetime, bucket: str):
+    """
+    (bucket, name, total) issue count rows, unnesting issues_detected in the database
+
+    Raises:
+        ValueError: If the bucket size is not supported
+    """
+    bucket_start = _bucket_start(bucket)
+    # Non-array values (legacy rows) unnest as an empty array instead of erroring
+    issues = case(
+        (func.json_typeof(PostureAnalysis.issues_detected) == "array", PostureAnalysis.issues_detected),
+        else_=cast(literal("[]"), JSON)
+    )
+    issue = func.json_array_elements(issues, type_=JSON).column_valued("issue")
+    name = issue["name"].as_string().label("name")
+    return (
+        select(bucket_start, name, func.count().label("total"))
+        .select_from(PostureAnalysis)
+        .where(
+            PostureAnalysis.user_id == user_id,
+            PostureAnalysis.created_at >= start,
+            PostureAnalysis.created_at < end
+        )
+        .group_by(bucket_start, name)
+    )
+
+
+def naive_utc(value: datetime) -> datetime:
+    """created_at is stored as naive UTC; convert aware datetimes to match"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _rounded(values: np.ndarray, digits: int = 2) -> List:
+    """List with NaN as None (JSON null)"""
+    return [None if np.isnan(value) else value for value in np.round(values, digits).tolist()]
+
+
+def columnar_analytics(
+    bucket_rows: Sequence,
+    issue_rows: Sequence,
+    max_points: int
+) -> Dict:
+    """
+    Assemble query rows into columnar arrays, LTTB-downsampled to max_points
+
+    Downsampling follows the mean score series; the same buckets are kept
+    for every column so they stay aligned.
+    """
+    times = [row.bucket for row in bucket_rows]
+    counts = np.array([row.total for row in bucket_rows], dtype=np.int64)
+    mean_scores = np.array([row.score_mean for row in bucket_rows], dtype=np.float64)
+
+    keep = np.arange(len(times))
+    if len(times) > max_points:
+        epoch = np.array([t.timestamp() for t in times])
+        keep = lttb_indices(epoch, mean_scores, max_points)
+
+    def column(name: str) -> np.ndarray:
+        return np.array([getattr(row, name) for row in bucket_rows], dtype=np.float64)[keep]
+
+    positions = {t: i for i, t in enumerate(times)}
+    kept = set(keep.tolist())
+    issues: Dict[str, np.ndarray] = {}
+    for row in issue_rows:
+        index = positions.get(row.bucket)
+        if index is None or index not in kept or not row.name:
+            continue
+        issues.setdefault(row.name, np.zeros(len(times), dtype=np.int64))[index] += row.total
+
+    return {
+        "t": [times[i] for i in keep],
+        "count": counts[keep].tolist(),
+        "score_mean": _rounded(mean_scores[keep]),
+        "score_percentiles": {f"p{p}": _rounded(column(f"score_p{p}")) for p in SCORE_PERCENTILES},
+        "angles": {name: _rounded(column(name)) for name in ANGLE_METRICS},
+        "issues": {name: counts_by_bucket[keep].tolist() for name, counts_by_bucket in sorted(issues.items())},
+        "total_buckets": len(times),
+        "downsampled": len(keep) < len(times),
+    }
+
+
+async def posture_analytics(
+    db: AsyncSession,
+    user_id: int,
+    start: datetime,
+    end: datetime,
+    bucket: str = 'day',
+    max_points: int = 500
+) -> Dict:
+    """
+    Bucketed score, angle and issue series of a user's analyses in [start, end)
+
+    Aggregation runs in Postgres, so only one row per bucket is transferred;
+    the response holds at most max_points buckets however long the range is.
+
+    Raises:
+        ValueError: If the bucket size is not supported
+    """
+    start, end = naive_utc(start), naive_utc(end)
+    bucket_rows = (await db.execute(bucket_query(user_id, start, end, bucket))).all()
+    issue_rows = (await db.execute(issue_query(user_id, start, end, bucket))).all() if bucket_rows else []
+    return {
+        "bucket": bucket,
+        "start": start,
+        "end": end,
+        **columnar_analytics(bucket_rows, issue_rows, max_points),
+    }
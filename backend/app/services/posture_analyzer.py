@@ -5,6 +5,18 @@ import numpy as np
 from typing import Dict, List, Tuple
 import math
 
+# Keys of the `angles` dict produced by PostureAnalyzer.analyze
+ANGLE_METRICS = (
+    'neck_forward',
+    'left_shoulder', 'right_shoulder',
+    'left_hip', 'right_hip',
+    'left_knee', 'right_knee',
+    'rom_shoulder_flexion_left', 'rom_shoulder_flexion_right',
+    'rom_knee_flexion_left', 'rom_knee_flexion_right',
+    'rom_hip_flexion_left', 'rom_hip_flexion_right',
+    'cobb_angle_proxy',
+)
+
 
 class PostureAnalyzer:
     """Analyze posture from 3D pose landmarks"""
@@ -146,7 +158,10 @@ class PostureAnalyzer:
         Analyze posture from 3D landmarks
         """
         # Convert to numpy array for easier computation
-        points = np.array([[lm['x'], lm['y'], lm['z']] for lm in landmarks_3d])
+        if isinstance(landmarks_3d, np.ndarray):
+            points = landmarks_3d[:, :3]
+        else:
+            points = np.array([[lm['x'], lm['y'], lm['z']] for lm in landmarks_3d])
         
         # Calculate various posture metrics
         angles = self._calculate_angles(points)
@@ -0,0 +1,293 @@
+"""
+Incrementally maintained per-user progress aggregates
+"""
+import math
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.posture_analysis import PostureAnalysis
+from app.models.user_progress import UserProgress
+
+# UserProgress columns holding aggregate state
+STATE_FIELDS = (
+    "analysis_count", "score_mean", "score_m2", "score_min", "score_max",
+    "last_score", "last_analysis_at", "issue_counts", "severity_counts",
+    "angle_stats", "daily", "recent",
+)
+
+
+def empty_progress() -> Dict:
+    """Aggregate state of a user without analyses"""
+    return {
+        "analysis_count": 0,
+        "score_mean": 0.0,
+        "score_m2": 0.0,
+        "score_min": None,
+        "score_max": None,
+        "last_score": None,
+        "last_analysis_at": None,
+        "issue_counts": {},
+        "severity_counts": {},
+        "angle_stats": {},
+        "daily": {},
+        "recent": [],
+    }
+
+
+def _welford(count: int, mean: float, m2: float, value: float):
+    """Add a value to a running (mean, m2) over `count` previous values"""
+    delta = value - mean
+    mean += delta / (count + 1)
+    return mean, m2 + delta * (value - mean)
+
+
+def _numeric_angles(angles: Optional[Dict]) -> Dict[str, float]:
+    return {
+        name: float(value) for name, value in (angles or {}).items()
+        if isinstance(value, (int, float)) and math.isfinite(value)
+    }
+
+
+def merge_analysis(
+    progress: Dict,
+    analysis_id: int,
+    pose_session_id: int,
+    score: float,
+    severity: Optional[str],
+    issues: Optional[List[Dict]],
+    angles: Optional[Dict],
+    created_at: datetime,
+    daily_days: int = 90,
+    recent_count: int = 5
+) -> Dict:
+    """
+    Fold one analysis into an aggregate state
+
+    Returns a new state; JSON values are copied rather than mutated so the
+    ORM sees them as changed.
+
+    Args:
+        progress: Current state (see empty_progress)
+        daily_days: Keep daily buckets this many days back from the newest
+        recent_count: Number of recent analysis summaries to keep
+    """
+    count = progress["analysis_count"]
+    score = float(score)
+    issues = issues if isinstance(issues, list) else []
+    angles = _numeric_angles(angles)
+
+    state = dict(progress)
+    state["analysis_count"] = count + 1
+    state["score_mean"], state["score_m2"] = _welford(count, progress["score_mean"], progress["score_m2"], score)
+    state["score_min"] = score if progress["score_min"] is None else min(progress["score_min"], score)
+    state["score_max"] = score if progress["score_max"] is None else max(progress["score_max"], score)
+
+    is_latest = progress["last_analysis_at"] is None or created_at >= progress["last_analysis_at"]
+    if is_latest:
+        state["last_score"] = score
+        state["last_analysis_at"] = created_at
+
+    issue_counts = dict(progress["issue_counts"])
+    for issue in issues:
+        name = issue.get("name") if isinstance(issue, dict) else None
+        if name:
+            issue_counts[name] = issue_counts.get(name, 0) + 1
+    state["issue_counts"] = issue_counts
+
+    severity_counts = dict(progress["severity_counts"])
+    if severity:
+        severity_counts[severity] = severity_counts.get(severity, 0) + 1
+    state["severity_counts"] = severity_counts
+
+    angle_stats = dict(progress["angle_stats"])
+    for name, value in angles.items():
+        n, mean, m2, low, high = angle_stats.get(name, (0, 0.0, 0.0, value, value))
+        mean, m2 = _welford(n, mean, m2, value)
+        angle_stats[name] = [n + 1, mean, m2, min(low, value), max(high, value)]
+    state["angle_stats"] = angle_stats
+
+    daily = dict(progress["daily"])
+    day = created_at.date().isoformat()
+    bucket = daily.get(day, {"count": 0, "score_sum": 0.0, "angle_sums": {}})
+    angle_sums = dict(bucket["angle_sums"])
+    for name, value in angles.items():
+        angle_sums[name] = angle_sums.get(name, 0.0) + value
+    daily[day] = {"count": bucket["count"] + 1, "score_sum": bucket["score_sum"] + score, "angle_sums": angle_sums}
+    cutoff = (max(date.fromisoformat(key) for key in daily) - timedelta(days=daily_days - 1)).isoformat()
+    state["daily"] = {key: value for key, value in daily.items() if key >= cutoff}
+
+    entry = {
+        "id": analysis_id,
+        "pose_session_id": pose_session_id,
+        "posture_score": score,
+        "severity": severity,
+        "issue_count": len(issues),
+        "primary_issue": issues[0].get("name") if issues and isinstance(issues[0], dict) else None,
+        "created_at": created_at.isoformat(),
+    }
+    recent = sorted(progress["recent"] + [entry], key=lambda item: (item["created_at"], item["id"]), reverse=True)
+    state["recent"] = recent[:recent_count]
+    return state
+
+
+def build_progress(analyses: Iterable, daily_days: int = 90, recent_count: int = 5) -> Dict:
+    """
+    Aggregate state from scratch
+
+    Args:
+        analyses: (id, pose_session_id, posture_score, severity, issues_detected,
+            angles, created_at) rows in any order
+    """
+    state = empty_progress()
+    for analysis_id, session_id, score, severity, issues, angles, created_at in analyses:
+        if score is not None:
+            state = merge_analysis(
+                state, analysis_id, session_id, score, severity, issues, angles, created_at, daily_days, recent_count
+            )
+    return state
+
+
+def summarize_progress(progress: Dict) -> Dict:
+    """Derived summary (means, standard deviations, daily series) of a state"""
+    count = progress["analysis_count"]
+    angle_trends = {
+        name: {
+            "count": n,
+            "mean": mean,
+            "stddev": math.sqrt(m2 / (n - 1)) if n > 1 else 0.0,
+            "min": low,
+            "max": high,
+        }
+        for name, (n, mean, m2, low, high) in progress["angle_stats"].items()
+    }
+    daily = [
+        {
+            "date": day,
+            "count": bucket["count"],
+            "average_score": bucket["score_sum"] / bucket["count"],
+            "angles": {name: total / bucket["count"] for name, total in bucket["angle_sums"].items()},
+        }
+        for day, bucket in sorted(progress["daily"].items())
+    ]
+    return {
+        "analysis_count": count,
+        "average_score": progress["score_mean"] if count else None,
+        "score_stddev": math.sqrt(progress["score_m2"] / (count - 1)) if count > 1 else 0.0,
+        "min_score": progress["score_min"],
+        "max_score": progress["score_max"],
+        "last_score": progress["last_score"],
+        "last_analysis_at": progress["last_analysis_at"],
+        "issue_frequencies": dict(sorted(progress["issue_counts"].items(), key=lambda item: -item[1])),
+        "severity_counts": progress["severity_counts"],
+        "angle_trends": angle_trends,
+        "daily": daily,
+        "recent": progress["recent"],
+    }
+
+
+def _state_of(row: UserProgress) -> Dict:
+    return {field: getattr(row, field) for field in STATE_FIELDS}
+
+
+def _apply(row: UserProgress, state: Dict):
+    for field in STATE_FIELDS:
+        setattr(row, field, state[field])
+
+
+async def _lock_progress(db: AsyncSession, user_id: int):
+    """
+    Lock (creating if missing) a user's aggregate row
+
+    Returns:
+        (row, created) where created means the row is new and must be backfilled
+    """
+    inserted = await db.execute(
+        pg_insert(UserProgress)
+        .values(user_id=user_id)
+        .on_conflict_do_nothing(index_elements=[UserProgress.user_id])
+        .returning(UserProgress.user_id)
+    )
+    created = inserted.first() is not None
+    result = await db.execute(
+        select(UserProgress)
+        .where(UserProgress.user_id == user_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one(), created
+
+
+async def _scan_analyses(db: AsyncSession, user_id: int, daily_days: int, recent_count: int) -> Dict:
+    result = await db.execute(
+        select(
+            PostureAnalysis.id,
+            PostureAnalysis.pose_session_id,
+            PostureAnalysis.posture_score,
+            PostureAnalysis.severity,
+            PostureAnalysis.issues_detected,
+            PostureAnalysis.angles,
+            PostureAnalysis.created_at
+        )
+        .where(PostureAnalysis.user_id == user_id)
+        .order_by(PostureAnalysis.created_at, PostureAnalysis.id)
+    )
+    return build_progress(result.all(), daily_days, recent_count)
+
+
+async def record_analysis(
+    db: AsyncSession,
+    analysis: PostureAnalysis,
+    daily_days: int = 90,
+    recent_count: int = 5
+) -> UserProgress:
+    """
+    Fold a new, flushed analysis into its user's aggregates
+
+    Call in the transaction that inserts the analysis, after a flush; the
+    aggregate row is locked so concurrent inserts serialize. A user without
+    an aggregate row is backfilled from all their analyses (the new one
+    included). The caller commits.
+    """
+    row, created = await _lock_progress(db, analysis.user_id)
+    if created:
+        state = await _scan_analyses(db, analysis.user_id, daily_days, recent_count)
+    else:
+        state = merge_analysis(
+            _state_of(row),
+            analysis.id,
+            analysis.pose_session_id,
+            analysis.posture_score,
+            analysis.severity,
+            analysis.issues_detected,
+            analysis.angles,
+            analysis.created_at,
+            daily_days,
+            recent_count
+        )
+    _apply(row, state)
+    return row
+
+
+async def get_progress(
+    db: AsyncSession,
+    user_id: int,
+    daily_days: int = 90,
+    recent_count: int = 5
+) -> Dict:
+    """
+    A user's aggregate state: one primary-key read
+
+    Users whose row does not exist yet (analyses from before aggregates were
+    kept) are backfilled once and committed.
+    """
+    row = await db.get(UserProgress, user_id)
+    if row is None:
+        row, created = await _lock_progress(db, user_id)
+        if created:
+            _apply(row, await _scan_analyses(db, user_id, daily_days, recent_count))
+        await db.commit()
+    return _state_of(row)
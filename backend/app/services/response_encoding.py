@@ -0,0 +1,187 @@
+"""
+Negotiated response encoding for landmark payloads
+"""
+import json
+import struct
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+from fastapi import Response
+
+from app.services.landmarks import landmarks_to_array
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional format
+    msgpack = None
+
+
+MEDIA_JSON = "application/json"
+MEDIA_MSGPACK = "application/x-msgpack"
+MEDIA_PACKED = "application/x-pose-packed"
+
+# Fields holding (33, 4) landmark arrays
+LANDMARK_FIELDS = ('landmarks_3d', 'landmarks_world')
+
+PACKED_MAGIC = b'POSE'
+PACKED_VERSION = 1
+PACKED_DTYPES = {'float32': ('<f4', 0), 'float16': ('<f2', 1)}
+
+
+def available_media_types() -> Tuple[str, ...]:
+    """Media types this server can produce (msgpack only if installed)"""
+    if msgpack is not None:
+        return (MEDIA_JSON, MEDIA_MSGPACK, MEDIA_PACKED)
+    return (MEDIA_JSON, MEDIA_PACKED)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Pick the response media type from an Accept header
+
+    Honors q-values; falls back to JSON for missing, wildcard or unknown types.
+    """
+    if not accept:
+        return MEDIA_JSON
+
+    supported = available_media_types()
+    candidates = []
+    for position, part in enumerate(accept.split(',')):
+        media_type, _, params = part.partition(';')
+        media_type = media_type.strip()
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type == 'application/msgpack':
+            media_type = MEDIA_MSGPACK
+        if media_type in supported and quality > 0:
+            candidates.append((-quality, position, media_type))
+
+    if not candidates:
+        return MEDIA_JSON
+    return min(candidates)[2]
+
+
+def select_fields(payload: Dict, fields: Optional[str]) -> Dict:
+    """Keep only the comma-separated top-level fields requested by the client"""
+    if not fields:
+        return payload
+    wanted = {name.strip() for name in fields.split(',') if name.strip()}
+    return {key: value for key, value in payload.items() if key in wanted}
+
+
+def _json_default(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode_json(payload: Dict) -> bytes:
+    """Compact numpy-aware JSON encoding (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, separators=(',', ':'), default=_json_default).encode('utf-8')
+
+
+def encode_msgpack(payload: Dict) -> bytes:
+    """MessagePack encoding with single-precision floats"""
+    return msgpack.packb(payload, default=_json_default, use_single_float=True)
+
+
+def encode_packed(payload: Dict, dtype: str = 'float32') -> bytes:
+    """
+    Raw packed format: landmark arrays as contiguous float32/float16 blocks
+
+    Layout (little-endian):
+        4s   magic b'POSE'
+        B    version
+        B    dtype code (0 = float32, 1 = float16)
+        H    reserved
+        I    header length in bytes (padded to a multiple of 4)
+        ...  UTF-8 JSON header: non-landmark fields plus
+             "blocks": [[field, [rows, cols]], ...]
+        ...  landmark blocks in header order
+    """
+    if dtype not in PACKED_DTYPES:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    np_dtype, dtype_code = PACKED_DTYPES[dtype]
+
+    header = {}
+    blocks = []
+    arrays = []
+    for key, value in payload.items():
+        if key in LANDMARK_FIELDS:
+            arr = landmarks_to_array(value) if len(value) else np.zeros((0, 4))
+            arr = np.ascontiguousarray(arr, dtype=np_dtype)
+            blocks.append([key, list(arr.shape)])
+            arrays.append(arr)
+        else:
+            header[key] = value
+    header['blocks'] = blocks
+
+    header_bytes = encode_json(header)
+    header_bytes += b' ' * (-len(header_bytes) % 4)
+
+    parts = [
+        struct.pack('<4sBBHI', PACKED_MAGIC, PACKED_VERSION, dtype_code, 0, len(header_bytes)),
+        header_bytes,
+    ]
+    parts.extend(arr.tobytes() for arr in arrays)
+    return b''.join(parts)
+
+
+def decode_packed(body: bytes) -> Dict:
+    """Inverse of encode_packed (used by tests and Python clients)"""
+    magic, version, dtype_code, _, header_len = struct.unpack_from('<4sBBHI', body)
+    if magic != PACKED_MAGIC or version != PACKED_VERSION:
+        raise ValueError("Not a packed pose payload")
+    np_dtype = next(code for code, value in PACKED_DTYPES.values() if value == dtype_code)
+
+    offset = struct.calcsize('<4sBBHI')
+    header = json.loads(body[offset:offset + header_len])
+    offset += header_len
+
+    for key, shape in header.pop('blocks'):
+        count = int(np.prod(shape))
+        header[key] = np.frombuffer(body, dtype=np_dtype, count=count, offset=offset).reshape(shape)
+        offset += count * np.dtype(np_dtype).itemsize
+    return header
+
+
+def encode_response(
+    payload: Dict,
+    accept: Optional[str] = None,
+    fields: Optional[str] = None,
+    dtype: str = 'float32',
+    status_code: int = 200
+) -> Response:
+    """Encode a landmark payload in the format negotiated from the Accept header"""
+    payload = select_fields(payload, fields)
+    media_type = negotiate(accept)
+
+    if media_type == MEDIA_MSGPACK:
+        content = encode_msgpack(payload)
+    elif media_type == MEDIA_PACKED:
+        content = encode_packed(payload, dtype)
+    else:
+        content = encode_json(payload)
+
+    return Response(
+        content=content,
+        status_code=status_code,
+        media_type=media_type,
+        headers={"Vary": "Accept"}
+    )
+
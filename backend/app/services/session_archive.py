@@ -0,0 +1,343 @@
+"""
+Cold-storage archive of old pose sessions (compressed .npz per user-month)
+"""
+import asyncio
+import os
+import numpy as np
+from collections import OrderedDict
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, null, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.pose_frame import PoseFrameChunk
+from app.models.pose_session import PoseSession
+from app.services.frame_timeline import (
+    FrameRange, assemble_frames, has_frames, read_frames, read_frames_between, stream_frames
+)
+from app.services.landmarks import NUM_LANDMARKS
+
+ARCHIVE_VERSION = 1
+
+_CHUNKS = PoseFrameChunk.__table__
+_SESSIONS = PoseSession.__table__
+
+# A stored timeline chunk: (start_frame, frame_count, landmarks, timestamps bytes, keyframe_offsets bytes | None),
+# the row layout assemble_frames reads
+ChunkRow = Tuple[int, int, np.ndarray, bytes, Optional[bytes]]
+
+
+class ArchiveUnavailable(LookupError):
+    """The archive file of a session, or its entry in the file, is missing"""
+
+
+class ArchivedSession(NamedTuple):
+    """Payloads of one archived session"""
+    session_id: int
+    landmarks_3d: Optional[np.ndarray]  # (33, 4)
+    landmarks_2d: Optional[np.ndarray]
+    chunks: List[ChunkRow]  # Timeline chunks exactly as they were stored
+
+
+def archive_file(root: str, user_id: int, created_at: datetime) -> str:
+    """Archive file holding a session: <root>/user<id>/<YYYY-MM>.npz"""
+    return os.path.join(root, f"user{user_id}", f"{created_at:%Y-%m}.npz")
+
+
+def _ragged(arrays: Sequence[Optional[np.ndarray]], item_shape: Tuple[int, ...], dtype) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenate arrays (None as empty) and their (len + 1,) offsets"""
+    parts = [np.empty((0,) + item_shape, dtype) if a is None else np.asarray(a, dtype).reshape((-1,) + item_shape) for a in arrays]
+    offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(part) for part in parts])
+    data = np.concatenate(parts) if parts else np.empty((0,) + item_shape, dtype)
+    return data, offsets
+
+
+def pack_archive(sessions: Sequence[ArchivedSession], dtype: str = 'float16') -> Dict[str, np.ndarray]:
+    """
+    Columnar arrays for a set of sessions (the .npz members)
+
+    Per-session landmarks and per-chunk stored frames are concatenated with
+    offset arrays; timeline chunks keep their keyframe compression.
+    """
+    chunk_owner, starts, counts, compressed = [], [], [], []
+    points, times, offsets = [], [], []
+    for session in sessions:
+        for start_frame, frame_count, landmarks, timestamps, keyframe_offsets in session.chunks:
+            chunk_owner.append(session.session_id)
+            starts.append(start_frame)
+            counts.append(frame_count)
+            compressed.append(keyframe_offsets is not None)
+            points.append(landmarks)
+            times.append(np.frombuffer(timestamps, dtype='<f8'))
+            offsets.append(
+                np.frombuffer(keyframe_offsets, dtype='<u2') if keyframe_offsets is not None
+                else np.arange(frame_count, dtype='<u2')
+            )
+
+    landmarks_3d, landmarks_3d_offsets = _ragged([s.landmarks_3d for s in sessions], (4,), dtype)
+    landmarks_2d, landmarks_2d_offsets = _ragged([s.landmarks_2d for s in sessions], (4,), dtype)
+    chunk_points, chunk_point_offsets = _ragged(points, (NUM_LANDMARKS, 4), dtype)
+    return {
+        "version": np.array(ARCHIVE_VERSION),
+        "session_ids": np.array([s.session_id for s in sessions], dtype=np.int64),
+        "landmarks_3d": landmarks_3d,
+        "landmarks_3d_offsets": landmarks_3d_offsets,
+        "landmarks_2d": landmarks_2d,
+        "landmarks_2d_offsets": landmarks_2d_offsets,
+        "chunk_session_ids": np.array(chunk_owner, dtype=np.int64),
+        "chunk_start_frames": np.array(starts, dtype=np.int64),
+        "chunk_frame_counts": np.array(counts, dtype=np.int64),
+        "chunk_compressed": np.array(compressed, dtype=bool),
+        "chunk_point_offsets": chunk_point_offsets,
+        "chunk_landmarks": chunk_points,
+        "chunk_timestamps": np.concatenate(times) if times else np.empty(0, '<f8'),
+        "chunk_keyframes": np.concatenate(offsets) if offsets else np.empty(0, '<u2'),
+    }
+
+
+def unpack_archive(arrays: Dict[str, np.ndarray]) -> Dict[int, ArchivedSession]:
+    """
+    Inverse of pack_archive, keyed by session id (landmarks as float32)
+
+    Raises:
+        ValueError: If the archive version is not supported
+    """
+    if int(arrays["version"]) != ARCHIVE_VERSION:
+        raise ValueError(f"Unsupported archive version {int(arrays['version'])}")
+
+    def piece(name: str, index: int) -> Optional[np.ndarray]:
+        offsets = arrays[f"{name}_offsets"]
+        data = arrays[name][offsets[index]:offsets[index + 1]]
+        return data.astype(np.float32) if len(data) else None
+
+    chunks: Dict[int, List[ChunkRow]] = {}
+    point_offsets = arrays["chunk_point_offsets"]
+    for i, session_id in enumerate(arrays["chunk_session_ids"].tolist()):
+        points = slice(point_offsets[i], point_offsets[i + 1])
+        keyframes = arrays["chunk_keyframes"][points]
+        chunks.setdefault(session_id, []).append((
+            int(arrays["chunk_start_frames"][i]),
+            int(arrays["chunk_frame_counts"][i]),
+            arrays["chunk_landmarks"][points].astype(np.float32),
+            arrays["chunk_timestamps"][points].astype('<f8').tobytes(),
+            keyframes.astype('<u2').tobytes() if arrays["chunk_compressed"][i] else None,
+        ))
+
+    return {
+        session_id: ArchivedSession(
+            session_id,
+            piece("landmarks_3d", i),
+            piece("landmarks_2d", i),
+            sorted(chunks.get(session_id, []), key=lambda row: row[0])
+        )
+        for i, session_id in enumerate(arrays["session_ids"].tolist())
+    }
+
+
+# Recently read archives, keyed by (path, mtime); archives change only when the job appends
+_cache: "OrderedDict[Tuple[str, int], Dict[int, ArchivedSession]]" = OrderedDict()
+_CACHE_SIZE = 4
+
+
+def read_archive(path: str) -> Dict[int, ArchivedSession]:
+    """
+    Sessions of an archive file (cached while the file is unchanged)
+
+    Raises:
+        FileNotFoundError: If the archive file is missing
+    """
+    key = (path, os.stat(path).st_mtime_ns)
+    archived = _cache.get(key)
+    if archived is None:
+        with np.load(path) as data:
+            archived = unpack_archive({name: data[name] for name in data.files})
+        _cache[key] = archived
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(key)
+    return archived
+
+
+def write_archive(path: str, sessions: Sequence[ArchivedSession], dtype: str = 'float16'):
+    """
+    Add sessions to an archive file, replacing any with the same id
+
+    Written to a temporary file and renamed, so readers never see a partial archive.
+    """
+    merged = dict(read_archive(path)) if os.path.exists(path) else {}
+    merged.update((session.session_id, session) for session in sessions)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.tmp.npz"
+    np.savez_compressed(temporary, **pack_archive([merged[key] for key in sorted(merged)], dtype))
+    os.replace(temporary, path)
+
+
+def _archived_entry(path: str, session_id: int) -> ArchivedSession:
+    try:
+        archived = read_archive(path).get(session_id)
+    except FileNotFoundError:
+        raise ArchiveUnavailable(f"Archive {path} of session {session_id} is missing") from None
+    if archived is None:
+        raise ArchiveUnavailable(f"Session {session_id} missing from archive {path}")
+    return archived
+
+
+async def archived_session(session: PoseSession) -> ArchivedSession:
+    """
+    Archived payloads of a stub session
+
+    The archive is read and decompressed in a worker thread.
+
+    Raises:
+        ArchiveUnavailable: If the archive file is missing or does not hold the session
+    """
+    return await asyncio.to_thread(_archived_entry, session.archive_path, session.id)
+
+
+async def rehydrate_session(session: PoseSession) -> PoseSession:
+    """
+    Load an archived session's landmarks into the instance (not marked as changed)
+
+    Sessions that are not archived are returned as is. The landmark columns
+    must have been loaded (undefer_group("landmarks")).
+    """
+    if session.archive_path:
+        archived = await archived_session(session)
+        set_committed_value(session, "landmarks_3d_packed", archived.landmarks_3d)
+        set_committed_value(session, "landmarks_2d_packed", archived.landmarks_2d)
+    return session
+
+
+async def session_has_frames(db: AsyncSession, session: PoseSession) -> bool:
+    """Whether a session has a timeline, hot or archived"""
+    if session.archive_path:
+        return bool((await archived_session(session)).chunks)
+    return await has_frames(db, session.id)
+
+
+async def session_frames(
+    db: AsyncSession,
+    session: PoseSession,
+    start: int = 0,
+    end: Optional[int] = None
+) -> FrameRange:
+    """Frames [start, end) of a session timeline, hot or archived"""
+    if session.archive_path:
+        chunks = (await archived_session(session)).chunks
+        return await asyncio.to_thread(assemble_frames, chunks, start=start, end=end)
+    return await read_frames(db, session.id, start, end)
+
+
+async def session_frames_between(
+    db: AsyncSession,
+    session: PoseSession,
+    start_time: float,
+    end_time: float
+) -> FrameRange:
+    """Frames with start_time <= timestamp < end_time, hot or archived"""
+    if session.archive_path:
+        chunks = (await archived_session(session)).chunks
+        return await asyncio.to_thread(assemble_frames, chunks, start_time=start_time, end_time=end_time)
+    return await read_frames_between(db, session.id, start_time, end_time)
+
+
+async def stream_session_frames(db: AsyncSession, session_id: int, archive_path: Optional[str]) -> AsyncIterator[FrameRange]:
+    """
+    Yield a session timeline chunk by chunk, hot or archived
+
+    Raises:
+        ArchiveUnavailable: If the session's archive file or entry is missing
+    """
+    if archive_path:
+        archived = await asyncio.to_thread(_archived_entry, archive_path, session_id)
+        for row in archived.chunks:
+            yield assemble_frames([row])
+        return
+    async for frames in stream_frames(db, session_id):
+        yield frames
+
+
+async def archive_sessions(
+    db: AsyncSession,
+    cutoff: datetime,
+    root: str,
+    batch_size: int = 200,
+    dtype: str = 'float16'
+) -> Dict:
+    """
+    Move sessions created before `cutoff` into archive files
+
+    Each batch groups sessions by user and month, appends them to the
+    month's archive, then strips the landmark payloads and timeline chunks
+    from the database, leaving stub rows that point at the archive. Files
+    are written before the database commit, so a failed batch leaves
+    unreferenced archive entries that the next run overwrites.
+
+    Returns:
+        {"sessions": archived session count, "chunks": timeline chunks moved, "files": archive files written}
+    """
+    stats = {"sessions": 0, "chunks": 0, "files": 0}
+    while True:
+        result = await db.execute(
+            select(PoseSession)
+            .options(undefer_group("landmarks"))
+            .where(PoseSession.created_at < cutoff, PoseSession.archive_path.is_(None))
+            .order_by(PoseSession.user_id, PoseSession.created_at, PoseSession.id)
+            .limit(batch_size)
+        )
+        sessions = result.scalars().all()
+        if not sessions:
+            return stats
+
+        chunk_result = await db.execute(
+            select(
+                _CHUNKS.c.pose_session_id,
+                _CHUNKS.c.start_frame,
+                _CHUNKS.c.frame_count,
+                _CHUNKS.c.landmarks,
+                _CHUNKS.c.timestamps,
+                _CHUNKS.c.keyframe_offsets
+            )
+            .where(_CHUNKS.c.pose_session_id.in_([session.id for session in sessions]))
+            .order_by(_CHUNKS.c.pose_session_id, _CHUNKS.c.start_frame)
+        )
+        chunks: Dict[int, List[ChunkRow]] = {}
+        for session_id, *row in chunk_result.all():
+            chunks.setdefault(session_id, []).append(tuple(row))
+
+        files: Dict[str, List[PoseSession]] = {}
+        for session in sessions:
+            files.setdefault(archive_file(root, session.user_id, session.created_at), []).append(session)
+
+        archived_at = datetime.utcnow()
+        for path, members in files.items():
+            write_archive(path, [
+                ArchivedSession(session.id, session.landmarks_3d, session.landmarks_2d, chunks.get(session.id, []))
+                for session in members
+            ], dtype)
+            await db.execute(
+                update(_SESSIONS)
+                .where(_SESSIONS.c.id.in_([session.id for session in members]))
+                .values(
+                    landmarks_3d=null(),
+                    landmarks_2d=null(),
+                    landmarks_3d_packed=None,
+                    landmarks_2d_packed=None,
+                    archive_path=path,
+                    archived_at=archived_at
+                )
+            )
+        await db.execute(delete(_CHUNKS).where(_CHUNKS.c.pose_session_id.in_(list(chunks))))
+        await db.commit()
+        # Drop the loaded payloads before the next batch
+        db.expunge_all()
+
+        stats["sessions"] += len(sessions)
+        stats["chunks"] += sum(len(rows) for rows in chunks.values())
+        stats["files"] += len(files)
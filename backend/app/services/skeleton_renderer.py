@@ -0,0 +1,202 @@
+"""
+Skeleton overlay rendering
+"""
+from collections import OrderedDict
+import cv2
+import numpy as np
+from typing import Hashable, Optional, Tuple
+
+from app.services.landmarks import LandmarkInput, landmarks_to_array
+
+# MediaPipe POSE_CONNECTIONS as a (35, 2) index table
+POSE_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20),
+    (11, 23), (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28),
+    (27, 29), (28, 30), (29, 31), (30, 32), (27, 31), (28, 32),
+], dtype=np.intp)
+
+# BGR colors, following MediaPipe's default pose style
+SIDE_COLORS = {
+    'left': (0, 138, 255),
+    'right': (231, 217, 0),
+    'center': (224, 224, 224),
+}
+
+# Landmark side: 0 = center (nose), odd-numbered body joints from 11 on are left
+_LEFT = np.array([1, 2, 3, 7, 9] + list(range(11, 33, 2)))
+_RIGHT = np.array([4, 5, 6, 8, 10] + list(range(12, 33, 2)))
+
+
+def _side_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """Per-landmark and per-connection side codes (0 center, 1 left, 2 right)"""
+    landmark_side = np.zeros(33, dtype=np.int8)
+    landmark_side[_LEFT] = 1
+    landmark_side[_RIGHT] = 2
+
+    ends = landmark_side[POSE_CONNECTIONS]
+    connection_side = np.where(ends[:, 0] == ends[:, 1], ends[:, 0], 0)
+    return landmark_side, connection_side
+
+
+LANDMARK_SIDE, CONNECTION_SIDE = _side_tables()
+_SIDE_NAMES = ('center', 'left', 'right')
+
+
+class SkeletonRenderer:
+    """
+    Vectorized OpenCV skeleton renderer
+
+    Connections are drawn with one cv2.polylines call per color group and
+    joints as zero-length round-capped segments, instead of per-landmark
+    drawing calls. Images are downscaled before drawing so the overlay is
+    rendered at output resolution.
+    """
+
+    def __init__(
+        self,
+        line_thickness: int = 2,
+        joint_radius: int = 4,
+        min_visibility: float = 0.5,
+        reference_width: int = 640
+    ):
+        """
+        Args:
+            line_thickness: Connection thickness (pixels at reference_width)
+            joint_radius: Joint radius (pixels at reference_width)
+            min_visibility: Hide landmarks below this visibility
+            reference_width: Output width at which sizes are used unscaled
+        """
+        self.line_thickness = line_thickness
+        self.joint_radius = joint_radius
+        self.min_visibility = min_visibility
+        self.reference_width = reference_width
+
+    def render(
+        self,
+        landmarks: LandmarkInput,
+        image: Optional[np.ndarray] = None,
+        width: Optional[int] = None,
+        canvas_size: Tuple[int, int] = (640, 480),
+        draw_connections: bool = True,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Draw a skeleton over an image, or over a blank canvas
+
+        Args:
+            landmarks: Normalized landmarks (list of dicts or (33, 3|4) array)
+            image: BGR background; None draws on a black canvas
+            width: Output width; larger images are downscaled, never upscaled
+            canvas_size: (width, height) of the canvas when no image is given
+            draw_connections: Whether to draw skeleton connections
+            out: Preallocated array to draw into (must match the output shape)
+
+        Returns:
+            BGR image with the skeleton drawn
+        """
+        if image is None:
+            canvas_width, canvas_height = canvas_size
+            if width and width < canvas_width:
+                canvas_height = round(canvas_height * width / canvas_width)
+                canvas_width = width
+            if out is None:
+                out = np.zeros((canvas_height, canvas_width, 3), dtype=np.uint8)
+            else:
+                out[:] = 0
+        else:
+            height, image_width = image.shape[:2]
+            if width and width < image_width:
+                size = (width, round(height * width / image_width))
+                out = cv2.resize(image, size, dst=out, interpolation=cv2.INTER_AREA)
+            elif out is None:
+                out = image.copy()
+            else:
+                np.copyto(out, image)
+
+        points = landmarks_to_array(landmarks)
+        if points.size == 0:
+            return out
+
+        height, out_width = out.shape[:2]
+        scale = out_width / self.reference_width
+        thickness = max(1, round(self.line_thickness * scale))
+        radius = max(1, round(self.joint_radius * scale))
+
+        pixels = np.rint(points[:, :2] * (out_width, height)).astype(np.int32)
+        visible = np.isfinite(points[:, :2]).all(axis=1)
+        if points.shape[1] > 3:
+            visible &= points[:, 3] >= self.min_visibility
+
+        if draw_connections and points.shape[0] == LANDMARK_SIDE.size:
+            shown = visible[POSE_CONNECTIONS].all(axis=1)
+            for side, name in enumerate(_SIDE_NAMES):
+                edges = POSE_CONNECTIONS[shown & (CONNECTION_SIDE == side)]
+                if len(edges):
+                    cv2.polylines(out, pixels[edges], False, SIDE_COLORS[name], thickness, cv2.LINE_AA)
+
+        sides = LANDMARK_SIDE if points.shape[0] == LANDMARK_SIDE.size else np.zeros(points.shape[0], np.int8)
+        for side, name in enumerate(_SIDE_NAMES):
+            joints = pixels[visible & (sides == side)]
+            if len(joints):
+                # A zero-length segment with round caps draws a filled dot
+                cv2.polylines(out, np.stack([joints, joints], axis=1), False, SIDE_COLORS[name], radius * 2, cv2.LINE_AA)
+
+        return out
+
+    def render_jpeg(
+        self,
+        landmarks: LandmarkInput,
+        image: Optional[np.ndarray] = None,
+        width: Optional[int] = None,
+        quality: int = 80,
+        canvas_size: Tuple[int, int] = (640, 480)
+    ) -> bytes:
+        """Render and JPEG-encode at the given quality (1-100)"""
+        rendered = self.render(landmarks, image, width=width, canvas_size=canvas_size)
+        ok, encoded = cv2.imencode('.jpg', rendered, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        return encoded.tobytes()
+
+
+class RenderCache:
+    """
+    LRU cache of encoded renders, bounded by total bytes
+
+    Keys are chosen by the caller, e.g. (session_id, width, quality).
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        data = self._entries.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def put(self, key: Hashable, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= len(previous)
+        self._entries[key] = data
+        self.bytes += len(data)
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+
+    def invalidate(self, predicate):
+        """Drop entries whose key matches `predicate(key)`"""
+        for key in [key for key in self._entries if predicate(key)]:
+            self.bytes -= len(self._entries.pop(key))
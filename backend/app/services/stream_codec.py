@@ -0,0 +1,127 @@
+"""
+Delta-quantized landmark codec for live streams
+"""
+import base64
+import numpy as np
+from typing import Dict, Optional
+
+INT16_MAX = np.iinfo(np.int16).max
+# Keyframes are int32 grid indices: at this precision coordinates up to
+# about +-4000 still fit, far beyond any landmark value
+MIN_PRECISION = 1e-6
+
+
+class DeltaLandmarkEncoder:
+    """
+    Encode a landmark stream as periodic keyframes plus int16 deltas
+
+    Coordinates are quantized to a grid of `2 * precision`, so every decoded
+    value is within `precision` of the source. The encoder tracks the
+    quantized state the decoder holds, so errors never accumulate.
+    """
+
+    def __init__(self, precision: float = 0.001, keyframe_interval: int = 30):
+        """
+        Args:
+            precision: Maximum absolute reconstruction error per coordinate
+                (at least MIN_PRECISION)
+            keyframe_interval: Send a full keyframe at least every N frames
+        """
+        if not precision >= MIN_PRECISION:
+            raise ValueError(f"precision must be at least {MIN_PRECISION}")
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+
+        self.step = 2.0 * precision
+        self.keyframe_interval = keyframe_interval
+        self.seq = 0
+        self._state: Optional[np.ndarray] = None
+        self._scaled: Optional[np.ndarray] = None
+        self._since_keyframe = 0
+
+    def force_keyframe(self):
+        """Make the next encoded frame a keyframe (e.g. after a client resync request)"""
+        self._state = None
+
+    def _allocate(self, shape):
+        # Scratch arrays reused every frame; the quantized state is double-buffered
+        self._scaled = np.empty(shape)
+        self._quantized = [np.empty(shape, dtype=np.int64), np.empty(shape, dtype=np.int64)]
+        self._delta = np.empty(shape, dtype=np.int64)
+        self._keyframe_data = np.empty(shape, dtype='<i4')
+        self._delta_data = np.empty(shape, dtype='<i2')
+
+    def encode(self, points: np.ndarray) -> Dict:
+        """
+        Encode one (33, C) landmark array
+
+        Returns:
+            {"codec": "delta", "seq", "key", "step", "shape", "data"} where `data`
+            is base64 of little-endian int32 quantized values (keyframe) or
+            int16 deltas against the previous frame
+        """
+        points = np.asarray(points)
+        if self._scaled is None or self._scaled.shape != points.shape:
+            self._allocate(points.shape)
+            self._state = None
+
+        np.divide(points, self.step, out=self._scaled)
+        np.rint(self._scaled, out=self._scaled)
+        quantized = self._quantized[0] if self._state is not self._quantized[0] else self._quantized[1]
+        np.copyto(quantized, self._scaled, casting='unsafe')
+
+        is_key = self._state is None or self._since_keyframe >= self.keyframe_interval - 1
+
+        if not is_key:
+            delta = np.subtract(quantized, self._state, out=self._delta)
+            if delta.max() > INT16_MAX or delta.min() < -INT16_MAX:
+                is_key = True
+
+        if is_key:
+            np.copyto(self._keyframe_data, quantized, casting='unsafe')
+            data = self._keyframe_data.tobytes()
+            self._since_keyframe = 0
+        else:
+            np.copyto(self._delta_data, delta, casting='unsafe')
+            data = self._delta_data.tobytes()
+            self._since_keyframe += 1
+
+        self._state = quantized
+        self.seq += 1
+
+        return {
+            "codec": "delta",
+            "seq": self.seq,
+            "key": is_key,
+            "step": self.step,
+            "shape": list(quantized.shape),
+            "data": base64.b64encode(data).decode('ascii')
+        }
+
+
+class DeltaLandmarkDecoder:
+    """Reference decoder (mirrors frontend/src/utils/landmarkCodec.js)"""
+
+    def __init__(self):
+        self.seq = 0
+        self._state: Optional[np.ndarray] = None
+
+    def decode(self, frame: Dict) -> np.ndarray:
+        """
+        Decode one encoded frame
+
+        Raises:
+            ValueError: If a delta arrives without its reference frame
+        """
+        shape = tuple(frame["shape"])
+        buffer = base64.b64decode(frame["data"])
+
+        if frame["key"]:
+            self._state = np.frombuffer(buffer, dtype='<i4').astype(np.int64).reshape(shape)
+        else:
+            if self._state is None or frame["seq"] != self.seq + 1:
+                raise ValueError("Missing reference frame; request a keyframe")
+            self._state = self._state + np.frombuffer(buffer, dtype='<i2').reshape(shape)
+
+        self.seq = frame["seq"]
+        return self._state * frame["step"]
@@ -0,0 +1,191 @@
+"""
+Short-lived cache of authenticated users, keyed by token subject (username)
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.core.logger import log as logger
+from app.models.user import User
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - optional shared tier
+    aioredis = None
+
+# Columns kept in a snapshot; the password hash is never cached
+SNAPSHOT_FIELDS = ('id', 'email', 'username', 'full_name', 'is_active', 'is_superuser', 'created_at', 'updated_at')
+DATETIME_FIELDS = ('created_at', 'updated_at')
+REDIS_PREFIX = "auth:user:"
+# session.info key collecting (user ids, usernames) changed in the current transaction
+_PENDING_KEY = "user_cache_pending"
+
+
+def user_snapshot(user: User) -> Dict:
+    return {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+
+
+def user_from_snapshot(snapshot: Dict) -> User:
+    """
+    Transient (session-less) User built from a snapshot
+
+    Only columns are available: relationships are empty and hashed_password
+    is None. Callers use it for ids and flags, never to write the user back.
+    """
+    return User(**snapshot)
+
+
+def _dump(snapshot: Dict) -> str:
+    return json.dumps({
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in snapshot.items()
+    })
+
+
+def _load(data) -> Dict:
+    snapshot = json.loads(data)
+    for field in DATETIME_FIELDS:
+        if snapshot.get(field):
+            snapshot[field] = datetime.fromisoformat(snapshot[field])
+    return snapshot
+
+
+class UserCache:
+    """
+    TTL cache of user snapshots, in process and optionally shared through Redis
+
+    Entries live for at most `ttl_seconds`, which bounds how stale another
+    worker's copy can be; changes committed through this process are
+    invalidated immediately (see track_user_changes). A ttl of 0 disables
+    caching. Redis errors fall back to the database.
+    """
+
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 10000, redis_url: Optional[str] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._redis = aioredis.from_url(redis_url) if redis_url and aioredis is not None else None
+        self._tasks = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    async def get(self, username: str) -> Optional[User]:
+        if not self.enabled:
+            return None
+        entry = self._entries.get(username)
+        if entry is not None:
+            expires_at, snapshot = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(username)
+                self.hits += 1
+                return user_from_snapshot(snapshot)
+            del self._entries[username]
+
+        if self._redis is not None:
+            try:
+                data = await self._redis.get(REDIS_PREFIX + username)
+            except Exception as e:
+                logger.warning(f"User cache lookup failed: {e}")
+                data = None
+            if data is not None:
+                snapshot = _load(data)
+                self._store(username, snapshot)
+                self.hits += 1
+                return user_from_snapshot(snapshot)
+
+        self.misses += 1
+        return None
+
+    async def put(self, user: User):
+        if not self.enabled:
+            return
+        snapshot = user_snapshot(user)
+        self._store(user.username, snapshot)
+        if self._redis is not None:
+            try:
+                await self._redis.set(REDIS_PREFIX + user.username, _dump(snapshot), ex=max(int(self.ttl_seconds), 1))
+            except Exception as e:
+                logger.warning(f"User cache store failed: {e}")
+
+    async def invalidate(self, usernames: Iterable[str]):
+        usernames = self.discard(usernames)
+        if self._redis is not None and usernames:
+            try:
+                await self._redis.delete(*(REDIS_PREFIX + name for name in usernames))
+            except Exception as e:
+                logger.warning(f"User cache invalidation failed: {e}")
+
+    def discard(self, usernames: Iterable[str]) -> list:
+        """Drop in-process entries only; returns the usernames"""
+        usernames = [name for name in usernames if name]
+        for name in usernames:
+            self._entries.pop(name, None)
+        return usernames
+
+    def clear(self):
+        self._entries.clear()
+
+    def _store(self, username: str, snapshot: Dict):
+        self._entries[username] = (time.monotonic() + self.ttl_seconds, snapshot)
+        self._entries.move_to_end(username)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def names_of(self, user_ids: Iterable[int]) -> set:
+        """Usernames of in-process entries for these user ids"""
+        user_ids = set(user_ids)
+        return {name for name, (_, snapshot) in self._entries.items() if snapshot['id'] in user_ids}
+
+    def invalidate_later(self, usernames: Iterable[str]):
+        """Invalidate from synchronous code: locally now, in Redis on the running loop"""
+        usernames = self.discard(usernames)
+        if self._redis is None or not usernames:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.invalidate(usernames))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+def track_user_changes(cache: UserCache):
+    """
+    Invalidate cached users once updates or deletes of them are committed
+
+    Covers every change made through the ORM in this process (including
+    deactivation via is_active). Entries are matched by user id as well as
+    username, so renames drop the entry under the old name.
+    """
+    def remember(mapper, connection, target: User):
+        session = object_session(target)
+        if session is None:
+            return
+        user_ids, names = session.info.setdefault(_PENDING_KEY, (set(), set()))
+        user_ids.add(target.id)
+        names.update({target.username, *inspect(target).attrs.username.history.deleted})
+
+    def flush_pending(session: Session):
+        pending = session.info.pop(_PENDING_KEY, None)
+        if pending:
+            user_ids, names = pending
+            cache.invalidate_later(names | cache.names_of(user_ids))
+
+    def drop_pending(session: Session, previous_transaction):
+        session.info.pop(_PENDING_KEY, None)
+
+    event.listen(User, "after_update", remember)
+    event.listen(User, "after_delete", remember)
+    event.listen(Session, "after_commit", flush_pending)
+    event.listen(Session, "after_soft_rollback", drop_pending)
@@ -0,0 +1,214 @@
+"""
+Annotated video export: source frames + landmark timeline -> MP4
+"""
+import bisect
+import os
+import cv2
+import numpy as np
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.services.skeleton_renderer import SkeletonRenderer
+
+FOURCC = 'mp4v'
+
+# A timeline row: {"t": seconds, "landmarks": [...], "issues": ["Forward Head Posture", ...]}
+TimelineRow = Dict
+
+
+def video_info(path: str) -> Dict:
+    """
+    Frame count, fps and size of a video file
+
+    Raises:
+        ValueError: If the file cannot be opened
+    """
+    capture = cv2.VideoCapture(path)
+    try:
+        if not capture.isOpened():
+            raise ValueError(f"Cannot open video: {path}")
+        return {
+            "frame_count": int(capture.get(cv2.CAP_PROP_FRAME_COUNT)),
+            "fps": capture.get(cv2.CAP_PROP_FPS) or 30.0,
+            "width": int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        }
+    finally:
+        capture.release()
+
+
+def output_size(width: int, height: int, max_width: Optional[int]) -> Tuple[int, int]:
+    """Export frame size: downscaled to max_width, even dimensions for the encoder"""
+    if max_width and max_width < width:
+        height = round(height * max_width / width)
+        width = max_width
+    return width - width % 2, height - height % 2
+
+
+def plan_chunks(frame_count: int, chunk_frames: int) -> List[Tuple[int, int]]:
+    """Split [0, frame_count) into [start, end) ranges of at most chunk_frames"""
+    return [
+        (start, min(start + chunk_frames, frame_count))
+        for start in range(0, frame_count, chunk_frames)
+    ]
+
+
+def timeline_slice(rows: Sequence[TimelineRow], start_t: float, end_t: float) -> List[TimelineRow]:
+    """
+    Rows needed to render [start_t, end_t): those inside it plus the one in effect at start_t
+
+    `rows` must be sorted by "t".
+    """
+    times = [row["t"] for row in rows]
+    first = max(bisect.bisect_right(times, start_t) - 1, 0)
+    last = bisect.bisect_left(times, end_t)
+    return list(rows[first:last])
+
+
+def frame_rows(frames, start_t: float, end_t: float) -> List[TimelineRow]:
+    """
+    Timeline rows of a FrameRange needed to render [start_t, end_t)
+
+    Landmarks stay (33, 4) arrays; the renderer takes them directly.
+    """
+    rows = [{"t": t, "landmarks": points} for t, points in zip(frames.timestamps.tolist(), frames.landmarks)]
+    return timeline_slice(rows, start_t, end_t)
+
+
+class TimelineCursor:
+    """Walks a sorted timeline with monotonically increasing frame times"""
+
+    def __init__(self, rows: Sequence[TimelineRow]):
+        self.rows = rows
+        self._index = -1
+
+    def at(self, t: float) -> Optional[TimelineRow]:
+        """Latest row with row["t"] <= t"""
+        while self._index + 1 < len(self.rows) and self.rows[self._index + 1]["t"] <= t:
+            self._index += 1
+        return self.rows[self._index] if self._index >= 0 else None
+
+
+def draw_issues(image: np.ndarray, issues: Sequence[str]) -> np.ndarray:
+    """Burn issue labels into the top-left corner"""
+    scale = image.shape[1] / 960
+    line_height = max(12, round(28 * scale))
+    for i, issue in enumerate(issues):
+        origin = (round(12 * scale), line_height * (i + 1))
+        cv2.putText(image, issue, origin, cv2.FONT_HERSHEY_SIMPLEX, 0.7 * scale, (0, 0, 0), max(1, round(4 * scale)), cv2.LINE_AA)
+        cv2.putText(image, issue, origin, cv2.FONT_HERSHEY_SIMPLEX, 0.7 * scale, (60, 60, 255), max(1, round(2 * scale)), cv2.LINE_AA)
+    return image
+
+
+def render_chunk(
+    video_path: str,
+    rows: Sequence[TimelineRow],
+    start: int,
+    end: int,
+    output_path: str,
+    max_width: Optional[int] = None,
+    issues: Sequence[str] = (),
+    renderer: Optional[SkeletonRenderer] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    progress_every: int = 25
+) -> int:
+    """
+    Render frames [start, end) of a video with overlays into an MP4 chunk
+
+    Frames are streamed one at a time through a single preallocated output
+    buffer, so memory does not grow with chunk length.
+
+    Args:
+        video_path: Source video
+        rows: Timeline rows (sorted by "t") covering the chunk
+        start, end: Frame range to render
+        output_path: Chunk file to write
+        max_width: Downscale frames to this width
+        issues: Labels burned into every frame (in addition to per-row issues)
+        renderer: Skeleton renderer to use
+        progress: Called with (frames_done, frames_total) every `progress_every` frames
+
+    Returns:
+        Number of frames written
+    """
+    renderer = renderer or SkeletonRenderer()
+    info = video_info(video_path)
+    fps = info["fps"]
+    size = output_size(info["width"], info["height"], max_width)
+    total = end - start
+
+    capture = cv2.VideoCapture(video_path)
+    writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*FOURCC), fps, size)
+    cursor = TimelineCursor(rows)
+    frame = np.empty((size[1], size[0], 3), dtype=np.uint8)
+    written = 0
+
+    try:
+        if not writer.isOpened():
+            raise ValueError(f"Cannot write video: {output_path}")
+        if start:
+            capture.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+        for index in range(start, end):
+            ok, source = capture.read()
+            if not ok:
+                break
+
+            cv2.resize(source, size, dst=frame, interpolation=cv2.INTER_AREA)
+            row = cursor.at(index / fps)
+            landmarks = (row or {}).get("landmarks")
+            if landmarks is not None and len(landmarks):
+                renderer.render(landmarks, frame, out=frame)
+            labels = list(issues) + list((row or {}).get("issues") or [])
+            if labels:
+                draw_issues(frame, labels)
+
+            writer.write(frame)
+            written += 1
+            if progress is not None and written % progress_every == 0:
+                progress(written, total)
+    finally:
+        capture.release()
+        writer.release()
+
+    if progress is not None:
+        progress(written, total)
+    return written
+
+
+def concat_chunks(chunk_paths: Sequence[str], output_path: str, remove: bool = True) -> int:
+    """
+    Concatenate rendered chunks (same size and fps) into one MP4
+
+    Returns:
+        Number of frames written
+    """
+    writer = None
+    written = 0
+    try:
+        for path in chunk_paths:
+            capture = cv2.VideoCapture(path)
+            try:
+                if writer is None:
+                    size = (
+                        int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                        int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                    )
+                    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+                    writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*FOURCC), fps, size)
+                while True:
+                    ok, frame = capture.read()
+                    if not ok:
+                        break
+                    writer.write(frame)
+                    written += 1
+            finally:
+                capture.release()
+    finally:
+        if writer is not None:
+            writer.release()
+
+    if remove:
+        for path in chunk_paths:
+            if os.path.exists(path):
+                os.remove(path)
+    return written
@@ -2,11 +2,21 @@
 Asynchronous tasks for pose detection and analysis
 """
 from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.db import base  # noqa: F401 - registers all models for the archive job's queries
 from app.services.pose_detector import PoseDetector
 from app.services.posture_analyzer import PostureAnalyzer
+from app.services.image_decoder import decode_image
+from app.services.skeleton_renderer import SkeletonRenderer
+from app.models.pose_session import PoseSession
+from app.services.video_export import render_chunk, concat_chunks, frame_rows, video_info
+from app.services.session_archive import archive_sessions, session_frames_between
 from app.core.logger import log as logger
-import numpy as np
-import cv2
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+import asyncio
 import base64
 
 @celery_app.task(name="detect_pose_task")
@@ -18,8 +28,7 @@ def detect_pose_task(image_b64: str):
     try:
         # Decode image
         encoded_data = image_b64.split(',')[1] if ',' in image_b64 else image_b64
-        nparr = np.frombuffer(base64.b64decode(encoded_data), np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        image = decode_image(base64.b64decode(encoded_data), settings.DECODE_MIN_SIDE)
         
         if image is None:
             logger.error("Failed to decode image in task")
@@ -54,3 +63,112 @@ def analyze_posture_task(landmarks_3d: list):
     except Exception as e:
         logger.exception(f"Error in analyze_posture_task: {e}")
         return {"error": str(e)}
+
+@celery_app.task(name="render_skeleton_task")
+def render_skeleton_task(landmarks_3d: list, image_b64: str = None, width: int = None, quality: int = 80):
+    """
+    Task to render a skeleton overlay as a base64 encoded JPEG
+    """
+    logger.info("Task started: render_skeleton_task")
+    try:
+        image = None
+        if image_b64:
+            encoded_data = image_b64.split(',')[1] if ',' in image_b64 else image_b64
+            image = decode_image(base64.b64decode(encoded_data))
+            if image is None:
+                return {"error": "Invalid image"}
+
+        jpeg = SkeletonRenderer().render_jpeg(landmarks_3d, image, width=width, quality=quality)
+        return {
+            "image": base64.b64encode(jpeg).decode('utf-8'),
+            "media_type": "image/jpeg"
+        }
+    except Exception as e:
+        logger.exception(f"Error in render_skeleton_task: {e}")
+        return {"error": str(e)}
+
+@celery_app.task(bind=True, name="render_video_chunk_task")
+def render_video_chunk_task(
+    self,
+    video_path: str,
+    session_id: int,
+    start: int,
+    end: int,
+    output_path: str,
+    max_width: int = None,
+    issues: list = None,
+    snapshot: list = None
+):
+    """
+    Task to render one chunk of an annotated video export
+
+    The chunk's timeline range is read here, so only frame numbers go
+    through the broker; `snapshot` rows are used instead for sessions
+    without a timeline.
+    """
+    logger.info(f"Task started: render_video_chunk_task [{start}, {end})")
+    rows = snapshot
+    if rows is None:
+        fps = video_info(video_path)["fps"]
+        rows = asyncio.run(_chunk_timeline(session_id, start / fps, end / fps))
+
+    def report(done, total):
+        self.update_state(state="PROGRESS", meta={"done": done, "total": total})
+
+    frames = render_chunk(
+        video_path, rows, start, end, output_path,
+        max_width=max_width, issues=issues or (), progress=report
+    )
+    return {"path": output_path, "frames": frames, "total": end - start}
+
+@celery_app.task(name="concat_video_chunks_task")
+def concat_video_chunks_task(chunk_results: list, output_path: str):
+    """
+    Task to join rendered chunks (in order) into the final export
+    """
+    logger.info("Task started: concat_video_chunks_task")
+    frames = concat_chunks([chunk["path"] for chunk in chunk_results], output_path)
+    return {"path": output_path, "frames": frames}
+
+@celery_app.task(name="archive_sessions_task", time_limit=3600)
+def archive_sessions_task(retention_days: int = None):
+    """
+    Task to move sessions older than the retention window to cold storage
+    """
+    logger.info("Task started: archive_sessions_task")
+    retention_days = retention_days or settings.SESSION_RETENTION_DAYS
+    stats = asyncio.run(_archive_sessions(datetime.utcnow() - timedelta(days=retention_days)))
+    logger.info(f"Archived {stats['sessions']} sessions into {stats['files']} files")
+    return stats
+
+@asynccontextmanager
+async def _task_db():
+    # A private engine: pooled asyncpg connections cannot outlive this event loop
+    engine = create_async_engine(
+        settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
+        poolclass=NullPool
+    )
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            yield db
+    finally:
+        await engine.dispose()
+
+async def _chunk_timeline(session_id: int, start_time: float, end_time: float) -> list:
+    async with _task_db() as db:
+        session = await db.get(PoseSession, session_id)
+        if session is None:
+            return []
+        # Look back so the first frames of the range have the preceding pose
+        frames = await session_frames_between(db, session, start_time - 1.0, end_time)
+    return frame_rows(frames, start_time, end_time)
+
+async def _archive_sessions(cutoff: datetime) -> dict:
+    async with _task_db() as db:
+        return await archive_sessions(
+            db,
+            cutoff,
+            settings.ARCHIVE_DIR,
+            settings.ARCHIVE_BATCH_SESSIONS,
+            settings.LANDMARK_STORAGE_DTYPE
+        )
@@ -0,0 +1,69 @@
+"""
+Backfill the typed posture metric columns from the angles JSON
+
+Adds the metric columns and their indexes if missing, then copies values
+out of posture_analyses.angles in id-range batches, entirely in SQL.
+Rows written since the columns were added already have them set.
+
+    python backfill_posture_metrics.py [--batch-size 5000]
+"""
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from sqlalchemy import case, func, select, update
+
+from app.db.base import Base
+from app.db.migrations import add_missing_columns, create_missing_indexes
+from app.db.session import engine
+from app.models.posture_analysis import METRIC_COLUMNS, PostureAnalysis
+
+from loguru import logger
+
+
+def _metric_from_json(name: str):
+    """(angles->>'name')::float for numeric JSON values, NULL otherwise"""
+    value = PostureAnalysis.angles[name]
+    return case((func.json_typeof(value) == "number", value.as_float()), else_=None)
+
+
+async def backfill_posture_metrics(batch_size: int = 5000):
+    logger.info("📊 Backfilling typed posture metric columns...")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(add_missing_columns)
+        await conn.run_sync(create_missing_indexes)
+
+    async with engine.connect() as conn:
+        max_id = (await conn.execute(select(func.max(PostureAnalysis.id)))).scalar() or 0
+
+    values = {name: _metric_from_json(name) for name in METRIC_COLUMNS}
+    pending = PostureAnalysis.angles.is_not(None), *(getattr(PostureAnalysis, name).is_(None) for name in METRIC_COLUMNS)
+
+    updated = 0
+    for first_id in range(0, max_id, batch_size):
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                update(PostureAnalysis)
+                .where(
+                    PostureAnalysis.id > first_id,
+                    PostureAnalysis.id <= first_id + batch_size,
+                    *pending
+                )
+                .values(**values)
+            )
+        updated += result.rowcount
+        logger.info(f"ℹ️ Backfilled {updated} analyses (up to id {min(first_id + batch_size, max_id)})")
+
+    logger.success(f"✅ Posture metric backfill complete: {updated} analyses")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(backfill_posture_metrics(args.batch_size))
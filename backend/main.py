@@ -1,15 +1,20 @@
 """
 Main FastAPI application entry point
 """
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import time
 
 from app.core.config import settings
 from app.api.v1.router import api_router
-from app.db.session import engine
+from app.db.session import engine, AsyncSessionLocal
 from app.db.base import Base
+from app.db.migrations import add_missing_columns, create_missing_indexes
+from app.db.pagination import NEXT_CURSOR_HEADER
+from app.api.deps import get_exercise_catalog, get_password_hasher
+from app.services.session_archive import ArchiveUnavailable
 from app.core.logger import setup_logging, log as logger
 
 
@@ -23,9 +28,14 @@ async def lifespan(app: FastAPI):
     # Create database tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(add_missing_columns)
+        await conn.run_sync(create_missing_indexes)
+    async with AsyncSessionLocal() as db:
+        await get_exercise_catalog().refresh(db)
     yield
     # Shutdown
     logger.info("👋 Shutting down...")
+    get_password_hasher().shutdown()
 
 
 app = FastAPI(
@@ -48,6 +58,15 @@ async def log_requests(request: Request, call_next):
     )
     return response
 
+@app.exception_handler(ArchiveUnavailable)
+async def archive_unavailable(request: Request, exc: ArchiveUnavailable):
+    """Archived session data that can no longer be read is gone, not a server error"""
+    logger.warning(str(exc))
+    return JSONResponse(
+        status_code=status.HTTP_410_GONE,
+        content={"detail": "Archived session data is no longer available"}
+    )
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -55,6 +74,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include API router
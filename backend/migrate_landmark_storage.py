@@ -0,0 +1,121 @@
+"""
+Migrate pose session landmarks from JSON to packed binary storage
+
+Adds the landmarks_3d_packed / landmarks_2d_packed columns (and the
+timeline keyframe columns) if missing, then converts existing rows in
+batches. Packed values use LANDMARK_STORAGE_DTYPE (float16 by default), so
+the full-precision JSON copies are kept for a rollback; pass --drop-json to
+clear them and reclaim space once the packed data has been checked. Reads
+prefer the packed columns either way.
+
+    python migrate_landmark_storage.py [--batch-size 500] [--drop-json]
+"""
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from sqlalchemy import String, bindparam, cast, func, null, select, text, update
+
+from app.db import base  # noqa: F401 - registers all models for relationship setup
+from app.db.session import AsyncSessionLocal, engine
+from app.db.types import LandmarkArray
+from app.models.pose_session import PoseSession
+from app.services.landmarks import landmarks_to_array
+
+from loguru import logger
+
+ADD_COLUMNS = [
+    "ALTER TABLE pose_sessions ADD COLUMN IF NOT EXISTS landmarks_3d_packed BYTEA",
+    "ALTER TABLE pose_sessions ADD COLUMN IF NOT EXISTS landmarks_2d_packed BYTEA",
+    "ALTER TABLE IF EXISTS pose_frame_chunks ADD COLUMN IF NOT EXISTS keyframe_offsets BYTEA",
+    "ALTER TABLE IF EXISTS pose_frame_chunks ADD COLUMN IF NOT EXISTS max_error FLOAT NOT NULL DEFAULT 0",
+]
+
+
+def _convert(value):
+    return landmarks_to_array(value) if value else None
+
+
+def migration_statement(drop_json: bool = False):
+    """
+    UPDATE packing one row's JSON landmarks (params: row_id, packed_3d, packed_2d)
+
+    A packed value is never replaced with NULL.
+    """
+    table = PoseSession.__table__
+    values = {
+        "landmarks_3d_packed": func.coalesce(bindparam("packed_3d", type_=LandmarkArray()), table.c.landmarks_3d_packed),
+        "landmarks_2d_packed": func.coalesce(bindparam("packed_2d", type_=LandmarkArray()), table.c.landmarks_2d_packed),
+    }
+    if drop_json:
+        values.update({"landmarks_3d": null(), "landmarks_2d": null()})
+    return update(table).where(table.c.id == bindparam("row_id")).values(**values)
+
+
+def pending_filter(drop_json: bool = False) -> list:
+    """WHERE clauses selecting rows that still hold JSON landmarks to migrate"""
+    # Rows written before the JSON columns stored None as SQL NULL hold the JSON literal 'null'
+    pending = [
+        PoseSession.landmarks_3d_json.is_not(None),
+        cast(PoseSession.landmarks_3d_json, String) != 'null',
+    ]
+    # With --drop-json, rows packed by an earlier run are revisited to clear their JSON
+    if not drop_json:
+        pending.append(PoseSession.landmarks_3d_packed.is_(None))
+    return pending
+
+
+def migration_params(rows) -> list:
+    """Statement parameters for (id, landmarks_3d_json, landmarks_2d_json) rows"""
+    return [
+        {"row_id": row_id, "packed_3d": _convert(landmarks_3d), "packed_2d": _convert(landmarks_2d)}
+        for row_id, landmarks_3d, landmarks_2d in rows
+    ]
+
+
+async def migrate_landmark_storage(batch_size: int = 500, drop_json: bool = False):
+    logger.info("📦 Migrating pose session landmarks to packed storage...")
+    async with engine.begin() as conn:
+        for statement in ADD_COLUMNS:
+            await conn.execute(text(statement))
+
+    statement = migration_statement(drop_json)
+    pending = pending_filter(drop_json)
+
+    last_id = 0
+    migrated = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(PoseSession.id, PoseSession.landmarks_3d_json, PoseSession.landmarks_2d_json)
+                .where(PoseSession.id > last_id, *pending)
+                .order_by(PoseSession.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            await session.execute(statement, migration_params(rows))
+            await session.commit()
+
+        last_id = rows[-1][0]
+        migrated += len(rows)
+        logger.info(f"ℹ️ Migrated {migrated} sessions (last id {last_id})")
+
+    logger.success(f"✅ Landmark migration complete: {migrated} sessions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--drop-json", action="store_true",
+        help="clear the JSON copies after packing (irreversible: packed data may be float16)"
+    )
+    args = parser.parse_args()
+    asyncio.run(migrate_landmark_storage(args.batch_size, args.drop_json))
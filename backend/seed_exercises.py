@@ -78,6 +78,57 @@ EXERCISES = [
         "repetitions": 12,
         "sets": 3,
         "tags": ["rounded_shoulders", "kyphosis", "upper_back"]
+    },
+    {
+        "name": "Side Plank",
+        "description": "Builds lateral core strength to counter a sideways lean of the spine.",
+        "category": "strengthening",
+        "difficulty": "intermediate",
+        "target_areas": ["core", "spine", "hips"],
+        "instructions": [
+            "Lie on your side with your elbow directly under your shoulder.",
+            "Lift your hips so your body forms a straight line from head to feet.",
+            "Hold for 20-30 seconds without letting your hips sag.",
+            "Switch sides and repeat."
+        ],
+        "duration_minutes": 5,
+        "repetitions": 1,
+        "sets": 3,
+        "tags": ["lateral_lean", "scoliosis", "core"]
+    },
+    {
+        "name": "Clamshells",
+        "description": "Strengthens the hip abductors to level the pelvis and balance the hips.",
+        "category": "strengthening",
+        "difficulty": "beginner",
+        "target_areas": ["hips", "lower back"],
+        "instructions": [
+            "Lie on your side with your knees bent and feet together.",
+            "Keeping your feet touching, lift your top knee as far as is comfortable.",
+            "Pause, then lower slowly.",
+            "Repeat 15 times, then switch sides."
+        ],
+        "duration_minutes": 5,
+        "repetitions": 15,
+        "sets": 3,
+        "tags": ["hip_asymmetry", "hip_imbalance"]
+    },
+    {
+        "name": "Single-Arm Farmer's Carry",
+        "description": "Trains the shoulder and trunk stabilizers one side at a time to even out shoulder height.",
+        "category": "strengthening",
+        "difficulty": "intermediate",
+        "target_areas": ["shoulders", "core"],
+        "instructions": [
+            "Hold a weight in one hand at your side.",
+            "Stand tall with both shoulders level and walk 20-30 steps.",
+            "Do not lean toward or away from the weight.",
+            "Switch hands and repeat."
+        ],
+        "duration_minutes": 5,
+        "repetitions": 1,
+        "sets": 3,
+        "tags": ["shoulder_asymmetry", "shoulder_imbalance", "core"]
     }
 ]
 
@@ -0,0 +1,107 @@
+"""
+Unit tests for landmark validation and the analysis pipeline
+"""
+import pytest
+import numpy as np
+from app.services.analysis_pipeline import AnalysisPipeline
+from app.services.landmarks import landmarks_from_flat, landmarks_to_dicts
+
+@pytest.fixture
+def pipeline():
+    return AnalysisPipeline()
+
+@pytest.fixture
+def standing_points():
+    """Flat (33, 4) array of a simple standing pose"""
+    points = np.zeros((33, 4))
+    points[:, 3] = 0.9
+    points[0, :3] = [0.5, 0.1, 0.0]
+    points[2, :3] = [0.48, 0.09, 0.0]
+    points[5, :3] = [0.52, 0.09, 0.0]
+    points[7, :3] = [0.46, 0.1, 0.0]
+    points[11, :3] = [0.4, 0.3, 0.0]
+    points[12, :3] = [0.6, 0.3, 0.0]
+    points[13, :3] = [0.4, 0.45, 0.0]
+    points[14, :3] = [0.6, 0.45, 0.0]
+    points[23, :3] = [0.45, 0.55, 0.0]
+    points[24, :3] = [0.55, 0.55, 0.0]
+    points[25, :3] = [0.45, 0.75, 0.0]
+    points[26, :3] = [0.55, 0.75, 0.0]
+    points[27, :3] = [0.45, 0.95, 0.0]
+    points[28, :3] = [0.55, 0.95, 0.0]
+    return points
+
+def test_landmarks_from_flat_shapes(standing_points):
+    """Both xyz and xyz+visibility layouts are accepted"""
+    assert landmarks_from_flat(standing_points.ravel()).shape == (33, 4)
+
+    xyz = landmarks_from_flat(standing_points[:, :3].ravel())
+    assert xyz.shape == (33, 4)
+    assert np.all(xyz[:, 3] == 1.0)
+
+def test_landmarks_from_flat_rejects_invalid():
+    """Wrong lengths and non-finite values are rejected"""
+    with pytest.raises(ValueError):
+        landmarks_from_flat([0.0] * 10)
+
+    values = [0.0] * 132
+    values[5] = float('nan')
+    with pytest.raises(ValueError):
+        landmarks_from_flat(values)
+
+def test_pipeline_array_matches_dicts(pipeline, standing_points):
+    """Array input produces the same analysis as the dict format"""
+    from_array = pipeline.run(standing_points, 'squat')
+    from_dicts = pipeline.run(landmarks_to_dicts(standing_points), 'squat')
+
+    assert from_array == from_dicts
+    assert from_array['detected_activity'] == 'Standing'
+    assert from_array['exercise_analysis']['exercise'] == 'squat'
+
+def test_pipeline_posture_stage(pipeline, standing_points):
+    """Posture analysis runs without server inference"""
+    result = pipeline.run(standing_points, 'posture')
+    assert 'posture_score' in result['posture_analysis']
+
+def test_packed_session_payload(standing_points):
+    """Packed base64 float32 landmarks decode straight to an array"""
+    import base64
+    from pydantic import ValidationError
+    from app.schemas.pose import PoseSessionCreate
+
+    data = base64.b64encode(standing_points.astype('<f4').tobytes()).decode()
+    session = PoseSessionCreate(
+        session_type="upload",
+        landmarks_3d_packed={"shape": [33, 4], "data": data},
+        confidence_score=0.9
+    )
+    points = session.landmarks_3d_packed.to_numpy()
+    assert points.shape == (33, 4)
+    assert np.allclose(points, standing_points)
+
+    with pytest.raises(ValidationError):
+        PoseSessionCreate(
+            session_type="upload",
+            landmarks_3d_packed={"shape": [33, 4], "data": [0.0] * 10},
+            confidence_score=0.9
+        )
+
+def test_session_landmark_dicts_are_validated():
+    """Malformed landmark dicts are a validation error (422), not a failure when packing"""
+    from pydantic import ValidationError
+    from app.schemas.pose import PoseSessionCreate
+
+    session = PoseSessionCreate(
+        session_type="upload",
+        landmarks_3d=[{'x': 0.1, 'y': 0.2}, {'x': 1, 'y': 0, 'z': None, 'visibility': 0.5}],
+        confidence_score=0.9
+    )
+    assert len(session.landmarks_3d) == 2
+
+    for landmarks in ([{'y': 1}], [{'x': 'a', 'y': 1}], [{'x': 0, 'y': 0, 'z': [1]}], [{'x': True, 'y': 0}]):
+        with pytest.raises(ValidationError):
+            PoseSessionCreate(session_type="upload", landmarks_3d=landmarks, confidence_score=0.9)
+        with pytest.raises(ValidationError):
+            PoseSessionCreate(
+                session_type="upload", landmarks_3d=[{'x': 0, 'y': 0}], landmarks_2d=landmarks, confidence_score=0.9
+            )
@@ -0,0 +1,78 @@
+"""
+Unit tests for the in-memory exercise catalog
+"""
+from email.utils import format_datetime
+from datetime import timedelta
+
+from app.services.exercise_catalog import ExerciseCatalog
+
+
+def _record(exercise_id, category="stretching", difficulty="beginner", tags=(), areas=(), active=True):
+    return {
+        "id": exercise_id, "name": f"Exercise {exercise_id}", "description": "", "category": category,
+        "difficulty": difficulty, "target_areas": list(areas), "instructions": [], "duration_minutes": 5,
+        "repetitions": None, "sets": None, "video_url": None, "thumbnail_url": None,
+        "is_active": active, "tags": list(tags),
+    }
+
+
+def _catalog():
+    catalog = ExerciseCatalog()
+    catalog.load([
+        _record(1, tags=["forward_head", "posture"], areas=["neck", "upper back"]),
+        _record(2, category="strengthening", tags=["posture"], areas=["core"]),
+        _record(3, difficulty="advanced", tags=["Posture", "rounded_shoulders"], areas=["chest"]),
+        _record(4, tags=["posture"], active=False),
+    ])
+    return catalog
+
+
+def test_filters_intersect_indexes_case_insensitively():
+    catalog = _catalog()
+
+    assert [r["id"] for r in catalog.filter()] == [1, 2, 3]
+    assert [r["id"] for r in catalog.filter(tags=["POSTURE"])] == [1, 2, 3]
+    assert [r["id"] for r in catalog.filter(category="stretching", tags=["posture"])] == [1, 3]
+    assert [r["id"] for r in catalog.filter(tags=["posture", "forward_head"], target_areas=["neck"])] == [1]
+    assert catalog.filter(tags=["unknown"]) == []
+    assert [r["id"] for r in catalog.filter(limit=2)] == [1, 2]
+
+
+def test_upsert_reindexes_and_changes_etag():
+    catalog = _catalog()
+    etag = catalog.etag
+
+    catalog.upsert(_record(2, category="mobility", tags=["hips"]))
+    assert [r["id"] for r in catalog.filter(category="mobility")] == [2]
+    assert "strengthening" not in catalog.indexes["category"]
+    assert [r["id"] for r in catalog.filter(tags=["posture"])] == [1, 3]
+    assert catalog.etag != etag
+
+    changed = catalog.etag
+    catalog.upsert(_record(2, category="mobility", tags=["hips"]))
+    assert catalog.etag == changed
+
+
+def test_etag_depends_only_on_content():
+    first, second = _catalog(), _catalog()
+    assert first.etag == second.etag
+
+    etag = first.etag
+    first.load(list(first.records.values()))
+    assert first.etag == etag
+    first.load([_record(1)])
+    assert first.etag != etag and sorted(first.records) == [1]
+
+
+def test_conditional_requests():
+    catalog = _catalog()
+    modified = format_datetime(catalog.last_modified, usegmt=True)
+    earlier = format_datetime(catalog.last_modified - timedelta(seconds=5), usegmt=True)
+
+    assert catalog.not_modified(catalog.etag, None)
+    assert catalog.not_modified(f'"other", W/{catalog.etag}', None)
+    assert not catalog.not_modified('"other"', modified)
+    assert catalog.not_modified(None, modified)
+    assert not catalog.not_modified(None, earlier)
+    assert not catalog.not_modified(None, "not a date")
+    assert catalog.validators()["ETag"] == catalog.etag
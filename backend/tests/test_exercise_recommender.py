@@ -0,0 +1,50 @@
+"""
+Unit tests for issue → exercise recommendations
+"""
+from app.services.exercise_catalog import ExerciseCatalog
+from app.services.exercise_recommender import ExerciseRecommender
+
+from tests.test_exercise_catalog import _record
+
+FORWARD_HEAD = {'name': 'Forward Head Posture', 'severity': 'high', 'affected_joints': ['neck', 'upper_back']}
+HIP_ASYMMETRY = {'name': 'Hip Asymmetry', 'severity': 'low', 'affected_joints': ['hips', 'lower_back']}
+
+
+def _recommender():
+    catalog = ExerciseCatalog()
+    catalog.load([
+        _record(1, tags=["forward_head", "neck_pain"], areas=["neck", "upper back"]),
+        _record(2, tags=["rounded_shoulders"], areas=["upper back", "shoulders"]),
+        _record(3, difficulty="advanced", tags=["forward_head"], areas=["neck"]),
+        _record(4, tags=["hip_asymmetry"], areas=["hips"]),
+        _record(5, tags=["forward_head", "neck_pain"], areas=["neck"], active=False),
+    ])
+    return catalog, ExerciseRecommender(catalog, limit=3)
+
+
+def test_ranks_tagged_exercises_above_area_matches():
+    _, recommender = _recommender()
+
+    assert recommender.recommend([FORWARD_HEAD]) == [1, 3, 2]
+    assert recommender.recommend([HIP_ASYMMETRY]) == [4]
+    assert recommender.recommend([FORWARD_HEAD, HIP_ASYMMETRY], limit=10) == [1, 3, 4, 2]
+    assert recommender.recommend([]) == []
+    assert recommender.recommend([{'name': 'Unknown Issue'}]) == []
+
+
+def test_catalog_changes_update_only_affected_entries():
+    catalog, recommender = _recommender()
+    recommender.recommend([FORWARD_HEAD, HIP_ASYMMETRY])
+    hip_candidates = recommender._issue_cache['Hip Asymmetry']
+
+    catalog.upsert(_record(6, tags=["forward_head", "neck_pain"], areas=["neck", "upper back"]))
+    assert recommender._issue_cache['Hip Asymmetry'] is hip_candidates
+    assert 'Forward Head Posture' not in recommender._issue_cache
+    assert recommender.recommend([FORWARD_HEAD]) == [1, 6, 3]
+
+    catalog.upsert(_record(1, tags=["forward_head", "neck_pain"], areas=["neck"], active=False))
+    assert recommender.recommend([FORWARD_HEAD]) == [6, 3, 2]
+
+    catalog.load([record for record in catalog.records.values() if record['id'] != 6])
+    assert 6 not in recommender.tag_index.get('forward_head', set())
+    assert recommender.recommend([FORWARD_HEAD]) == [3, 2]
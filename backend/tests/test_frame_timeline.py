@@ -0,0 +1,139 @@
+"""
+Unit tests for chunked session frame timelines
+"""
+import time
+import pytest
+import numpy as np
+from app.db import base  # noqa: F401
+from app.db.types import LandmarkArray
+from app.services.frame_timeline import (
+    chunk_rows, assemble_frames, frame_timestamps, range_conflict, timeline_stats, FRAMES_PER_CHUNK
+)
+
+def _stored(rows, dtype='float32'):
+    """Round-trip rows through the column type as the database would"""
+    column = LandmarkArray(dtype)
+    return [
+        (
+            row["start_frame"],
+            row["frame_count"],
+            column.process_result_value(column.process_bind_param(row["landmarks"], None), None),
+            row["timestamps"],
+            row["keyframe_offsets"]
+        )
+        for row in rows
+    ]
+
+@pytest.fixture
+def timeline():
+    rng = np.random.default_rng(0)
+    landmarks = rng.random((1000, 33, 4)).astype(np.float32)
+    return landmarks, frame_timestamps(len(landmarks), 30.0)
+
+def test_chunk_rows(timeline):
+    landmarks, timestamps = timeline
+    rows = chunk_rows(7, landmarks, timestamps, start_frame=100)
+    assert len(rows) == -(-1000 // FRAMES_PER_CHUNK)
+    assert rows[1]["start_frame"] == 100 + FRAMES_PER_CHUNK
+    assert sum(row["frame_count"] for row in rows) == 1000
+    assert rows[1]["start_time"] == pytest.approx(FRAMES_PER_CHUNK / 30)
+
+    with pytest.raises(ValueError):
+        chunk_rows(7, landmarks, timestamps[:-1])
+
+def test_assemble_frame_range(timeline):
+    """Range reads trim chunks to [start, end) by frame or by time"""
+    landmarks, timestamps = timeline
+    stored = _stored(chunk_rows(7, landmarks, timestamps))
+
+    frames = assemble_frames(stored, start=250, end=600)
+    assert frames.landmarks.shape == (350, 33, 4)
+    assert frames.frame_indices[0] == 250
+    assert np.array_equal(frames.landmarks, landmarks[250:600])
+
+    frames = assemble_frames(stored, start_time=1.0, end_time=2.0)
+    assert frames.frame_indices.tolist() == list(range(30, 60))
+
+    assert assemble_frames([]).landmarks.shape == (0, 33, 4)
+
+def test_long_recording_ingest_is_fast():
+    """A 30-minute 30 fps recording chunks, packs and decodes well within seconds"""
+    landmarks = np.random.default_rng(1).random((30 * 60 * 30, 33, 3)).astype(np.float32)
+    begin = time.perf_counter()
+    rows = chunk_rows(1, landmarks, frame_timestamps(len(landmarks), 30.0))
+    frames = assemble_frames(_stored(rows))
+    assert time.perf_counter() - begin < 5.0
+    assert frames.landmarks.shape == (54000, 33, 4)
+    assert (frames.landmarks[:, :, 3] == 1.0).all()
+
+def test_compressed_chunks_reconstruct_within_tolerance():
+    """A mostly static session stores few keyframes and reads back densely within the bound"""
+    rng = np.random.default_rng(2)
+    frames = 3000
+    base_pose = rng.uniform(0.3, 0.7, size=(33, 4)).astype(np.float32)
+    base_pose[:, 3] = 0.9
+    landmarks = np.repeat(base_pose[None], frames, axis=0)
+    landmarks[:, :, :3] += rng.normal(0, 0.0005, size=(frames, 33, 3))  # detector jitter
+    landmarks[1500:1530, 15, 1] += np.linspace(0, 0.2, 30)[:, None].ravel()  # one arm movement
+    landmarks[1530:, 15, 1] += 0.2
+    timestamps = frame_timestamps(frames, 30.0)
+
+    rows = chunk_rows(1, landmarks, timestamps, tolerance=0.005, max_gap=30)
+    stats = timeline_stats(rows)
+    assert stats["frames"] == frames
+    assert stats["compression_ratio"] >= 10
+    assert stats["max_error"] <= 0.005
+
+    dense = assemble_frames(_stored(rows))
+    assert dense.landmarks.shape == (frames, 33, 4)
+    assert np.abs(dense.landmarks[..., :3] - landmarks[..., :3]).max() <= 0.005 + 1e-6
+    assert np.allclose(dense.timestamps, timestamps)
+
+def test_error_bound_holds_after_default_storage():
+    """max_error covers float16 quantization of the default column type"""
+    from app.core.config import settings
+    assert settings.LANDMARK_STORAGE_DTYPE == 'float16'
+
+    rng = np.random.default_rng(3)
+    frames = 600
+    t = frame_timestamps(frames, 30.0)
+    landmarks = np.empty((frames, 33, 4), dtype=np.float32)
+    landmarks[..., :3] = 0.5 + 0.3 * np.sin(2 * t)[:, None, None] * rng.uniform(0.5, 1.5, size=(33, 3))
+    landmarks[..., :3] += rng.normal(0, 0.001, size=(frames, 33, 3))
+    landmarks[..., 3] = 0.9
+
+    rows = chunk_rows(1, landmarks, t, tolerance=0.005)
+    dense = assemble_frames(_stored(rows, dtype=None))
+    error = np.abs(dense.landmarks[..., :3] - landmarks[..., :3]).max()
+    assert error <= timeline_stats(rows)["max_error"] + 1e-7
+    assert timeline_stats(rows)["max_error"] <= 0.005
+
+    dense_rows = chunk_rows(1, landmarks, t)
+    stored = assemble_frames(_stored(dense_rows, dtype=None))
+    assert timeline_stats(dense_rows)["max_error"] == pytest.approx(
+        np.abs(stored.landmarks[..., :3] - landmarks[..., :3]).max()
+    )
+
+def test_new_frames_must_not_overlap_or_reorder_stored_frames():
+    """Only batches that extend the timeline in frame and time order are accepted"""
+    stored = [(0, 300, 0.0, 299 / 30), (600, 100, 20.0, 23.3)]
+
+    assert range_conflict([], 0, 300, 0.0, 10.0) is None
+    assert range_conflict(stored, 300, 300, 10.0, 19.9) is None
+    assert range_conflict(stored, 700, 10, 23.4, 24.0) is None
+    assert "overlap" in range_conflict(stored, 100, 300, 10.0, 19.9)
+    assert "overlap" in range_conflict(stored, 550, 100, 18.0, 19.9)
+    assert "precede" in range_conflict(stored, 300, 300, 5.0, 19.9)
+    assert "follow" in range_conflict(stored, 300, 300, 10.0, 21.0)
+
+def test_frame_batches_need_ordered_finite_timestamps():
+    from pydantic import ValidationError
+    from app.schemas.pose import PoseFramesCreate
+
+    landmarks = {"shape": [3, 33, 4], "data": [0.5] * (3 * 33 * 4)}
+    assert PoseFramesCreate(landmarks=landmarks, timestamps=[0.0, 0.0, 0.1])
+    for timestamps in ([0.0, 0.2, 0.1], [0.0, float('nan'), 0.2], [0.0, 0.1, float('inf')]):
+        with pytest.raises(ValidationError):
+            PoseFramesCreate(landmarks=landmarks, timestamps=timestamps)
+    with pytest.raises(ValidationError):
+        PoseFramesCreate(landmarks=landmarks, fps=float('nan'))
@@ -0,0 +1,119 @@
+"""
+Unit tests for streaming history export
+"""
+import asyncio
+import csv
+import gzip
+import io
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+
+from app.services import history_export
+from app.services.frame_timeline import FrameRange
+from app.services.history_export import (
+    CsvWriter, NdjsonWriter, ParquetWriter, export_history, frame_records, validate_export
+)
+
+
+def _frames(count=3):
+    return FrameRange(
+        np.arange(10, 10 + count),
+        np.arange(count) / 30.0,
+        np.random.default_rng(0).random((count, 33, 4)).astype(np.float32)
+    )
+
+
+def _analysis(i):
+    return {
+        'id': i, 'pose_session_id': 1, 'posture_score': 80.0 + i, 'severity': 'low',
+        'issues_detected': [{'name': 'Forward Head Posture'}], 'angles': {'neck_forward': 65.0},
+        'deviations': {}, 'recommendations': 'Stretch', 'recommended_exercises': [1, 2],
+        'created_at': datetime(2024, 1, 1, 12, i),
+    }
+
+
+def test_validate_export():
+    validate_export('ndjson', ['sessions', 'analyses', 'frames'])
+    validate_export('csv', ['analyses'])
+    for fmt, datasets in [('xml', ['sessions']), ('ndjson', ['users']), ('csv', ['sessions', 'analyses']), ('ndjson', [])]:
+        with pytest.raises(ValueError):
+            validate_export(fmt, datasets)
+
+
+def test_ndjson_lines_are_typed_records():
+    data = NdjsonWriter().write('frames', list(frame_records(7, _frames())))
+    lines = [json.loads(line) for line in data.splitlines()]
+    assert [line['frame'] for line in lines] == [10, 11, 12]
+    assert lines[0]['type'] == 'frames' and lines[0]['session_id'] == 7
+    assert np.array(lines[0]['landmarks']).shape == (33, 4)
+
+
+def test_csv_flattens_landmarks_and_nested_values():
+    writer = CsvWriter('frames')
+    text = (writer.write('frames', list(frame_records(7, _frames()))) + writer.close()).decode()
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows[0][:5] == ['session_id', 'frame', 't', 'x0', 'y0']
+    assert len(rows) == 4 and len(rows[1]) == 3 + 33 * 4
+
+    writer = CsvWriter('analyses')
+    rows = list(csv.DictReader(io.StringIO(writer.write('analyses', [_analysis(1)]).decode())))
+    assert json.loads(rows[0]['issues_detected'])[0]['name'] == 'Forward Head Posture'
+    assert rows[0]['created_at'] == '2024-01-01T12:01:00'
+
+
+def test_parquet_reads_back_with_typed_columns():
+    writer = ParquetWriter('frames')
+    data = writer.write('frames', list(frame_records(7, _frames())))
+    data += writer.write('frames', list(frame_records(8, _frames(2))))
+    table = pq.read_table(io.BytesIO(data + writer.close()))
+    assert table.num_rows == 5
+    assert table.column('session_id').to_pylist() == [7, 7, 7, 8, 8]
+    assert np.allclose(table.column('landmarks').to_pylist()[0], _frames().landmarks[0].reshape(-1))
+
+    writer = ParquetWriter('analyses')
+    data = writer.write('analyses', [_analysis(1), _analysis(2)])
+    rows = pq.read_table(io.BytesIO(data + writer.close())).to_pylist()
+    assert rows[1]['created_at'] == datetime(2024, 1, 1, 12, 2)
+    assert json.loads(rows[0]['issues_detected'])[0]['name'] == 'Forward Head Posture'
+    assert json.loads(rows[0]['recommended_exercises']) == [1, 2]
+
+
+def test_export_streams_in_chunks(monkeypatch):
+    batches = 40
+
+    async def fake_records(db, user_id, datasets, batch_size):
+        for i in range(batches):
+            yield 'analyses', [_analysis(i % 60) for _ in range(batch_size)]
+
+    @asynccontextmanager
+    async def fake_session():
+        yield None
+
+    monkeypatch.setattr(history_export, 'iter_records', fake_records)
+    monkeypatch.setattr(history_export, 'AsyncSessionLocal', fake_session)
+
+    async def collect(compress):
+        return [chunk async for chunk in export_history(1, 'ndjson', ['analyses'], compress, batch_size=100)]
+
+    plain = asyncio.run(collect(False))
+    assert len(plain) > 2
+    assert all(len(chunk) < 2 * history_export.CHUNK_BYTES for chunk in plain)
+    assert b''.join(plain).count(b'\n') == batches * 100
+
+    compressed = asyncio.run(collect(True))
+    assert gzip.decompress(b''.join(compressed)) == b''.join(plain)
+
+    async def collect_parquet():
+        return [chunk async for chunk in export_history(1, 'parquet', ['analyses'], batch_size=100)]
+
+    validate_export('parquet', ['analyses'])
+    chunks = asyncio.run(collect_parquet())
+    assert len(chunks) > 1
+    table = pq.read_table(io.BytesIO(b''.join(chunks)))
+    assert table.num_rows == batches * 100
+    assert pq.ParquetFile(io.BytesIO(b''.join(chunks))).num_row_groups == batches
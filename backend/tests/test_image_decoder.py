@@ -0,0 +1,45 @@
+"""
+Unit tests for frame ingest
+"""
+import cv2
+import pytest
+import numpy as np
+from app.services.image_decoder import read_image_size, reduction_factor, decode_image, decode_raw
+
+@pytest.fixture
+def image():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, size=(1080, 1920, 3), dtype=np.uint8)
+
+def test_read_image_size(image):
+    """Dimensions come from the JPEG/PNG header"""
+    jpeg = cv2.imencode('.jpg', image)[1].tobytes()
+    png = cv2.imencode('.png', image[:100, :200])[1].tobytes()
+    assert read_image_size(jpeg) == (1920, 1080)
+    assert read_image_size(png) == (200, 100)
+    assert read_image_size(b'not an image') is None
+
+def test_reduced_decode(image):
+    """Large JPEGs decode at a reduced scale keeping the short side above the minimum"""
+    assert reduction_factor(1920, 1080, 480) == 2
+    assert reduction_factor(640, 480, 480) == 1
+
+    jpeg = cv2.imencode('.jpg', image)[1].tobytes()
+    assert decode_image(jpeg, 480).shape == (540, 960, 3)
+    assert decode_image(jpeg).shape == (1080, 1920, 3)
+    assert decode_image(b'') is None
+
+def test_decode_raw_formats(image):
+    """Raw frames wrap to RGB; YUV converts in one step"""
+    small = image[:480, :640]
+    rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+    assert np.array_equal(decode_raw(rgb.tobytes(), 640, 480, 'rgb24'), rgb)
+    assert np.array_equal(decode_raw(small.tobytes(), 640, 480, 'bgr24'), rgb)
+
+    i420 = cv2.cvtColor(small, cv2.COLOR_BGR2YUV_I420)
+    assert decode_raw(i420.tobytes(), 640, 480, 'i420').shape == (480, 640, 3)
+
+    with pytest.raises(ValueError):
+        decode_raw(rgb.tobytes()[:-1], 640, 480, 'rgb24')
+    with pytest.raises(ValueError):
+        decode_raw(rgb.tobytes(), 640, 480, 'cmyk')
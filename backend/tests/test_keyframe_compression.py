@@ -0,0 +1,43 @@
+"""
+Unit tests for error-bounded keyframe compression
+"""
+import numpy as np
+from app.services.keyframe_compression import select_keyframes, interpolate_keyframes, compress_timeline
+
+def _linear_motion(frames=100):
+    landmarks = np.zeros((frames, 33, 4))
+    landmarks[:, :, 0] = np.linspace(0, 1, frames)[:, None]
+    landmarks[:, :, 3] = 1.0
+    return landmarks, np.arange(frames) / 30.0
+
+def test_linear_motion_keeps_only_anchors():
+    """Perfectly linear motion needs only the periodic anchors"""
+    landmarks, timestamps = _linear_motion()
+    indices = select_keyframes(landmarks, timestamps, max_gap=30)
+    assert indices.tolist() == [0, 30, 60, 90, 99]
+
+def test_direction_change_is_kept():
+    """A turning point that interpolation cannot reproduce becomes a keyframe"""
+    landmarks, timestamps = _linear_motion()
+    landmarks[50:, :, 0] = landmarks[50, 0, 0] - (landmarks[50:, :, 0] - landmarks[50, 0, 0])
+    compressed = compress_timeline(landmarks, timestamps, tolerance=0.001, max_gap=100)
+    assert 50 in compressed.keyframe_indices.tolist()
+    assert compressed.max_error <= 0.001
+
+def test_per_joint_tolerance():
+    """A tighter bound on one joint keeps more frames"""
+    rng = np.random.default_rng(0)
+    landmarks = np.full((60, 33, 4), 0.5)
+    landmarks[:, 0, :3] += rng.normal(0, 0.003, size=(60, 3))
+    timestamps = np.arange(60) / 30.0
+
+    tolerance = np.full(33, 0.02)
+    loose = select_keyframes(landmarks, timestamps, tolerance)
+    tolerance[0] = 0.002
+    tight = select_keyframes(landmarks, timestamps, tolerance)
+    assert len(tight) > len(loose)
+
+def test_interpolate_single_keyframe():
+    times, dense = interpolate_keyframes(np.array([0]), np.ones((1, 33, 4)), np.array([2.0]), 3)
+    assert dense.shape == (3, 33, 4)
+    assert times.tolist() == [2.0, 2.0, 2.0]
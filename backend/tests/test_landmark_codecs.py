@@ -0,0 +1,193 @@
+"""
+Unit tests for landmark response, stream and storage encodings
+"""
+import pytest
+import numpy as np
+from app.services.response_encoding import (
+    negotiate, select_fields, encode_json, encode_packed, decode_packed,
+    MEDIA_JSON, MEDIA_MSGPACK, MEDIA_PACKED
+)
+import json
+from app.services.landmarks import landmarks_to_dicts, pack_landmark_blob, unpack_landmark_blob
+from app.db import base  # noqa: F401
+from app.models.pose_session import PoseSession
+from sqlalchemy.orm import undefer_group
+
+@pytest.fixture
+def payload():
+    rng = np.random.default_rng(0)
+    points = rng.random((33, 4))
+    return {
+        'landmarks_3d': landmarks_to_dicts(points),
+        'landmarks_world': landmarks_to_dicts(points - 0.5),
+        'confidence': 0.8,
+        'detected_activity': 'Standing'
+    }
+
+def test_negotiate():
+    """Accept header picks the best supported format"""
+    assert negotiate(None) == MEDIA_JSON
+    assert negotiate("*/*") == MEDIA_JSON
+    assert negotiate("application/msgpack") == MEDIA_MSGPACK
+    assert negotiate("application/json;q=0.5, application/x-pose-packed") == MEDIA_PACKED
+
+def test_select_fields(payload):
+    """Only requested fields are returned"""
+    selected = select_fields(payload, "landmarks_3d, confidence")
+    assert set(selected) == {'landmarks_3d', 'confidence'}
+    assert select_fields(payload, None) is payload
+
+def test_packed_roundtrip(payload):
+    """Packed float32/float16 payloads decode back to arrays"""
+    decoded = decode_packed(encode_packed(payload, 'float32'))
+    assert decoded['confidence'] == 0.8
+    assert decoded['landmarks_3d'].shape == (33, 4)
+    assert np.allclose(decoded['landmarks_3d'][0], list(payload['landmarks_3d'][0].values()), atol=1e-6)
+
+    half = encode_packed(payload, 'float16')
+    assert len(half) < len(encode_packed(payload, 'float32'))
+    assert np.allclose(decode_packed(half)['landmarks_world'][:, 0],
+                       [lm['x'] for lm in payload['landmarks_world']], atol=1e-3)
+
+def test_packed_smaller_than_json(payload):
+    """Packed format is much smaller than JSON"""
+    assert len(encode_packed(payload)) < len(encode_json(payload)) / 3
+
+def test_delta_codec_error_bound():
+    """Decoded stream stays within the requested precision and uses keyframes"""
+    from app.services.stream_codec import DeltaLandmarkEncoder, DeltaLandmarkDecoder
+
+    rng = np.random.default_rng(1)
+    encoder = DeltaLandmarkEncoder(precision=0.001, keyframe_interval=10)
+    decoder = DeltaLandmarkDecoder()
+
+    points = rng.random((33, 4))
+    keys = []
+    for i in range(25):
+        points = points + rng.normal(scale=0.002, size=points.shape)
+        frame = encoder.encode(points)
+        if frame['key']:
+            keys.append(i)
+        assert np.abs(decoder.decode(frame) - points).max() <= 0.001 + 1e-9
+
+    assert keys == [0, 10, 20]
+
+def test_delta_codec_keyframe_spacing_and_precision_bound():
+    """Keyframes land exactly every keyframe_interval frames; tiny precisions are rejected"""
+    from app.services.stream_codec import DeltaLandmarkEncoder
+
+    encoder = DeltaLandmarkEncoder(precision=0.001, keyframe_interval=5)
+    keys = [i for i in range(20) if encoder.encode(np.full((33, 4), 0.5))['key']]
+    assert keys == [0, 5, 10, 15]
+
+    every_frame = DeltaLandmarkEncoder(keyframe_interval=1)
+    assert all(every_frame.encode(np.zeros((33, 4)))['key'] for _ in range(3))
+
+    for precision in (0, 1e-9, float('nan')):
+        with pytest.raises(ValueError):
+            DeltaLandmarkEncoder(precision=precision)
+
+def test_delta_codec_resync():
+    """A delta without its reference frame is rejected until a keyframe arrives"""
+    from app.services.stream_codec import DeltaLandmarkEncoder, DeltaLandmarkDecoder
+
+    encoder = DeltaLandmarkEncoder(precision=0.01)
+    points = np.zeros((33, 4))
+    encoder.encode(points)
+
+    with pytest.raises(ValueError):
+        DeltaLandmarkDecoder().decode(encoder.encode(points))
+
+    encoder.force_keyframe()
+    assert encoder.encode(points)['key']
+
+def test_landmark_blob_roundtrip(payload):
+    """Stored blobs decode to float32 within the storage precision, far smaller than JSON"""
+    points = np.array([list(lm.values()) for lm in payload['landmarks_3d']])
+
+    half = pack_landmark_blob(payload['landmarks_3d'])
+    assert unpack_landmark_blob(half).dtype == np.float32
+    assert np.allclose(unpack_landmark_blob(half), points, atol=1e-3)
+    assert len(half) * 10 < len(json.dumps(payload['landmarks_3d']))
+
+    full = pack_landmark_blob(points, 'float32')
+    assert np.allclose(unpack_landmark_blob(full), points, atol=1e-7)
+
+    with pytest.raises(ValueError):
+        unpack_landmark_blob(half[:-2])
+    with pytest.raises(ValueError):
+        unpack_landmark_blob(b'{"x": 1}')
+
+def test_pose_session_landmark_storage(payload):
+    """New sessions write the packed column; legacy JSON rows still load as arrays"""
+    session = PoseSession(user_id=1, landmarks_3d=payload['landmarks_3d'])
+    assert session.landmarks_3d_json is None
+    assert session.landmarks_3d.shape == (33, 4)
+
+    legacy = PoseSession(user_id=1, landmarks_3d_json=payload['landmarks_3d'])
+    assert legacy.landmarks_3d.dtype == np.float32
+    assert legacy.landmarks_2d is None
+
+def test_landmark_migration_keeps_rows_written_by_setters(payload):
+    """Rows created through the setters have no JSON to migrate; packed data is never cleared"""
+    from sqlalchemy import JSON, create_engine, select, text, update
+    from sqlalchemy.orm import Session
+    from migrate_landmark_storage import migration_params, migration_statement, pending_filter
+
+    engine = create_engine("sqlite://")
+    PoseSession.__table__.create(engine)
+    with Session(engine) as db:
+        db.add_all([
+            PoseSession(id=1, user_id=1, landmarks_3d=payload['landmarks_3d']),
+            PoseSession(id=2, user_id=1, landmarks_3d_json=payload['landmarks_3d']),
+            PoseSession(id=3, user_id=1, landmarks_3d=payload['landmarks_3d']),
+        ])
+        db.commit()
+        # A row written while None still became the JSON literal 'null'
+        table = PoseSession.__table__
+        db.execute(update(table).where(table.c.id == 3).values(landmarks_3d=JSON.NULL))
+        db.commit()
+
+        stored = db.execute(text("SELECT id, landmarks_3d FROM pose_sessions ORDER BY id")).all()
+        assert stored[0] == (1, None) and stored[2] == (3, 'null')
+
+        for drop_json in (False, True):
+            rows = db.execute(
+                select(PoseSession.id, PoseSession.landmarks_3d_json, PoseSession.landmarks_2d_json)
+                .where(*pending_filter(drop_json))
+            ).all()
+            assert [row[0] for row in rows] == [2]
+            db.execute(migration_statement(drop_json), migration_params(rows + [(3, None, None)]))
+            db.commit()
+
+        db.expire_all()
+        sessions = db.scalars(
+            select(PoseSession).options(undefer_group("landmarks")).order_by(PoseSession.id)
+        ).all()
+        for session in sessions:
+            assert session.landmarks_3d_packed is not None
+            assert np.allclose(session.landmarks_3d, np.array([list(lm.values()) for lm in payload['landmarks_3d']]), atol=1e-3)
+        assert sessions[1].landmarks_3d_json is None
+
+def test_session_list_query_skips_landmarks():
+    """Landmark payloads are deferred out of plain session queries"""
+    from sqlalchemy import select
+    from sqlalchemy.orm import undefer_group
+
+    summary = str(select(PoseSession).compile())
+    assert 'landmarks' not in summary
+    detail = str(select(PoseSession).options(undefer_group("landmarks")).compile())
+    assert 'landmarks_3d_packed' in detail
+
+def test_session_detail_returns_landmark_dicts(payload):
+    from datetime import datetime
+    from app.schemas.pose import PoseSessionDetail
+
+    session = PoseSession(
+        id=1, user_id=1, session_type="upload", confidence_score=0.9,
+        landmarks_3d=payload['landmarks_3d'], created_at=datetime.utcnow()
+    )
+    detail = PoseSessionDetail.model_validate(session)
+    assert len(detail.landmarks_3d) == 33
+    assert set(detail.landmarks_3d[0]) == {'x', 'y', 'z', 'visibility'}
+    assert detail.landmarks_2d is None
@@ -0,0 +1,63 @@
+"""
+Unit tests for keyset pagination
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.db import base  # noqa: F401
+from app.db.pagination import decode_cursor, encode_cursor, keyset_page, next_cursor
+from app.models.pose_session import PoseSession
+
+
+class Row:
+    def __init__(self, row_id, created_at):
+        self.id = row_id
+        self.created_at = created_at
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", "e30", encode_cursor(datetime.now(), 1)[:-3]])
+def test_decode_cursor_rejects_garbage(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_next_cursor_pages_through_rows():
+    now = datetime(2024, 1, 1)
+    # Newest first, with a created_at tie resolved by id
+    rows = [Row(5, now), Row(4, now), Row(3, now - timedelta(seconds=1)), Row(2, now - timedelta(seconds=2))]
+
+    page, token = next_cursor(rows[:3], 2)
+    assert [row.id for row in page] == [5, 4]
+    assert decode_cursor(token) == (now, 4)
+
+    page, token = next_cursor(rows[2:], 2)
+    assert len(page) == 2 and token is None
+
+    mapping_page, mapping_token = next_cursor([{"id": 5, "created_at": now}, {"id": 4, "created_at": now}], 1)
+    assert decode_cursor(mapping_token) == (now, 5)
+
+
+def test_keyset_query_matches_index():
+    query = keyset_page(
+        select(PoseSession.id).where(PoseSession.user_id == 1),
+        PoseSession.created_at,
+        PoseSession.id,
+        encode_cursor(datetime(2024, 1, 1), 7),
+        20
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "(pose_sessions.created_at, pose_sessions.id) <" in sql
+    assert "ORDER BY pose_sessions.created_at DESC, pose_sessions.id DESC" in sql
+
+    index = next(i for i in PoseSession.__table__.indexes if i.name == "ix_pose_sessions_user_created")
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert "(user_id, created_at DESC, id DESC)" in ddl
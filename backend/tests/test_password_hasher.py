@@ -0,0 +1,55 @@
+"""
+Unit tests for off-loop password hashing
+"""
+import asyncio
+
+import pytest
+from passlib.context import CryptContext
+
+from app.core import security
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.fixture
+def fast_context(monkeypatch):
+    context = CryptContext(
+        schemes=["bcrypt"], deprecated="auto",
+        bcrypt__default_rounds=4, bcrypt__min_desired_rounds=4, bcrypt__max_desired_rounds=4
+    )
+    monkeypatch.setattr(security, "pwd_context", context)
+    return context
+
+
+def test_hash_and_verify_off_loop(fast_context):
+    hasher = PasswordHasher(workers=2, max_pending=4)
+
+    async def run():
+        hashed = await hasher.hash("secret")
+        return hashed, await hasher.verify("secret", hashed), await hasher.verify("wrong", hashed)
+
+    hashed, (ok, new_hash), (bad, _) = asyncio.run(run())
+    assert ok and new_hash is None and not bad
+    stats = hasher.stats()
+    assert (stats["submitted"], stats["completed"], stats["pending"]) == (3, 3, 0)
+    assert stats["hash_ms_mean"] > 0
+
+
+def test_verify_rehashes_outdated_cost(fast_context):
+    hasher = PasswordHasher(workers=1)
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=5).hash("secret")
+
+    ok, new_hash = asyncio.run(hasher.verify("secret", old_hash))
+    assert ok and new_hash.startswith("$2b$04$")
+    assert fast_context.verify("secret", new_hash)
+    assert hasher.rehashed == 1
+
+
+def test_rejects_beyond_pending_cap(fast_context):
+    hasher = PasswordHasher(workers=1, max_pending=2)
+
+    async def burst():
+        return await asyncio.gather(*(hasher.hash("secret") for _ in range(4)), return_exceptions=True)
+
+    results = asyncio.run(burst())
+    assert sum(isinstance(result, PasswordHasherBusy) for result in results) == 2
+    assert hasher.stats()["rejected"] == 2
@@ -0,0 +1,172 @@
+"""
+Unit tests for per-stream live pose processing
+"""
+import tracemalloc
+
+import pytest
+import numpy as np
+from app.services.pose_stream import PoseStream
+from app.services.landmarks import landmarks_to_dicts
+
+class FakeDetector:
+    """Counts inference calls and returns a fixed pose (into `buffers`, like PoseDetector)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.points = np.full((33, 4), 0.5)
+
+    def detect(self, image, rgb=False, buffers=None):
+        self.calls += 1
+        points = buffers.get('landmarks_3d', (33, 4), np.float64) if buffers is not None else np.empty((33, 4))
+        np.add(self.points, 0.01 * self.calls, out=points)
+        points[:, 3] = 0.9
+        return {
+            'landmarks_3d': points if buffers is not None else landmarks_to_dicts(points),
+            'landmarks_world': [],
+            'confidence': 0.9
+        }
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, size=(240, 320, 3), dtype=np.uint8)
+
+def test_motion_gate_skips_static_frames(frame):
+    """Static frames reuse landmarks; full inference is forced every max_skip frames"""
+    detector = FakeDetector()
+    stream = PoseStream()
+    stream.configure({"motion_gate": True, "max_skip": 4, "filter": None})
+
+    results = [stream.encode_landmarks(stream.detect(frame, detector)) for _ in range(10)]
+
+    assert detector.calls == 2
+    assert not results[0].get('reused')
+    assert results[1]['reused']
+    assert results[1]['landmarks_3d'] == results[0]['landmarks_3d']
+    assert results[5]['landmarks_3d'][0]['x'] == pytest.approx(0.52)
+
+def test_motion_gate_infers_on_motion(frame):
+    """Frames that change beyond the threshold always run inference"""
+    detector = FakeDetector()
+    stream = PoseStream()
+    stream.configure({"motion_gate": True, "filter": None})
+
+    stream.detect(frame, detector)
+    stream.detect(255 - frame, detector)
+    assert detector.calls == 2
+
+def test_motion_gate_extrapolates(frame):
+    """Reused landmarks follow the last observed velocity when enabled"""
+    detector = FakeDetector()
+    stream = PoseStream()
+    stream.configure({"motion_gate": True, "extrapolate": True, "filter": None})
+
+    stream.detect(frame, detector)
+    second = stream.detect(255 - frame, detector)['landmarks_3d'].copy()
+    reused = stream.detect(255 - frame, detector)
+
+    assert reused['reused']
+    assert reused['landmarks_3d'][0, 0] == pytest.approx(second[0, 0] + 0.01)
+    assert reused['landmarks_3d'][0, 3] == pytest.approx(0.9)
+
+def test_one_euro_filter_reduces_jitter():
+    """Filtered static pose jitters less; occluded joints hold their estimate"""
+    from app.services.landmark_filter import OneEuroFilter
+
+    rng = np.random.default_rng(2)
+    landmark_filter = OneEuroFilter(min_cutoff=0.5, beta=2.0)
+    base = np.full((33, 4), 0.5)
+    base[:, 3] = 1.0
+    base[0, 3] = 0.0
+
+    raw, filtered = [], []
+    for i in range(60):
+        points = base.copy()
+        points[:, :3] += rng.normal(scale=0.01, size=(33, 3))
+        raw.append(points[1:, :3].copy())
+        out = landmark_filter(points, i / 30.0)
+        filtered.append(out[1:, :3].copy())
+        if i == 0:
+            first_nose = out[0, :3].copy()
+
+    assert np.std(filtered[10:], axis=0).mean() < np.std(raw[10:], axis=0).mean() / 2
+    assert np.allclose(out[0, :3], first_nose)
+
+def test_stream_filter_uses_analysis_preset(frame):
+    """Streams filter by default and pick the preset for the analysis type"""
+    detector = FakeDetector()
+    stream = PoseStream()
+
+    stream.detect(frame, detector, analysis_type='squat', timestamp=0.0)
+    result = stream.detect(frame, detector, analysis_type='squat', timestamp=1 / 30.0)
+
+    assert stream.filters['landmarks_3d'].beta == 10.0
+    assert result['landmarks_3d'][0, 0] < detector.points[0, 0] + 0.02
+
+def test_filter_overrides_are_range_checked():
+    """Overrides that would make the filter diverge are rejected, keeping the previous ones"""
+    stream = PoseStream()
+    stream.configure({"min_cutoff": 0.8, "beta": 0})
+    assert stream.filter_overrides == {"min_cutoff": 0.8, "beta": 0.0}
+
+    for config in ({"min_cutoff": -5, "beta": 0}, {"min_cutoff": 0}, {"min_cutoff": "nan"},
+                   {"beta": -1}, {"beta": float("inf")}):
+        with pytest.raises(ValueError):
+            stream.configure(config)
+    assert stream.filter_overrides == {"min_cutoff": 0.8, "beta": 0.0}
+
+def test_keyframe_tracker_propagates_with_flow():
+    """Between keyframes, landmarks follow image motion without inference"""
+    from app.services.keyframe_tracker import KeyframeTracker
+
+    rng = np.random.default_rng(3)
+    texture = rng.integers(0, 255, size=(60, 80), dtype=np.uint8)
+    texture = np.kron(texture, np.ones((4, 4), dtype=np.uint8))
+    image = np.dstack([texture] * 3)
+
+    detector = FakeDetector()
+    detector.points[:, 0] = np.linspace(0.3, 0.7, 33)
+    tracker = KeyframeTracker(keyframe_interval=4)
+
+    first = tracker.process(image, detector)['landmarks_3d'].copy()
+    shifted = tracker.process(np.roll(image, 3, axis=1), detector)
+
+    assert detector.calls == 1
+    assert shifted['tracked']
+    dx = shifted['landmarks_3d'][16, 0] - first[16, 0]
+    assert dx == pytest.approx(3 / 320, abs=0.003)
+
+    for _ in range(3):
+        tracker.process(np.roll(image, 3, axis=1), detector)
+    assert detector.calls == 2
+
+def test_stream_frames_allocate_no_frame_sized_memory(frame):
+    """Once buffers are warm, a frame's traced peak stays far below one image or one dict pose"""
+    detector = FakeDetector()
+    stream = PoseStream()
+    stream.configure({"motion_gate": True, "tracking": True, "codec": "delta"})
+
+    frames = [np.roll(frame, i, axis=1) for i in range(10)]
+
+    def process(i):
+        with stream.buffers.frame():
+            result = stream.detect(frames[i], detector, timestamp=i / 30)
+            stream.encode_landmarks({'landmarks_3d': result['landmarks_3d']})
+
+    tracemalloc.start()
+    try:
+        for i in range(3):
+            process(i)
+        warm_allocations = stream.buffers.allocations
+        for i in range(3, 10):
+            process(i)
+            assert stream.buffers.last_frame_allocations == 0
+            assert stream.buffers.last_frame_peak_bytes < 8 * 1024
+    finally:
+        tracemalloc.stop()
+
+    stats = stream.stats()
+    assert stats['frames'] == 10
+    assert stats['buffer_allocations'] == warm_allocations
+    assert stats['frame_peak_bytes_max'] >= stats['frame_peak_bytes_last_frame'] > 0
+    assert frame.nbytes > 8 * 1024 * 20
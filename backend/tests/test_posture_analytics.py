@@ -0,0 +1,94 @@
+"""
+Unit tests for bucketed posture analytics and LTTB downsampling
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db import base  # noqa: F401
+from app.schemas.posture import PostureAnalytics
+from app.services.downsampling import lttb_indices
+from app.services.posture_analytics import (
+    SCORE_PERCENTILES, bucket_query, columnar_analytics, issue_query, naive_utc
+)
+from app.services.posture_analyzer import ANGLE_METRICS
+
+BucketRow = namedtuple(
+    "BucketRow",
+    ["bucket", "total", "score_mean"] + [f"score_p{p}" for p in SCORE_PERCENTILES] + list(ANGLE_METRICS)
+)
+IssueRow = namedtuple("IssueRow", ["bucket", "name", "total"])
+
+
+def _bucket_rows(count):
+    start = datetime(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        score = 70 + 20 * np.sin(i / 15)
+        angles = [float(i % 90)] * len(ANGLE_METRICS)
+        angles[-1] = None  # No analysis in the bucket reported this angle
+        rows.append(BucketRow(start + timedelta(days=i), 3, score, *(score + d for d in (-10, -5, 0, 5, 10)), *angles))
+    return rows
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[500] = 50.0
+    y[250] = -30.0
+
+    kept = lttb_indices(x, y, 20)
+    assert len(kept) == 20
+    assert kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+    assert 500 in kept and 250 in kept
+
+    assert np.array_equal(lttb_indices(x[:10], y[:10], 20), np.arange(10))
+
+
+def test_lttb_tolerates_missing_values():
+    y = np.sin(np.linspace(0, 10, 300))
+    y[::7] = np.nan
+    kept = lttb_indices(np.arange(300.0), y, 50)
+    assert len(kept) == 50 and len(set(kept.tolist())) == 50
+
+
+def test_columnar_analytics_bounds_response():
+    rows = _bucket_rows(1200)
+    issues = [IssueRow(rows[0].bucket, "Forward Head Posture", 2), IssueRow(rows[-1].bucket, "Rounded Shoulders", 1)]
+
+    result = columnar_analytics(rows, issues, max_points=100)
+    assert result["downsampled"] and result["total_buckets"] == 1200
+    assert len(result["t"]) == len(result["count"]) == len(result["score_mean"]) == 100
+    assert result["t"][0] == rows[0].bucket and result["t"][-1] == rows[-1].bucket
+    assert all(len(series) == 100 for series in result["score_percentiles"].values())
+    assert result["angles"][ANGLE_METRICS[-1]] == [None] * 100
+    assert result["issues"]["Forward Head Posture"][0] == 2
+    assert result["issues"]["Rounded Shoulders"][-1] == 1
+
+    small = columnar_analytics(rows[:30], [], max_points=100)
+    assert not small["downsampled"] and len(small["t"]) == 30
+    PostureAnalytics(bucket="day", start=rows[0].bucket, end=rows[29].bucket, **small)
+
+
+def test_queries_aggregate_in_database():
+    start, end = datetime(2024, 1, 1), datetime(2024, 4, 1)
+    sql = str(bucket_query(1, start, end, "week").compile(dialect=postgresql.dialect()))
+    assert "date_trunc('week', posture_analyses.created_at)" in sql
+    assert "percentile_cont" in sql and "WITHIN GROUP" in sql
+    assert "GROUP BY date_trunc('week', posture_analyses.created_at)" in sql
+
+    sql = str(issue_query(1, start, end, "hour").compile(dialect=postgresql.dialect()))
+    assert "json_array_elements" in sql
+
+    with pytest.raises(ValueError):
+        bucket_query(1, start, end, "month")
+
+
+def test_naive_utc():
+    aware = datetime.fromisoformat("2024-01-01T12:00:00+02:00")
+    assert naive_utc(aware) == datetime(2024, 1, 1, 10)
+    assert naive_utc(datetime(2024, 1, 1)) == datetime(2024, 1, 1)
@@ -0,0 +1,35 @@
+"""
+Unit tests for typed posture metric columns
+"""
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.db import base  # noqa: F401
+from app.models.posture_analysis import METRIC_COLUMNS, PostureAnalysis, metric_values
+from app.services.posture_analyzer import PostureAnalyzer
+
+
+def test_metric_columns_follow_angles():
+    angles = PostureAnalyzer().analyze(np.random.default_rng(0).random((33, 4)))['angles']
+    analysis = PostureAnalysis(angles=angles)
+    for name in METRIC_COLUMNS:
+        assert getattr(analysis, name) == float(angles[name])
+
+    analysis.angles = {"cobb_angle_proxy": np.float32(4.5), "neck_forward": float("nan"), "rom_knee_flexion_left": "x"}
+    assert analysis.cobb_angle_proxy == 4.5
+    assert analysis.neck_forward is None and analysis.rom_knee_flexion_left is None
+    assert metric_values(None) == dict.fromkeys(METRIC_COLUMNS)
+
+
+def test_cohort_filters_use_indexed_columns():
+    table = PostureAnalysis.__table__
+    indexed = {column.name for index in table.indexes for column in index.columns}
+    assert set(METRIC_COLUMNS) | {"severity"} <= indexed
+
+    sql = str(
+        select(PostureAnalysis.id)
+        .where(PostureAnalysis.cobb_angle_proxy > 10, PostureAnalysis.severity == "high")
+        .compile(dialect=postgresql.dialect())
+    )
+    assert "posture_analyses.cobb_angle_proxy >" in sql and "->>" not in sql
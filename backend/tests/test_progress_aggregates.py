@@ -0,0 +1,84 @@
+"""
+Unit tests for per-user progress aggregates
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.schemas.posture import PostureSummary
+from app.services.progress_aggregates import build_progress, empty_progress, merge_analysis, summarize_progress
+
+
+def _analyses(count=40):
+    rng = np.random.default_rng(3)
+    start = datetime(2024, 3, 1, 9)
+    rows = []
+    for i in range(count):
+        issues = [{"name": "Forward Head Posture"}] if i % 3 == 0 else []
+        if i % 4 == 0:
+            issues.append({"name": "Rounded Shoulders"})
+        rows.append((
+            i + 1,
+            100 + i,
+            float(rng.uniform(40, 95)),
+            "high" if i % 5 == 0 else "low",
+            issues,
+            {"neck_forward": float(rng.uniform(50, 90)), "cobb_angle_proxy": float(rng.uniform(0, 12))},
+            start + timedelta(hours=12 * i)
+        ))
+    return rows
+
+
+def test_incremental_matches_batch_statistics():
+    rows = _analyses()
+    state = build_progress(rows)
+    summary = summarize_progress(state)
+    scores = np.array([row[2] for row in rows])
+    necks = np.array([row[5]["neck_forward"] for row in rows])
+
+    assert summary["analysis_count"] == len(rows)
+    assert np.isclose(summary["average_score"], scores.mean())
+    assert np.isclose(summary["score_stddev"], scores.std(ddof=1))
+    assert summary["min_score"] == scores.min() and summary["max_score"] == scores.max()
+    assert summary["last_score"] == rows[-1][2]
+    assert np.isclose(summary["angle_trends"]["neck_forward"]["mean"], necks.mean())
+    assert summary["issue_frequencies"] == {"Forward Head Posture": 14, "Rounded Shoulders": 10}
+    assert summary["severity_counts"] == {"high": 8, "low": 32}
+
+    # Two analyses a day, averaged per daily bucket
+    assert len(summary["daily"]) == 20
+    assert summary["daily"][0]["count"] == 2
+    assert np.isclose(summary["daily"][0]["average_score"], scores[:2].mean())
+
+    # Order of arrival does not change the aggregates
+    shuffled = summarize_progress(build_progress(reversed(rows)))
+    assert np.isclose(shuffled["score_stddev"], summary["score_stddev"])
+    assert shuffled["last_score"] == summary["last_score"]
+    assert shuffled["recent"] == summary["recent"]
+
+
+def test_daily_buckets_and_recent_are_bounded():
+    rows = _analyses()
+    state = build_progress(rows, daily_days=7, recent_count=3)
+    assert sorted(state["daily"]) == [
+        (rows[-1][6].date() - timedelta(days=offset)).isoformat() for offset in range(6, -1, -1)
+    ]
+    assert [entry["id"] for entry in state["recent"]] == [40, 39, 38]
+    # Daily trimming does not affect the running totals
+    assert state["analysis_count"] == len(rows)
+
+
+def test_merge_does_not_mutate_previous_state():
+    first = merge_analysis(empty_progress(), 1, 10, 80.0, "low", [{"name": "A"}], {"x": 1.0}, datetime(2024, 1, 1))
+    snapshot = {key: (dict(value) if isinstance(value, dict) else value) for key, value in first.items()}
+    merge_analysis(first, 2, 10, 60.0, "high", [{"name": "A"}], {"x": 3.0}, datetime(2024, 1, 1, 1))
+    assert first["issue_counts"] == snapshot["issue_counts"]
+    assert first["daily"] == snapshot["daily"]
+    assert len(first["recent"]) == 1
+
+
+def test_summary_schema():
+    summary = PostureSummary(**summarize_progress(build_progress(_analyses(5))))
+    assert summary.recent[0].id == 5 and summary.recent[0].primary_issue == "Rounded Shoulders"
+    empty = PostureSummary(**summarize_progress(empty_progress()))
+    assert empty.analysis_count == 0 and empty.average_score is None
@@ -0,0 +1,92 @@
+"""
+Unit tests for cold-storage session archives
+"""
+import asyncio
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.db import base  # noqa: F401
+from app.models.pose_session import PoseSession
+from app.services.frame_timeline import assemble_frames, chunk_rows, frame_timestamps
+from app.services.session_archive import (
+    ArchiveUnavailable, ArchivedSession, archive_file, pack_archive, read_archive, rehydrate_session,
+    session_frames, session_frames_between, unpack_archive, write_archive
+)
+
+
+def _timeline(frames=600, tolerance=0.005):
+    t = frame_timestamps(frames, 30.0)
+    landmarks = np.empty((frames, 33, 4), dtype=np.float32)
+    landmarks[..., :3] = 0.5 + 0.2 * np.sin(t)[:, None, None] * np.linspace(0.5, 1, 33)[None, :, None]
+    landmarks[..., 3] = 0.9
+    rows = chunk_rows(1, landmarks, t, tolerance=tolerance)
+    return [
+        (row["start_frame"], row["frame_count"], row["landmarks"], row["timestamps"], row["keyframe_offsets"])
+        for row in rows
+    ]
+
+
+def _session(session_id, chunks=()):
+    points = np.random.default_rng(session_id).random((33, 4)).astype(np.float32)
+    return ArchivedSession(session_id, points, None, list(chunks))
+
+
+def test_pack_round_trip_keeps_keyframe_compression():
+    compressed, dense = _timeline(), _timeline(tolerance=0)
+    sessions = [_session(1, compressed), _session(2), _session(3, dense)]
+
+    restored = unpack_archive(pack_archive(sessions, dtype='float32'))
+    assert sorted(restored) == [1, 2, 3]
+    assert np.array_equal(restored[1].landmarks_3d, sessions[0].landmarks_3d)
+    assert restored[1].landmarks_2d is None and restored[2].chunks == []
+
+    for original, session_id in ((compressed, 1), (dense, 3)):
+        expected = assemble_frames(original)
+        frames = assemble_frames(restored[session_id].chunks)
+        assert np.array_equal(frames.frame_indices, expected.frame_indices)
+        assert np.allclose(frames.landmarks, expected.landmarks)
+    assert restored[1].chunks[0][4] is not None and restored[3].chunks[0][4] is None
+
+
+def test_write_archive_merges_by_session_id(tmp_path):
+    path = archive_file(str(tmp_path), 7, datetime(2023, 4, 9))
+    assert path.endswith("user7/2023-04.npz")
+
+    write_archive(path, [_session(1), _session(2)])
+    write_archive(path, [_session(2, _timeline()), _session(3)])
+    archived = read_archive(path)
+    assert sorted(archived) == [1, 2, 3]
+    assert len(archived[2].chunks) > 0
+    # float16 storage precision
+    assert np.allclose(archived[1].landmarks_3d, _session(1).landmarks_3d, atol=1e-3)
+
+
+def test_archived_stub_rehydrates(tmp_path):
+    path = archive_file(str(tmp_path), 7, datetime(2023, 4, 9))
+    write_archive(path, [_session(5, _timeline())], dtype='float32')
+
+    stub = PoseSession(id=5, user_id=7, archive_path=path)
+    asyncio.run(rehydrate_session(stub))
+    assert np.array_equal(stub.landmarks_3d, _session(5).landmarks_3d)
+    assert stub.landmarks_2d is None
+
+    frames = asyncio.run(session_frames(None, stub, 100, 200))
+    assert frames.frame_indices.tolist() == list(range(100, 200))
+    frames = asyncio.run(session_frames_between(None, stub, 1.0, 2.0))
+    assert np.all((frames.timestamps >= 1.0) & (frames.timestamps < 2.0)) and len(frames.timestamps) == 30
+
+    hot = PoseSession(id=6, user_id=7)
+    assert asyncio.run(rehydrate_session(hot)) is hot
+
+
+def test_missing_archive_is_unavailable(tmp_path):
+    path = archive_file(str(tmp_path), 7, datetime(2023, 4, 9))
+    missing = PoseSession(id=5, user_id=7, archive_path=path)
+    with pytest.raises(ArchiveUnavailable):
+        asyncio.run(rehydrate_session(missing))
+
+    write_archive(path, [_session(6)])
+    with pytest.raises(ArchiveUnavailable):
+        asyncio.run(session_frames(None, missing))
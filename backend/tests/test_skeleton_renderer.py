@@ -0,0 +1,66 @@
+"""
+Unit tests for skeleton overlay rendering
+"""
+import cv2
+import numpy as np
+from app.services.skeleton_renderer import SkeletonRenderer, RenderCache, SIDE_COLORS, POSE_CONNECTIONS
+
+def _pose():
+    rng = np.random.default_rng(0)
+    points = np.empty((33, 4))
+    points[:, :2] = rng.uniform(0.2, 0.8, size=(33, 2))
+    points[:, 2] = 0.0
+    points[:, 3] = 0.9
+    return points
+
+def _has_color(image, color):
+    return bool(np.all(image == color, axis=2).any())
+
+def test_render_on_canvas():
+    """Without an image, the skeleton is drawn on a blank canvas in side colors"""
+    rendered = SkeletonRenderer().render(_pose(), canvas_size=(320, 240))
+    assert rendered.shape == (240, 320, 3)
+    assert _has_color(rendered, SIDE_COLORS['left'])
+    assert _has_color(rendered, SIDE_COLORS['right'])
+
+def test_render_hides_invisible_landmarks():
+    """Landmarks below the visibility threshold are not drawn"""
+    points = _pose()
+    points[:, 3] = 0.1
+    rendered = SkeletonRenderer().render(points, canvas_size=(320, 240))
+    assert not rendered.any()
+
+def test_render_downscales_and_keeps_input():
+    """Output is downscaled to the requested width; the source image is untouched"""
+    image = np.full((480, 640, 3), 40, dtype=np.uint8)
+    rendered = SkeletonRenderer().render(_pose(), image, width=320)
+    assert rendered.shape == (240, 320, 3)
+    assert (image == 40).all()
+    assert (rendered != 40).any()
+
+def test_render_jpeg_quality():
+    """Lower JPEG quality yields smaller output"""
+    renderer = SkeletonRenderer()
+    image = np.random.default_rng(1).integers(0, 255, size=(240, 320, 3), dtype=np.uint8)
+    high = renderer.render_jpeg(_pose(), image, quality=95)
+    low = renderer.render_jpeg(_pose(), image, quality=30)
+    assert len(low) < len(high)
+    assert cv2.imdecode(np.frombuffer(low, np.uint8), cv2.IMREAD_COLOR).shape == (240, 320, 3)
+
+def test_connection_table():
+    assert POSE_CONNECTIONS.shape == (35, 2)
+    assert POSE_CONNECTIONS.max() == 32
+
+def test_render_cache_evicts_least_recently_used():
+    cache = RenderCache(max_bytes=10)
+    cache.put((1, None, 80), b'aaaa')
+    cache.put((2, None, 80), b'bbbb')
+    assert cache.get((1, None, 80)) == b'aaaa'
+    cache.put((3, None, 80), b'cccc')
+    assert cache.get((2, None, 80)) is None
+    assert cache.get((1, None, 80)) == b'aaaa'
+    assert cache.bytes == 8
+
+    cache.invalidate(lambda key: key[0] == 1)
+    assert cache.get((1, None, 80)) is None
+    assert cache.bytes == 4
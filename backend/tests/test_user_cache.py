@@ -0,0 +1,92 @@
+"""
+Unit tests for the authenticated-user cache
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints.users import _resolve_user
+from app.core.security import create_access_token
+from app.db import base  # noqa: F401
+from app.models.user import User
+from app.services.user_cache import UserCache, track_user_changes
+
+
+def _user(**overrides):
+    fields = dict(
+        id=1, email="a@example.com", username="alice", hashed_password="hash", full_name="Alice",
+        is_active=True, is_superuser=False, created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 2)
+    )
+    fields.update(overrides)
+    return User(**fields)
+
+
+class _NoDatabase:
+    async def execute(self, statement):
+        raise AssertionError("cached user should not hit the database")
+
+
+def test_snapshot_round_trip_omits_password_hash():
+    cache = UserCache(ttl_seconds=30)
+    asyncio.run(cache.put(_user()))
+
+    cached = asyncio.run(cache.get("alice"))
+    assert (cached.id, cached.email, cached.created_at) == (1, "a@example.com", datetime(2024, 1, 1))
+    assert cached.hashed_password is None
+    assert asyncio.run(cache.get("bob")) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_expire_and_are_bounded():
+    cache = UserCache(ttl_seconds=0.05, max_entries=2)
+    for i, name in enumerate(("a", "b", "c")):
+        asyncio.run(cache.put(_user(id=i, username=name)))
+    assert asyncio.run(cache.get("a")) is None
+    assert asyncio.run(cache.get("c")) is not None
+
+    asyncio.run(asyncio.sleep(0.06))
+    assert asyncio.run(cache.get("c")) is None
+
+    disabled = UserCache(ttl_seconds=0)
+    asyncio.run(disabled.put(_user()))
+    assert asyncio.run(disabled.get("alice")) is None
+
+
+def test_resolve_user_uses_cache_and_rejects_inactive():
+    cache = UserCache(ttl_seconds=30)
+    asyncio.run(cache.put(_user()))
+    token = create_access_token({"sub": "alice"})
+
+    user = asyncio.run(_resolve_user(token, _NoDatabase(), cache))
+    assert user.id == 1
+
+    asyncio.run(cache.put(_user(is_active=False)))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(_resolve_user(token, _NoDatabase(), cache))
+    assert error.value.detail == "Inactive user"
+
+
+def test_committed_updates_invalidate_cached_users():
+    cache = UserCache(ttl_seconds=30)
+    track_user_changes(cache)
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+
+    with Session(engine) as db:
+        user = _user()
+        db.add(user)
+        db.commit()
+        asyncio.run(cache.put(user))
+
+        user.is_active = False
+        db.flush()
+        db.rollback()
+        assert asyncio.run(cache.get("alice")) is not None
+
+        user.username = "alicia"
+        db.commit()
+        assert asyncio.run(cache.get("alice")) is None
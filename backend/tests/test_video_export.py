@@ -0,0 +1,94 @@
+"""
+Unit tests for chunked annotated video export
+"""
+import cv2
+import pytest
+import numpy as np
+from app.services.frame_timeline import FrameRange
+from app.services.landmarks import landmarks_to_dicts
+from app.services.video_export import (
+    plan_chunks, timeline_slice, TimelineCursor, render_chunk, concat_chunks, video_info, frame_rows
+)
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / "source.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 10, (160, 120))
+    for i in range(25):
+        writer.write(np.full((120, 160, 3), i * 8, dtype=np.uint8))
+    writer.release()
+    return path
+
+def _rows():
+    points = np.full((33, 4), 0.5)
+    points[:, 0] = np.linspace(0.1, 0.9, 33)
+    points[:, 3] = 0.9
+    return [
+        {"t": 0.0, "landmarks": landmarks_to_dicts(points)},
+        {"t": 1.0, "landmarks": landmarks_to_dicts(points), "issues": ["Rounded Shoulders"]},
+        {"t": 2.0, "landmarks": []},
+    ]
+
+def test_plan_chunks():
+    assert plan_chunks(25, 10) == [(0, 10), (10, 20), (20, 25)]
+    assert plan_chunks(0, 10) == []
+
+def test_timeline_slice_and_cursor():
+    """A chunk gets the row in effect at its start plus the rows inside it"""
+    rows = _rows()
+    assert [row["t"] for row in timeline_slice(rows, 0.5, 1.5)] == [0.0, 1.0]
+    assert [row["t"] for row in timeline_slice(rows, 2.0, 3.0)] == [2.0]
+
+    cursor = TimelineCursor(rows)
+    assert cursor.at(0.9)["t"] == 0.0
+    assert cursor.at(1.0)["t"] == 1.0
+    assert cursor.at(5.0)["t"] == 2.0
+
+def test_chunked_export_roundtrip(video, tmp_path):
+    """Chunks render with overlays and concatenate to the full frame count"""
+    rows = _rows()
+    progress = []
+    paths = []
+    for index, (start, end) in enumerate(plan_chunks(25, 10)):
+        path = str(tmp_path / f"part{index}.mp4")
+        frames = render_chunk(
+            video, timeline_slice(rows, start / 10, end / 10), start, end, path,
+            max_width=80, progress=lambda done, total: progress.append((done, total)), progress_every=5
+        )
+        assert frames == end - start
+        paths.append(path)
+
+    assert progress[-1] == (5, 5)
+
+    output = str(tmp_path / "export.mp4")
+    assert concat_chunks(paths, output) == 25
+    info = video_info(output)
+    assert (info["width"], info["height"], info["frame_count"]) == (80, 60, 25)
+
+    capture = cv2.VideoCapture(output)
+    ok, first = capture.read()
+    capture.release()
+    assert ok and first.std() > 0
+
+def test_chunk_renders_frame_range_arrays(video, tmp_path):
+    """Rows built from a FrameRange keep landmark arrays and render like dict rows"""
+    points = np.full((4, 33, 4), 0.5, dtype=np.float32)
+    points[..., 0] = np.linspace(0.1, 0.9, 33)
+    frames = FrameRange(np.arange(4), np.array([0.0, 0.5, 1.0, 1.5]), points)
+
+    rows = frame_rows(frames, 0.7, 1.2)
+    assert [row["t"] for row in rows] == [0.5, 1.0]
+    assert isinstance(rows[0]["landmarks"], np.ndarray)
+
+    path = str(tmp_path / "part.mp4")
+    assert render_chunk(video, rows, 7, 12, path, max_width=80) == 5
+
+def test_export_ids_are_bound_to_their_owner():
+    """Export status ids only resolve for the user who started the export"""
+    from app.api.v1.endpoints.pose import _export_token, _owned_export_group
+
+    export_id = _export_token("3f2a-group", 7)
+    assert _owned_export_group(export_id, 7) == "3f2a-group"
+    assert _owned_export_group(export_id, 8) is None
+    assert _owned_export_group("3f2a-group", 7) is None
+    assert _owned_export_group(export_id.replace("3f2a", "9999"), 7) is None
@@ -1,6 +1,7 @@
-import React, { useMemo, useRef } from 'react'
+import React, { useEffect, useRef, useState } from 'react'
 import * as THREE from 'three'
 import { useFrame } from '@react-three/fiber'
+import { createDeltaDecoder, isEncodedLandmarks } from '../utils/landmarkCodec'
 
 // MediaPipe Pose Landmarks Mapping
 // 0: nose
@@ -151,7 +152,33 @@ function Head({ landmarks }) {
     )
 }
 
-export default function Skeleton3D({ landmarks }) {
+// `landmarks` is either an array of {x, y, z, visibility} or a delta-codec
+// frame from the live stream; `onResync` is called when a keyframe is needed.
+export default function Skeleton3D({ landmarks: input, onResync }) {
+    const decoderRef = useRef(null)
+    const decodedInputRef = useRef(null)
+    const onResyncRef = useRef(onResync)
+    onResyncRef.current = onResync
+    const [decodedPose, setDecodedPose] = useState([])
+
+    // The decoder is stateful, so it runs in an effect rather than during
+    // render (StrictMode renders twice in development). Each frame object is
+    // decoded once, even if the effect itself is replayed.
+    useEffect(() => {
+        if (!isEncodedLandmarks(input) || decodedInputRef.current === input) return
+        decodedInputRef.current = input
+
+        if (!decoderRef.current) decoderRef.current = createDeltaDecoder()
+        const decoded = decoderRef.current(input)
+        if (decoded) {
+            setDecodedPose(decoded)
+        } else if (onResyncRef.current) {
+            onResyncRef.current()
+        }
+    }, [input])
+
+    const landmarks = isEncodedLandmarks(input) ? decodedPose : input
+
     if (!landmarks || !Array.isArray(landmarks) || landmarks.length === 0) return null
 
     return (
@@ -1,4 +1,4 @@
-import React from 'react'
+import React, { useState, useEffect } from 'react'
 import { useLocation, Link, useNavigate } from 'react-router-dom'
 import {
     Activity,
@@ -19,11 +19,26 @@ import {
     PolarRadiusAxis,
     Radar
 } from 'recharts'
+import api from '../utils/api'
 
 export default function Analysis() {
     const location = useLocation()
     const navigate = useNavigate()
-    const { analysis } = location.state || {}
+    const { analysis: passedAnalysis, analysisId } = location.state || {}
+    const [fetchedAnalysis, setFetchedAnalysis] = useState(null)
+    const [loading, setLoading] = useState(false)
+
+    // History entries are summaries; the full analysis is fetched on demand
+    useEffect(() => {
+        if (passedAnalysis || !analysisId) return
+        setLoading(true)
+        api.get(`/posture/analysis/${analysisId}`)
+            .then(res => setFetchedAnalysis(res.data))
+            .catch(err => console.error('Failed to fetch analysis:', err))
+            .finally(() => setLoading(false))
+    }, [passedAnalysis, analysisId])
+
+    const analysis = passedAnalysis || (fetchedAnalysis && fetchedAnalysis.id === analysisId ? fetchedAnalysis : null)
 
     const handleSampleReport = () => {
         const sampleAnalysis = {
@@ -50,6 +65,14 @@ export default function Analysis() {
         navigate('/analysis', { state: { analysis: sampleAnalysis } })
     }
 
+    if (!analysis && loading) {
+        return (
+            <div className="p-12 text-center bg-[#020617] min-h-[calc(100vh-200px)] flex items-center justify-center">
+                <Activity className="w-16 h-16 text-sky-400 animate-pulse-slow" />
+            </div>
+        )
+    }
+
     if (!analysis) {
         return (
             <div className="p-12 text-center bg-[#020617] min-h-[calc(100vh-200px)] flex flex-col items-center justify-center">
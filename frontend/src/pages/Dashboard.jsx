@@ -43,20 +43,19 @@ export default function Dashboard() {
                 const userRes = await api.get('/users/me')
                 setUserName(userRes.data.full_name || userRes.data.username)
 
-                const historyRes = await api.get('/posture/history?limit=10')
-                const history = historyRes.data
+                const summaryRes = await api.get('/posture/summary')
+                const summary = summaryRes.data
 
-                if (history.length > 0) {
-                    const avg = history.reduce((acc, curr) => acc + curr.posture_score, 0) / history.length
-                    const chartData = history.slice().reverse().map(item => ({
-                        date: new Date(item.created_at).toLocaleDateString([], { month: 'short', day: 'numeric' }),
-                        score: Math.round(item.posture_score)
+                if (summary.analysis_count > 0) {
+                    const chartData = summary.daily.map(day => ({
+                        date: new Date(`${day.date}T00:00:00`).toLocaleDateString([], { month: 'short', day: 'numeric' }),
+                        score: Math.round(day.average_score)
                     }))
 
                     setStats({
-                        avgScore: Math.round(avg),
-                        sessionsCount: history.length,
-                        recentAnalyses: history.slice(0, 3),
+                        avgScore: Math.round(summary.average_score),
+                        sessionsCount: summary.analysis_count,
+                        recentAnalyses: summary.recent.slice(0, 3),
                         chartData: chartData
                     })
                 }
@@ -202,7 +201,7 @@ export default function Dashboard() {
                                 stats.recentAnalyses.map((analysis) => (
                                     <div
                                         key={analysis.id}
-                                        onClick={() => navigate('/analysis', { state: { analysis } })}
+                                        onClick={() => navigate('/analysis', { state: { analysisId: analysis.id } })}
                                         className="flex items-center gap-5 p-4 rounded-2xl hover:bg-slate-800/50 transition-all cursor-pointer group border border-transparent hover:border-slate-700/50 shadow-lg hover:shadow-sky-500/5"
                                     >
                                         <div className={`w-14 h-14 rounded-2xl flex items-center justify-center text-xl font-black ${analysis.posture_score >= 80 ? 'bg-emerald-500/10 text-emerald-400' :
@@ -213,7 +212,7 @@ export default function Dashboard() {
                                         </div>
                                         <div className="flex-1">
                                             <p className="text-base font-bold text-slate-100 group-hover:text-sky-400 transition-colors line-clamp-1">
-                                                {analysis.issues_detected.length > 0 ? analysis.issues_detected[0].name : "Excellent Posture"}
+                                                {analysis.primary_issue || "Excellent Posture"}
                                             </p>
                                             <p className="text-xs font-semibold text-slate-500 mt-1 uppercase tracking-widest">
                                                 {new Date(analysis.created_at).toLocaleDateString()}
@@ -52,7 +52,7 @@ export default function HistoryPage() {
                     history.map((item) => (
                         <div
                             key={item.id}
-                            onClick={() => navigate('/analysis', { state: { analysis: item } })}
+                            onClick={() => navigate('/analysis', { state: { analysisId: item.id } })}
                             className="card group hover:bg-slate-900/50 border-slate-800 p-8 flex flex-col md:flex-row md:items-center justify-between gap-8 cursor-pointer transition-all hover:scale-[1.01] hover:border-slate-700"
                         >
                             <div className="flex items-center gap-8">
@@ -64,7 +64,7 @@ export default function HistoryPage() {
                                 </div>
                                 <div>
                                     <h3 className="text-xl font-black text-white uppercase tracking-tight group-hover:text-sky-400 transition-colors">
-                                        {item.issues_detected.length > 0 ? item.issues_detected[0].name : "Optimal Alignment"}
+                                        {item.primary_issue || "Optimal Alignment"}
                                     </h3>
                                     <div className="flex items-center gap-6 mt-2">
                                         <div className="flex items-center gap-2 text-[10px] font-black text-slate-500 uppercase tracking-widest">
@@ -82,7 +82,7 @@ export default function HistoryPage() {
                             <div className="flex items-center gap-6">
                                 <div className="hidden lg:block text-right pr-6 border-r border-slate-800">
                                     <p className="text-[10px] font-black text-slate-500 uppercase tracking-widest mb-1">Observations</p>
-                                    <p className="text-xs font-bold text-slate-300">{item.issues_detected.length} anomalies recorded</p>
+                                    <p className="text-xs font-bold text-slate-300">{item.issue_count} anomalies recorded</p>
                                 </div>
                                 <ChevronRight className="w-6 h-6 text-slate-700 group-hover:text-white group-hover:translate-x-2 transition-all" />
                             </div>
@@ -37,7 +37,7 @@ export default function LiveDetection() {
                     const formData = new FormData()
                     formData.append('file', blob, 'frame.jpg')
 
-                    const res = await api.post(`/pose/detect?analysis_type=${exerciseMode !== 'free' ? exerciseMode : ''}`, formData, {
+                    const res = await api.post(`/pose/detect?analysis_type=${exerciseMode !== 'free' ? exerciseMode : ''}&fields=landmarks_3d,exercise_analysis,detected_activity`, formData, {
                         headers: { 'Content-Type': 'multipart/form-data' }
                     })
 
@@ -0,0 +1,52 @@
+// Decoder for the delta-quantized landmark stream codec
+// (mirrors backend/app/services/stream_codec.py)
+
+const CHANNELS = ['x', 'y', 'z', 'visibility']
+
+function base64ToBytes(data) {
+    const binary = atob(data)
+    const bytes = new Uint8Array(binary.length)
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i)
+    }
+    return bytes
+}
+
+export function createDeltaDecoder() {
+    let state = null
+    let seq = 0
+
+    // Returns landmarks as [{x, y, z, visibility}], or null if a keyframe is needed
+    return function decode(frame) {
+        const bytes = base64ToBytes(frame.data)
+
+        if (frame.key) {
+            state = new Int32Array(bytes.buffer).slice()
+        } else {
+            if (!state || frame.seq !== seq + 1) {
+                state = null
+                return null
+            }
+            const delta = new Int16Array(bytes.buffer)
+            for (let i = 0; i < delta.length; i++) {
+                state[i] += delta[i]
+            }
+        }
+        seq = frame.seq
+
+        const [rows, cols] = frame.shape
+        const landmarks = new Array(rows)
+        for (let r = 0; r < rows; r++) {
+            const lm = {}
+            for (let c = 0; c < cols; c++) {
+                lm[CHANNELS[c]] = state[r * cols + c] * frame.step
+            }
+            landmarks[r] = lm
+        }
+        return landmarks
+    }
+}
+
+export function isEncodedLandmarks(value) {
+    return value && !Array.isArray(value) && value.codec === 'delta'
+}